@@ -5,7 +5,17 @@ ENTRYPOINT.  Runs the agent and prints AgentFindings JSON to stdout,
 which the host ContainerRuntime captures.
 
 Tool-use events are emitted as JSON lines to stderr so the host
-runtime can display them in real-time.
+runtime can display them in real-time. The first line is always
+``{"ready": true}``, printed once the imports are done, and a final
+``{"usage": ...}`` line reports the run's token usage and cost. With
+``--startup-only`` the entrypoint exits right after the ready line, which
+is what the cold-start benchmark times.
+
+When the host passes a ``TRACEPARENT``, the run's trace spans are printed
+to stderr as ``{"span": ...}`` lines for the host to export.
+
+With ``--workspace-tar`` the host streams a staged copy of the project
+on stdin, which is unpacked into /workspace before the agent starts.
 """
 
 from __future__ import annotations
@@ -14,30 +24,74 @@ import argparse
 import asyncio
 import json
 import sys
+from pathlib import Path
 
+from good_start import tracing
 from good_start.agent import Agent
 from good_start.result import AgentFindings
+from good_start.runtime._staging import extract_workspace_tar
+from good_start.tiers import DEFAULT_TOOLS, Tier
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--prompt", required=True, help="Rendered prompt string")
     parser.add_argument("--target", default=".", help="Target path")
+    parser.add_argument(
+        "--workspace-tar",
+        action="store_true",
+        help="Read a staged workspace tar stream from stdin into the cwd",
+    )
+    parser.add_argument("--model", default=None, help="Model for this run")
+    parser.add_argument(
+        "--max-turns", type=int, default=None, help="Turn budget for this run"
+    )
+    parser.add_argument(
+        "--tools", default=None, help="Comma-separated tools the agent may use"
+    )
+    parser.add_argument(
+        "--startup-only",
+        action="store_true",
+        help="Exit after the ready event, for measuring cold start",
+    )
     args = parser.parse_args()
 
+    print(json.dumps({"ready": True}), file=sys.stderr, flush=True)
+    if args.startup_only:
+        return
+
+    # Continue the host's trace, if it passed one in.
+    tracing.continue_trace()
+    with tracing.span("entrypoint"):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.workspace_tar:
+        with tracing.span("workspace.extract"):
+            extract_workspace_tar(sys.stdin.buffer, Path.cwd())
+
     def _on_tool_use(name: str, tool_input: dict) -> None:
         event = json.dumps({"tool": name, "input": tool_input})
         print(event, file=sys.stderr, flush=True)
 
+    tier = None
+    if args.model or args.max_turns or args.tools:
+        tier = Tier(
+            name="container",
+            model=args.model,
+            max_turns=args.max_turns,
+            allowed_tools=tuple(args.tools.split(",")) if args.tools else DEFAULT_TOOLS,
+        )
+
     agent = Agent(permission_mode="bypassPermissions")
     try:
-        result = asyncio.run(agent.run(args.prompt, on_tool_use=_on_tool_use))
-        findings = AgentFindings(
-            passed=result.passed,
-            details=result.details,
-            steps=result.steps,
-            verification_command=result.verification_command,
+        result = asyncio.run(
+            agent.run(args.prompt, on_tool_use=_on_tool_use, tier=tier)
         )
+        findings = result.to_findings()
+        usage = {"usage": result.usage, "cost_usd": result.cost_usd}
+        print(json.dumps(usage), file=sys.stderr, flush=True)
     except Exception as exc:
         findings = AgentFindings(
             passed=False,
@@ -0,0 +1,194 @@
+"""Early-abort rules evaluated on the agent's live tool results.
+
+Some broken docs are obvious long before the agent gives up: the package
+named in ``pip install`` doesn't exist, or the documented download URL
+returns a 404. Rules watch each tool result as it arrives; when one fires,
+``Agent.run`` stops the query and returns a failed Result with the
+triggering evidence.
+
+A rule is any object with a ``name`` and a ``check(event, history)``
+method that returns an ``AbortDecision`` to stop, or None to continue.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Protocol
+
+# How much of a tool's output to keep as evidence.
+_EVIDENCE_CHARS = 2000
+
+
+@dataclass(frozen=True)
+class ToolEvent:
+    """A completed tool call: what the agent ran and what came back."""
+
+    tool: str
+    input: dict
+    output: str
+    is_error: bool = False
+
+    @property
+    def command(self) -> str:
+        return str(self.input.get("command", ""))
+
+
+@dataclass(frozen=True)
+class AbortDecision:
+    rule: str
+    reason: str
+    evidence: str
+
+
+class EarlyAbort(Exception):
+    """Raised inside a run when an abort rule fires."""
+
+    def __init__(self, decision: AbortDecision) -> None:
+        super().__init__(decision.reason)
+        self.decision = decision
+
+
+class AbortRule(Protocol):
+    name: str
+
+    def check(
+        self, event: ToolEvent, history: list[ToolEvent]
+    ) -> AbortDecision | None: ...
+
+
+def _content_text(content: str | list | None) -> str:
+    """Flatten a tool result's content (string or content blocks) to text."""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return "\n".join(
+        str(block.get("text", "")) for block in content if isinstance(block, dict)
+    )
+
+
+def _evidence(events: list[ToolEvent]) -> str:
+    parts = []
+    for event in events:
+        output = event.output.strip()
+        if len(output) > _EVIDENCE_CHARS:
+            output = "..." + output[-_EVIDENCE_CHARS:]
+        parts.append(f"$ {event.command}\n{output}")
+    return "\n\n".join(parts)
+
+
+# -- built-in rules ---------------------------------------------------------
+
+_INSTALL_RE = re.compile(
+    r"\b(?:pip3?|uv\s+pip|uv|pipx|poetry|npm|pnpm|yarn|cargo|gem)\s+(?:install|add)\b"
+)
+_PACKAGE_MISSING = (
+    "no matching distribution found",
+    "could not find a version that satisfies",
+    "because there are no versions of",
+    "not found in the package registry",
+    "404 not found",
+    "e404",
+    "could not find `",
+    "is not in this registry",
+)
+
+
+class RepeatedInstallFailure:
+    """Stop after repeated install commands fail because a package doesn't exist."""
+
+    name = "repeated-install-failure"
+
+    def __init__(self, threshold: int = 3) -> None:
+        self.threshold = threshold
+
+    @staticmethod
+    def _is_missing_package(event: ToolEvent) -> bool:
+        if event.tool != "Bash" or not _INSTALL_RE.search(event.command):
+            return False
+        output = event.output.lower()
+        return any(marker in output for marker in _PACKAGE_MISSING)
+
+    def check(self, event: ToolEvent, history: list[ToolEvent]) -> AbortDecision | None:
+        if not self._is_missing_package(event):
+            return None
+        failures = [e for e in history if self._is_missing_package(e)]
+        if len(failures) < self.threshold:
+            return None
+        return AbortDecision(
+            rule=self.name,
+            reason=f"{len(failures)} install attempts failed because the "
+            "package could not be found.",
+            evidence=_evidence(failures[-self.threshold :]),
+        )
+
+
+_DOWNLOAD_RE = re.compile(r"\b(?:curl|wget)\b")
+_HTTP_404 = (
+    "the requested url returned error: 404",
+    "error 404",
+    "404 not found",
+    "http/1.1 404",
+    "http/2 404",
+)
+
+
+class DownloadNotFound:
+    """Stop when a documented download (curl/wget) returns HTTP 404."""
+
+    name = "download-not-found"
+
+    def __init__(self, threshold: int = 1) -> None:
+        self.threshold = threshold
+
+    @staticmethod
+    def _is_404(event: ToolEvent) -> bool:
+        if event.tool != "Bash" or not _DOWNLOAD_RE.search(event.command):
+            return False
+        output = event.output.lower()
+        return any(marker in output for marker in _HTTP_404)
+
+    def check(self, event: ToolEvent, history: list[ToolEvent]) -> AbortDecision | None:
+        if not self._is_404(event):
+            return None
+        failures = [e for e in history if self._is_404(e)]
+        if len(failures) < self.threshold:
+            return None
+        return AbortDecision(
+            rule=self.name,
+            reason="A documented download URL returned HTTP 404.",
+            evidence=_evidence(failures[-self.threshold :]),
+        )
+
+
+def default_rules() -> list[AbortRule]:
+    """Return the rules applied when an Agent isn't given any."""
+    return [RepeatedInstallFailure(), DownloadNotFound()]
+
+
+class AbortMonitor:
+    """Feeds tool events to a set of rules and records the run's history."""
+
+    def __init__(self, rules: list[AbortRule]) -> None:
+        self.rules = rules
+        self.history: list[ToolEvent] = []
+        self._pending: dict[str, tuple[str, dict]] = {}
+
+    def tool_started(self, tool_use_id: str, tool: str, tool_input: dict) -> None:
+        self._pending[tool_use_id] = (tool, tool_input)
+
+    def tool_finished(
+        self, tool_use_id: str, content: str | list | None, is_error: bool = False
+    ) -> None:
+        """Match a tool result to its call and observe the completed event."""
+        tool, tool_input = self._pending.pop(tool_use_id, ("unknown", {}))
+        self.observe(ToolEvent(tool, tool_input, _content_text(content), is_error))
+
+    def observe(self, event: ToolEvent) -> None:
+        """Record ``event`` and raise EarlyAbort if any rule fires."""
+        self.history.append(event)
+        for rule in self.rules:
+            decision = rule.check(event, self.history)
+            if decision is not None:
+                raise EarlyAbort(decision)
@@ -1,15 +1,26 @@
+import time
 from collections.abc import Callable
+from contextlib import aclosing
+from pathlib import Path
 
 from claude_agent_sdk import (
     AssistantMessage,
     ClaudeAgentOptions,
     ResultMessage,
+    ToolResultBlock,
     ToolUseBlock,
+    UserMessage,
     query,
 )
 
-from good_start.loader import Prompt, load_prompt
-from good_start.result import AgentFindings, Result, agent_findings_schema
+from good_start import tracing
+from good_start.abort import AbortMonitor, AbortRule, EarlyAbort, default_rules
+from good_start.loader import Prompt, load_prompt, split_prompt
+from good_start.result import AgentFindings, AgentStep, Result, agent_findings_schema
+from good_start.scheduler import Scheduler, TransientAPIError, get_scheduler
+from good_start.search import SEARCH_TOOLS, SERVER_NAME, search_server
+from good_start.session import SessionPool
+from good_start.tiers import FULL_TIER, Tier
 
 
 class Agent:
@@ -17,15 +28,57 @@ class Agent:
         self,
         prompt: Prompt | None = None,
         permission_mode: str | None = None,
+        scheduler: Scheduler | None = None,
+        pool: SessionPool | None = None,
+        abort_rules: list[AbortRule] | None = None,
+        cwd: str | Path | None = None,
     ) -> None:
         self.prompt = prompt or load_prompt()
         self.permission_mode = permission_mode
+        self.scheduler = scheduler or get_scheduler()
+        ## -- optional persistent clients; otherwise one-shot query() per run
+        self.pool = pool
+        ## -- rules that can stop a run early; pass [] to disable
+        self.abort_rules = default_rules() if abort_rules is None else abort_rules
+        ## -- directory the agent works in; defaults to the current one
+        self.cwd = cwd
         self.messages = []
+        ## -- open tool-call spans, keyed by tool use ID
+        self._tool_spans: dict[str, tracing.Span] = {}
 
     async def run(
         self,
         prompt: str | Prompt | None = None,
         on_tool_use: Callable[[str, dict], None] | None = None,
+        tier: Tier | None = None,
+    ) -> Result:
+        ## -- model, turn budget and tools; defaults to the full tier
+        tier = tier or FULL_TIER
+
+        with tracing.span(
+            "agent.run", model=tier.model, max_turns=tier.max_turns
+        ) as run_span:
+            try:
+                result = await self._run(prompt, on_tool_use, tier)
+            finally:
+                ## -- tool calls cut off by an abort or error never got a result
+                for tool_span in self._tool_spans.values():
+                    tool_span.set_error("no result")
+                    tool_span.end()
+                self._tool_spans.clear()
+            run_span.set_attribute("passed", result.passed)
+            run_span.set_attribute("cost_usd", result.cost_usd)
+            run_span.set_attribute("cache_read_tokens", result.cache_read_tokens)
+            run_span.set_attribute("cache_write_tokens", result.cache_write_tokens)
+            for key, value in result.usage.items():
+                run_span.set_attribute(f"usage.{key}", value)
+            return result
+
+    async def _run(
+        self,
+        prompt: str | Prompt | None,
+        on_tool_use: Callable[[str, dict], None] | None,
+        tier: Tier,
     ) -> Result:
         ## -- if not set, use internal agent's prompt
         if prompt is None:
@@ -35,24 +88,54 @@ class Agent:
         if isinstance(prompt, Prompt):
             prompt = prompt.render()
 
+        ## -- static instructions go in the system prompt, where the API
+        ## -- caches them across checks; only the task varies per check
+        system_prompt, prompt = split_prompt(prompt)
+
+        ## -- indexed search tools; the index builds while the agent starts
+        mcp_servers = {}
+        if any(name in SEARCH_TOOLS for name in tier.allowed_tools):
+            server = search_server(Path(self.cwd or Path.cwd()))
+            server.refresh()
+            mcp_servers[SERVER_NAME] = server.config
+
+        options = ClaudeAgentOptions(
+            system_prompt=system_prompt,
+            cwd=self.cwd,
+            mcp_servers=mcp_servers,
+            allowed_tools=list(tier.allowed_tools),
+            model=tier.model,
+            max_turns=tier.max_turns,
+            permission_mode=self.permission_mode,  # ty: ignore[invalid-argument-type]
+            output_format={
+                "type": "json_schema",
+                "schema": agent_findings_schema(),
+            },
+        )
+        start = len(self.messages)
+        started = time.monotonic()
+        monitor = AbortMonitor(self.abort_rules)
+
+        async def _attempt() -> None:
+            nonlocal monitor
+            ## -- drop messages from any previous, rate-limited attempt
+            del self.messages[start:]
+            monitor = AbortMonitor(self.abort_rules)
+            if self.pool is not None:
+                stream = self.pool.stream(prompt, options)
+            else:
+                stream = query(prompt=prompt, options=options)
+            async with aclosing(stream):
+                async for message in stream:
+                    self._handle_message(message, on_tool_use, monitor)
+
         query_error = None
         try:
-            async for message in query(
-                prompt=prompt,
-                options=ClaudeAgentOptions(
-                    allowed_tools=["Bash", "Glob", "Grep", "Read"],
-                    permission_mode=self.permission_mode,  # ty: ignore[invalid-argument-type]
-                    output_format={
-                        "type": "json_schema",
-                        "schema": agent_findings_schema(),
-                    },
-                ),
-            ):
-                self.messages.append(message)
-                if on_tool_use and isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, ToolUseBlock):
-                            on_tool_use(block.name, block.input)
+            await self.scheduler.run(_attempt)
+        except EarlyAbort as abort:
+            return self._with_usage(
+                self._aborted_result(abort, monitor), start, started
+            )
         except Exception as exc:
             query_error = exc
 
@@ -82,4 +165,74 @@ class Agent:
         ## -- create final test result object
         test_result = Result(agent_messages=self.messages, agent_result=agent_result)
 
-        return test_result
+        return self._with_usage(test_result, start, started)
+
+    def _with_usage(self, result: Result, start: int, started: float) -> Result:
+        """Attach duration, cost and token usage for the messages since ``start``."""
+        result.duration = time.monotonic() - started
+        for message in reversed(self.messages[start:]):
+            if isinstance(message, ResultMessage):
+                result.cost_usd = message.total_cost_usd
+                result.usage = {
+                    key: value
+                    for key, value in (message.usage or {}).items()
+                    if isinstance(value, int)
+                }
+                break
+        return result
+
+    def _handle_message(
+        self,
+        message: object,
+        on_tool_use: Callable[[str, dict], None] | None,
+        monitor: AbortMonitor,
+    ) -> None:
+        self.messages.append(message)
+        if isinstance(message, AssistantMessage):
+            if getattr(message, "error", None) == "rate_limit":
+                raise TransientAPIError("API rate limit (429)", status=429)
+            for block in message.content:
+                if isinstance(block, ToolUseBlock):
+                    self._tool_spans[block.id] = tracing.start_span(
+                        f"tool {block.name}",
+                        tool=block.name,
+                        command=block.input.get("command"),
+                    )
+                    monitor.tool_started(block.id, block.name, block.input)
+                    if on_tool_use:
+                        on_tool_use(block.name, block.input)
+        elif isinstance(message, UserMessage) and isinstance(message.content, list):
+            ## -- tool results come back as user messages; may raise EarlyAbort
+            for block in message.content:
+                if isinstance(block, ToolResultBlock):
+                    tool_span = self._tool_spans.pop(block.tool_use_id, None)
+                    if tool_span is not None:
+                        if block.is_error:
+                            tool_span.set_error("tool error")
+                        tool_span.end()
+                    monitor.tool_finished(
+                        block.tool_use_id, block.content, bool(block.is_error)
+                    )
+        elif isinstance(message, ResultMessage) and message.is_error:
+            status = getattr(message, "api_error_status", None)
+            if status in (429, 529):
+                raise TransientAPIError(f"API error status {status}", status=status)
+
+    def _aborted_result(self, abort: EarlyAbort, monitor: AbortMonitor) -> Result:
+        decision = abort.decision
+        steps = [
+            AgentStep(
+                tool=event.tool,
+                input=event.command or str(event.input),
+                output=event.output[-2000:],
+                is_error=event.is_error,
+            )
+            for event in monitor.history
+        ]
+        agent_result = AgentFindings(
+            passed=False,
+            details=f"Stopped early ({decision.rule}): {decision.reason}\n\n"
+            f"Evidence:\n{decision.evidence}",
+            steps=steps,
+        )
+        return Result(agent_messages=self.messages, agent_result=agent_result)
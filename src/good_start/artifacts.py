@@ -0,0 +1,210 @@
+"""Content-addressed, compressed store for large run artifacts.
+
+Tool outputs and agent transcripts can be megabytes each (installer logs
+especially), and a pytest session or batch run keeps hundreds of Results
+alive. ``Result.offload`` moves those payloads into this store and keeps
+only lightweight ``ArtifactRef``s, which load the content back on access.
+
+Objects are keyed by the SHA-256 of their uncompressed bytes, so identical
+outputs are stored once across all runs. They are compressed with zstd when
+the ``zstandard`` package is installed, and gzip otherwise. Each offloaded
+run also writes a small JSON manifest, which ``good-start export`` bundles
+together with the artifacts it references. Transcripts are stored as JSON
+lines with each SDK dataclass tagged by its type name, so they load back as
+the original message objects without unpickling anything from the cache.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from claude_agent_sdk import types as sdk_types
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Step outputs at or below this many bytes stay inline on the Result.
+INLINE_LIMIT = 4096
+
+# Key naming the SDK dataclass an encoded transcript object was built from.
+TYPE_KEY = "_type"
+
+# SDK dataclasses a transcript may rebuild; other tags load as plain dicts.
+_SDK_TYPES = {
+    name: cls
+    for name, cls in vars(sdk_types).items()
+    if isinstance(cls, type) and dataclasses.is_dataclass(cls)
+}
+
+
+def default_store_path() -> Path:
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "good-start" / "artifacts"
+
+
+def _compress(data: bytes) -> tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data), ".zst"
+    return gzip.compress(data, mtime=0), ".gz"
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(
+                "This artifact is zstd-compressed; install `zstandard` to read it."
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class ArtifactStore:
+    """Deduplicating object store on the local filesystem."""
+
+    def __init__(self, root: str | Path | None = None) -> None:
+        self.root = Path(root) if root is not None else default_store_path()
+
+    def _object_dir(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2]
+
+    def _find(self, digest: str) -> Path | None:
+        for suffix in (".zst", ".gz"):
+            path = self._object_dir(digest) / (digest + suffix)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, data: str | bytes) -> ArtifactRef:
+        """Store ``data`` (if not already present) and return a reference."""
+        raw = data.encode() if isinstance(data, str) else data
+        digest = hashlib.sha256(raw).hexdigest()
+        if self._find(digest) is None:
+            compressed, suffix = _compress(raw)
+            directory = self._object_dir(digest)
+            directory.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so concurrent writers never expose a
+            # partial object.
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, directory / (digest + suffix))
+        return ArtifactRef(digest=digest, size=len(raw), store=self)
+
+    def get(self, digest: str) -> bytes:
+        """Return the uncompressed bytes stored under ``digest``."""
+        path = self._find(digest)
+        if path is None:
+            raise KeyError(f"No artifact {digest} in {self.root}")
+        return _decompress(path.read_bytes(), path.suffix)
+
+    # -- run manifests ------------------------------------------------------
+
+    def save_manifest(self, run_id: str, manifest: dict[str, Any]) -> Path:
+        path = self.root / "runs" / f"{run_id}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(manifest, indent=2))
+        return path
+
+    def load_manifest(self, run_id: str) -> dict[str, Any]:
+        path = self.root / "runs" / f"{run_id}.json"
+        if not path.exists():
+            raise KeyError(f"No run {run_id!r} in {self.root}")
+        return json.loads(path.read_text())
+
+    def latest_run(self) -> str | None:
+        """Return the id of the most recently offloaded run, if any."""
+        runs = list((self.root / "runs").glob("*.json"))
+        if not runs:
+            return None
+        return max(runs, key=lambda p: p.stat().st_mtime_ns).stem
+
+    def export(self, run_id: str, dest: str | Path) -> Path:
+        """Bundle a run's manifest and artifacts into a ``.tar.gz`` at ``dest``."""
+        manifest = self.load_manifest(run_id)
+        dest = Path(dest)
+        with tarfile.open(dest, "w:gz") as tar:
+
+            def _add(name: str, data: bytes) -> None:
+                info = tarfile.TarInfo(f"{run_id}/{name}")
+                info.size = len(data)
+                info.mtime = int(manifest.get("timestamp", 0))
+                tar.addfile(info, io.BytesIO(data))
+
+            _add("manifest.json", json.dumps(manifest, indent=2).encode())
+            for i, step in enumerate(manifest["steps"]):
+                if step.get("artifact"):
+                    name = f"steps/{i:03d}-{step['tool']}.txt"
+                    _add(name, self.get(step["artifact"]))
+            if manifest.get("transcript"):
+                _add("transcript.jsonl", self.get(manifest["transcript"]))
+        return dest
+
+
+def _encode(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            TYPE_KEY: type(value).__name__,
+            **{
+                field.name: _encode(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+            },
+        }
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    value = {key: _decode(item) for key, item in value.items()}
+    cls = _SDK_TYPES.get(value.get(TYPE_KEY))
+    if cls is None:
+        return value
+    names = {field.name for field in dataclasses.fields(cls) if field.init}
+    return cls(**{key: item for key, item in value.items() if key in names})
+
+
+def transcript_jsonl(messages: list[Any]) -> str:
+    """Render SDK messages as one JSON object per line.
+
+    Raises ``TypeError`` or ``ValueError`` if a message can't be encoded.
+    """
+    lines = [json.dumps(_encode(message), default=str) for message in messages]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def load_transcript(text: str) -> list[Any]:
+    """Rebuild the messages of a ``transcript_jsonl`` transcript."""
+    return [_decode(json.loads(line)) for line in text.splitlines() if line]
+
+
+@dataclass(frozen=True)
+class ArtifactRef:
+    """A lazy handle on one stored artifact."""
+
+    digest: str
+    size: int
+    store: ArtifactStore
+
+    def load_bytes(self) -> bytes:
+        return self.store.get(self.digest)
+
+    def load(self) -> str:
+        return self.load_bytes().decode(errors="replace")
@@ -1,13 +1,30 @@
 import asyncio
+import time
+from collections.abc import Callable
 from pathlib import Path
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 from rich.text import Text
 
+from good_start import tracing
+from good_start.discovery import prompt_context
+from good_start.display import EventRenderer
+from good_start.history import record_run
 from good_start.loader import load_prompt
-from good_start.runtime import resolve_runtime
+from good_start.profiling import profiling
+from good_start.report import FORMATS, open_report
+from good_start.result import Result
+from good_start.runtime import (
+    STAGE_MODES,
+    format_size,
+    parse_memory,
+    resolve_runtime,
+)
+from good_start.sections import run_sections, split_install_sections
+from good_start.tiers import run_tiered, tier_policy
 
 app = typer.Typer(
     name="good-start",
@@ -15,6 +32,79 @@ app = typer.Typer(
 )
 
 console = Console()
+err_console = Console(stderr=True)
+
+
+def _print_result(result: Result) -> None:
+    """Print a check result as a color-coded panel."""
+    if result.passed:
+        status = Text("PASSED", style="bold green")
+    else:
+        status = Text("FAILED", style="bold red")
+
+    body = Text()
+    body.append("Status: ")
+    body.append(status)
+    body.append(f"\n\n{result.details}")
+
+    if result.verification_command:
+        body.append("\n\nVerification: ")
+        body.append(Text(result.verification_command, style="dim"))
+
+    if result.tier:
+        body.append("\n\nDecided by: ")
+        body.append(Text(f"{result.tier} tier", style="dim"))
+
+    if result.run_id:
+        body.append("\n\nRun: ")
+        body.append(Text(result.run_id, style="dim"))
+
+    if not result.passed and result.log_paths:
+        body.append("\n\nLogs: ")
+        body.append(Text(str(result.log_paths["stdout"].parent), style="dim"))
+
+    panel = Panel(
+        body,
+        title="good-start",
+        subtitle=result.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        border_style="green" if result.passed else "red",
+    )
+
+    console.print(panel)
+
+
+def _print_stats(result: Result) -> None:
+    """Print a check's duration, spend and container resource usage."""
+    table = Table(title="Run statistics", show_header=False)
+    table.add_column(style="dim")
+    table.add_column(justify="right")
+    if result.duration is not None:
+        table.add_row("Duration", f"{result.duration:.1f}s")
+    if result.cost_usd is not None:
+        table.add_row("Cost", f"${result.cost_usd:.4f}")
+    for key in ("input_tokens", "output_tokens"):
+        if key in result.usage:
+            table.add_row(key.replace("_", " ").capitalize(), f"{result.usage[key]:,}")
+    if result.cache_read_tokens is not None:
+        table.add_row("Cache read tokens", f"{result.cache_read_tokens:,}")
+    if result.cache_write_tokens is not None:
+        table.add_row("Cache write tokens", f"{result.cache_write_tokens:,}")
+    if result.resources is not None:
+        res = result.resources
+        table.add_row("Peak memory", format_size(res.peak_memory))
+        if res.cpu_seconds is not None:
+            table.add_row("CPU time", f"{res.cpu_seconds:.1f}s")
+        table.add_row(
+            "Disk read / written",
+            f"{format_size(res.block_read)} / {format_size(res.block_write)}",
+        )
+        table.add_row(
+            "Network in / out", f"{format_size(res.net_rx)} / {format_size(res.net_tx)}"
+        )
+    if not table.rows:
+        console.print("[dim]No run statistics available.[/dim]")
+        return
+    console.print(table)
 
 
 @app.callback()
@@ -24,6 +114,7 @@ def main():
 
 @app.command()
 def check(
+    ctx: typer.Context,
     target: str = typer.Argument(
         default=".",
         help="Path to the getting-started documentation file, or '.' to let the agent find it.",
@@ -39,6 +130,111 @@ def check(
         "-v",
         help="Show detailed container build and run output.",
     ),
+    stage: str | None = typer.Option(
+        None,
+        "--stage",
+        help="Stage only selected files into the container instead of mounting "
+        "the whole project: 'git' (tracked files) or 'filter' (include/exclude).",
+    ),
+    include: list[str] | None = typer.Option(
+        None,
+        "--include",
+        help="Glob of files to stage (repeatable). Used with --stage.",
+    ),
+    exclude: list[str] | None = typer.Option(
+        None,
+        "--exclude",
+        help="Glob of files or directories to leave out (repeatable). Used with --stage.",
+    ),
+    default_excludes: bool = typer.Option(
+        True,
+        "--default-excludes/--no-default-excludes",
+        help="With --stage filter, also leave out node_modules, .git, "
+        "virtualenvs and build outputs.",
+    ),
+    cpus: float | None = typer.Option(
+        None,
+        "--cpus",
+        help="CPU limit for the agent container (e.g. 2 or 1.5).",
+    ),
+    memory: str | None = typer.Option(
+        None,
+        "--memory",
+        help="Memory limit for the agent container (e.g. 2g). "
+        "An OOM-killed container is retried once with double the limit.",
+    ),
+    endpoints: list[str] | None = typer.Option(
+        None,
+        "--endpoint",
+        help="Container engine to spread runs across (repeatable): podman, "
+        "docker, or a unix://, tcp:// or ssh:// URL. Default: "
+        "$GOOD_START_ENDPOINTS, else the local engine.",
+    ),
+    sections: bool = typer.Option(
+        False,
+        "--sections",
+        help="Split the target file into its alternative install sections "
+        "(pip, conda, from source, ...) and check each one in parallel.",
+    ),
+    tiered: bool = typer.Option(
+        False,
+        "--tiered",
+        help="Run a quick smoke pass first and the full agent only if it doesn't pass.",
+    ),
+    smoke_model: str | None = typer.Option(
+        None, "--smoke-model", help="Model for the smoke pass (default: haiku)."
+    ),
+    smoke_max_turns: int | None = typer.Option(
+        None, "--smoke-max-turns", help="Turn budget for the smoke pass (default: 15)."
+    ),
+    indexed_search: bool = typer.Option(
+        False,
+        "--indexed-search",
+        help="Index the project once per run and give the agent indexed "
+        "file and content search tools instead of Glob and Grep.",
+    ),
+    server: bool = typer.Option(
+        False,
+        "--server",
+        help="Submit the check to a running `good-start serve` daemon.",
+    ),
+    socket: Path | None = typer.Option(
+        None,
+        "--socket",
+        help="Daemon socket path (used with --server).",
+    ),
+    priority: int = typer.Option(
+        0,
+        "--priority",
+        help="Queue priority on the daemon; lower runs first (used with --server).",
+    ),
+    stats: bool = typer.Option(
+        False,
+        "--stats",
+        help="Print duration, cost, tokens and container resource usage.",
+    ),
+    profile: Path | None = typer.Option(
+        None,
+        "--profile",
+        help="Write cProfile stats for the host and the container to this directory.",
+    ),
+    trace: Path | None = typer.Option(
+        None,
+        "--trace",
+        help="Append the check's trace spans to this file as OTLP JSON.",
+    ),
+    report_format: str | None = typer.Option(
+        None,
+        "--format",
+        help="Write a machine-readable report instead of the panel: "
+        "'ndjson' (tool events and results), 'json' or 'junit'.",
+    ),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="File for the --format report (default: stdout).",
+    ),
 ) -> None:
     """Run the good-start agent against a project's documentation."""
     target_path = Path(target)
@@ -46,39 +242,316 @@ def check(
         console.print(f"[red]Error:[/red] path '{target}' does not exist.")
         raise typer.Exit(code=1)
 
+    if report_format is not None and report_format not in FORMATS:
+        console.print(
+            f"[red]Error:[/red] --format must be one of: {', '.join(FORMATS)}."
+        )
+        raise typer.Exit(code=1)
+
+    if profile is not None:
+        # Stats are written when the command finishes, however it exits.
+        ctx.with_resource(profiling(profile))
+        err_console.print(f"[dim]Profiling to {profile}[/dim]")
+
+    if trace is not None:
+        # The root span ends, and the trace is written, when the command does.
+        ctx.with_resource(tracing.tracing(trace))
+        ctx.with_resource(tracing.span("check", target=target))
+
     prompt = load_prompt()
-    rendered = prompt.render(target=target)
+    rendered = prompt.render(**prompt_context(target))
+
+    if stage is not None and stage not in STAGE_MODES:
+        console.print(
+            f"[red]Error:[/red] --stage must be one of: {', '.join(STAGE_MODES)}."
+        )
+        raise typer.Exit(code=1)
+
+    if memory is not None:
+        try:
+            parse_memory(memory)
+        except ValueError as exc:
+            console.print(f"[red]Error:[/red] {exc}")
+            raise typer.Exit(code=1)
+
+    install_sections = []
+    if sections:
+        if not target_path.is_file():
+            console.print("[red]Error:[/red] --sections requires a file target.")
+            raise typer.Exit(code=1)
+        install_sections = split_install_sections(target_path.read_text())
+        if install_sections:
+            titles = ", ".join(s.title for s in install_sections)
+            err_console.print(
+                f"[dim]Checking {len(install_sections)} sections: {titles}[/dim]"
+            )
+        else:
+            err_console.print(
+                "[dim]No alternative install sections found; checking the whole file.[/dim]"
+            )
+
+    # Tool events from every run are batched into one display, and streamed
+    # into the report too if it records them.
+    renderer = EventRenderer(err_console)
+    report = open_report(report_format, output) if report_format else None
+
+    def _sink(run: str = "") -> Callable[[str, dict], None]:
+        callbacks = [renderer.sink(run)]
+        if report is not None and report.records_events:
+            callbacks.append(report.sink(run))
+
+        def _on_tool_use(name: str, tool_input: dict) -> None:
+            for callback in callbacks:
+                callback(name, tool_input)
+
+        return _on_tool_use
+
+    if server:
+        from good_start.server import ServerRuntime
+
+        options = {
+            "no_container": no_container,
+            "stage": stage,
+            "include": include,
+            "exclude": exclude,
+            "default_excludes": default_excludes,
+            "cpus": cpus,
+            "memory": memory,
+            "endpoints": endpoints,
+        }
+        runtime = ServerRuntime(
+            options=options,
+            priority=priority,
+            socket_path=socket,
+            on_tool_use=_sink(),
+        )
+    else:
+        try:
+            runtime = resolve_runtime(
+                no_container=no_container,
+                verbose=verbose,
+                stage=stage,
+                include=include,
+                exclude=exclude,
+                default_excludes=default_excludes,
+                cpus=cpus,
+                memory=memory,
+                endpoints=endpoints,
+            )
+        except ValueError as exc:
+            console.print(f"[red]Error:[/red] {exc}")
+            raise typer.Exit(code=1)
+
+    tiers = (
+        tier_policy(tiered, smoke_model, smoke_max_turns, indexed_search)
+        if tiered or indexed_search
+        else None
+    )
 
-    runtime = resolve_runtime(no_container=no_container, verbose=verbose)
     try:
-        result = asyncio.run(runtime.run(rendered, target))
+        with renderer:
+            if install_sections:
+                result = asyncio.run(
+                    run_sections(
+                        runtime,
+                        prompt,
+                        target,
+                        install_sections,
+                        tiers,
+                        on_tool_use_for=_sink,
+                    )
+                )
+            elif tiers:
+                result = asyncio.run(
+                    run_tiered(runtime, rendered, target, tiers, _sink())
+                )
+            else:
+                result = asyncio.run(runtime.run(rendered, target, on_tool_use=_sink()))
     except RuntimeError as exc:
+        if report is not None:
+            report.close()
         console.print(f"[red]Error:[/red] {exc}")
         raise typer.Exit(code=1)
 
-    # -- build output
-    if result.passed:
-        status = Text("PASSED", style="bold green")
+    # Keep the run's outputs for `good-start export`; a read-only cache or
+    # an unencodable transcript shouldn't fail the check.
+    try:
+        result.offload()
+    except (OSError, TypeError, ValueError):
+        pass
+    record_run(result, target, rendered, source="cli")
+
+    if report is not None:
+        report.result(target, result)
+        report.close()
     else:
-        status = Text("FAILED", style="bold red")
+        _print_result(result)
+        if stats:
+            _print_stats(result)
 
-    body = Text()
-    body.append("Status: ")
-    body.append(status)
-    body.append(f"\n\n{result.details}")
+    if not result.passed:
+        raise typer.Exit(code=1)
 
-    if result.verification_command:
-        body.append("\n\nVerification: ")
-        body.append(Text(result.verification_command, style="dim"))
 
-    panel = Panel(
-        body,
-        title="good-start",
-        subtitle=result.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-        border_style="green" if result.passed else "red",
+@app.command()
+def export(
+    run_id: str | None = typer.Argument(
+        None, help="Run to export (default: the most recent run)."
+    ),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Bundle path (default: <run>.tar.gz)."
+    ),
+):
+    """Bundle a run's step outputs and transcript into a .tar.gz archive."""
+    from good_start.artifacts import ArtifactStore
+
+    store = ArtifactStore()
+    run_id = run_id or store.latest_run()
+    if run_id is None:
+        console.print("[red]Error:[/red] no recorded runs to export.")
+        raise typer.Exit(code=1)
+    try:
+        path = store.export(run_id, output or Path(f"{run_id}.tar.gz"))
+    except KeyError as exc:
+        console.print(f"[red]Error:[/red] {exc.args[0]}")
+        raise typer.Exit(code=1)
+    console.print(f"Exported run {run_id} to {path}")
+
+
+@app.command()
+def history(
+    target: str | None = typer.Argument(
+        None, help="Only show runs for this target (default: all targets)."
+    ),
+    days: float | None = typer.Option(
+        None, "--days", help="Only include runs from the last N days."
+    ),
+):
+    """Show latency, cost and flakiness of past checks per target."""
+    from good_start.history import RunHistory
+
+    since = time.time() - days * 86400 if days is not None else None
+    stats = RunHistory().summarize(target, since)
+    if not stats:
+        console.print("No recorded runs.")
+        return
+
+    def _seconds(value: float | None) -> str:
+        return "-" if value is None else f"{value:.1f}s"
+
+    def _usd(value: float | None, sign: bool = False) -> str:
+        if value is None:
+            return "-"
+        return f"{value:+.4f}" if sign else f"{value:.4f}"
+
+    def _pct(value: float | None) -> str:
+        return "-" if value is None else f"{value:.0%}"
+
+    table = Table(title="good-start history")
+    table.add_column("Target")
+    for name in ("Runs", "Pass", "p50", "p95", "Avg $", "$ trend", "Flaky"):
+        table.add_column(name, justify="right")
+    for s in stats:
+        table.add_row(
+            s.target,
+            str(s.runs),
+            _pct(s.pass_rate),
+            _seconds(s.p50),
+            _seconds(s.p95),
+            _usd(s.avg_cost),
+            _usd(s.cost_trend, sign=True),
+            _pct(s.flake_rate),
+        )
+    console.print(table)
+
+
+@app.command()
+def serve(
+    socket: Path | None = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket to listen on (default: per-user path in $XDG_RUNTIME_DIR or /tmp).",
+    ),
+    workers: int = typer.Option(
+        2,
+        "--workers",
+        help="Number of checks to run concurrently.",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Show detailed container build and run output.",
+    ),
+) -> None:
+    """Run a long-lived daemon that accepts checks from `good-start check --server`."""
+    from good_start.server import Server
+
+    daemon = Server(socket_path=socket, workers=workers, verbose=verbose)
+    console.print(
+        f"good-start server listening on {daemon.socket_path} "
+        f"({workers} workers). Press Ctrl+C to stop."
     )
+    try:
+        asyncio.run(daemon.serve_forever())
+    except KeyboardInterrupt:
+        pass
 
-    console.print(panel)
 
-    if not result.passed:
+@app.command()
+def watch(
+    target: str = typer.Argument(
+        default=".",
+        help="Path to the getting-started documentation file, or '.' to let the agent find it.",
+    ),
+    no_container: bool = typer.Option(
+        False,
+        "--no-container",
+        help="Run the agent directly on the host instead of in a container.",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Show detailed container build and run output.",
+    ),
+    debounce: float = typer.Option(
+        1.0,
+        "--debounce",
+        help="Seconds to wait for edits to settle before re-checking.",
+    ),
+) -> None:
+    """Re-run the check whenever the documentation or files it references change."""
+    from good_start.watch import watch as watch_docs
+
+    if not Path(target).exists():
+        console.print(f"[red]Error:[/red] path '{target}' does not exist.")
+        raise typer.Exit(code=1)
+
+    prompt = load_prompt()
+    # One runtime for the whole session keeps the image check warm.
+    runtime = resolve_runtime(no_container=no_container, verbose=verbose)
+
+    async def _run_check() -> Result:
+        return await runtime.run(prompt.render(**prompt_context(target)), target)
+
+    def _on_change(paths: list[Path]) -> None:
+        names = ", ".join(str(p.name) for p in paths)
+        console.print(f"[dim]Changed: {names}. Re-checking...[/dim]")
+
+    console.print(f"[dim]Watching {target}. Press Ctrl+C to stop.[/dim]")
+    try:
+        asyncio.run(
+            watch_docs(
+                target,
+                _run_check,
+                _print_result,
+                on_change=_on_change,
+                debounce=debounce,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
         raise typer.Exit(code=1)
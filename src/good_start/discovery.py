@@ -0,0 +1,130 @@
+"""Host-side discovery of getting-started documentation.
+
+When the target is ".", the agent would otherwise spend several model
+round trips globbing and reading files just to find the install docs.
+``discover_docs`` does a shallow scan on the host instead and returns a
+ranked index that is rendered into the prompt.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# Doc stems (lowercased, without extension) and their base relevance.
+_DOC_SCORES = {
+    "readme": 100,
+    "quickstart": 95,
+    "getting_started": 95,
+    "getting-started": 95,
+    "gettingstarted": 95,
+    "install": 90,
+    "installation": 90,
+    "setup": 70,
+    "usage": 40,
+    "index": 30,
+    "contributing": 20,
+}
+_DOC_SUFFIXES = {"", ".md", ".rst", ".txt", ".adoc", ".markdown"}
+_DOC_DIRS = ("docs", "doc", "documentation")
+
+MANIFESTS = (
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "environment.yml",
+    "package.json",
+    "Cargo.toml",
+    "go.mod",
+    "Gemfile",
+    "pom.xml",
+    "build.gradle",
+    "CMakeLists.txt",
+    "Makefile",
+)
+LOCKFILES = (
+    "uv.lock",
+    "poetry.lock",
+    "Pipfile.lock",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "Cargo.lock",
+    "go.sum",
+    "Gemfile.lock",
+)
+
+MAX_DOCS = 10
+
+
+@dataclass(frozen=True)
+class DocCandidate:
+    path: str
+    kind: str  # "doc", "manifest" or "lockfile"
+    score: int
+
+
+def _doc_score(name: str, depth: int) -> int | None:
+    stem, suffix = os.path.splitext(name.lower())
+    if suffix not in _DOC_SUFFIXES:
+        return None
+    base = _DOC_SCORES.get(stem)
+    if base is None:
+        return None
+    # Prefer top-level files and Markdown over nested or other formats.
+    return base - 15 * depth - (0 if suffix in {".md", ""} else 5)
+
+
+def _scan(root: Path, rel: str, depth: int, max_depth: int) -> list[DocCandidate]:
+    found: list[DocCandidate] = []
+    try:
+        entries = list(os.scandir(root / rel if rel else root))
+    except OSError:
+        return found
+    for entry in entries:
+        path = f"{rel}/{entry.name}" if rel else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if depth < max_depth and (depth > 0 or entry.name.lower() in _DOC_DIRS):
+                found.extend(_scan(root, path, depth + 1, max_depth))
+            continue
+        score = _doc_score(entry.name, depth)
+        if score is not None:
+            found.append(DocCandidate(path, "doc", score))
+        elif depth == 0 and entry.name in MANIFESTS:
+            found.append(DocCandidate(path, "manifest", 0))
+        elif depth == 0 and entry.name in LOCKFILES:
+            found.append(DocCandidate(path, "lockfile", 0))
+    return found
+
+
+def discover_docs(root: str | Path = ".", max_depth: int = 2) -> list[DocCandidate]:
+    """Return ranked getting-started docs, manifests and lockfiles under ``root``.
+
+    Only the project root and conventional doc directories (``docs/``,
+    ``doc/``, ``documentation/``) are scanned, so this stays fast on large
+    repositories. Docs come first, highest score first, followed by
+    manifests and lockfiles.
+    """
+    found = _scan(Path(root), "", 0, max_depth)
+    docs = sorted(
+        (c for c in found if c.kind == "doc"), key=lambda c: (-c.score, c.path)
+    )[:MAX_DOCS]
+    manifests = sorted(
+        (c for c in found if c.kind == "manifest"),
+        key=lambda c: MANIFESTS.index(c.path),
+    )
+    lockfiles = sorted(
+        (c for c in found if c.kind == "lockfile"),
+        key=lambda c: LOCKFILES.index(c.path),
+    )
+    return docs + manifests + lockfiles
+
+
+def prompt_context(target: str) -> dict[str, object]:
+    """Return template variables for rendering the prompt against ``target``."""
+    context: dict[str, object] = {"target": target}
+    if target == ".":
+        context["doc_index"] = discover_docs(target)
+    return context
@@ -1,14 +1,33 @@
-"""Shared formatting for real-time tool event display."""
+"""Shared formatting for real-time tool event display.
+
+``EventRenderer`` batches events instead of writing and flushing one line
+per event, which is what limits throughput with many concurrent runs or a
+chatty agent. On a terminal it redraws a rich Live display at a fixed frame
+rate, showing each run's most recent events and counters; otherwise it
+writes plain lines, flushed once per frame.
+"""
 
 from __future__ import annotations
 
-from rich.console import Console
+import threading
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Self
+
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
+from rich.text import Text
+
+from good_start.search import FIND_FILES_TOOL, SEARCH_CODE_TOOL
 
 _TOOL_PREFIXES = {
     "Bash": "$",
     "Read": ">",
     "Grep": "?",
     "Glob": "*",
+    SEARCH_CODE_TOOL: "?",
+    FIND_FILES_TOOL: "*",
 }
 
 # Internal SDK events that shouldn't be displayed as tool actions.
@@ -29,6 +48,11 @@ def format_tool_event(tool_name: str, tool_input: dict) -> str:
         return f"{prefix} grep {pattern!r} {path}"
     elif tool_name == "Glob":
         return f"{prefix} {tool_input.get('pattern', '')}"
+    elif tool_name == SEARCH_CODE_TOOL:
+        pattern = tool_input.get("pattern", "")
+        return f"{prefix} search {pattern!r} {tool_input.get('glob') or '.'}"
+    elif tool_name == FIND_FILES_TOOL:
+        return f"{prefix} find {tool_input.get('pattern', '')}"
     else:
         return f"{prefix} {tool_name} {tool_input}"
 
@@ -39,3 +63,123 @@ def print_tool_event(tool_name: str, tool_input: dict, console: Console) -> None
         return
     line = format_tool_event(tool_name, tool_input)
     console.print(f"  [dim]{line}[/dim]")
+
+
+@dataclass
+class _RunView:
+    """Rolling window and counters for one run."""
+
+    window: int
+    lines: deque[str] = field(init=False)
+    counts: Counter[str] = field(default_factory=Counter)
+    total: int = 0
+
+    def __post_init__(self) -> None:
+        self.lines = deque(maxlen=self.window)
+
+
+class EventRenderer:
+    """Coalesces tool events from concurrent runs into batched output.
+
+    Use as a context manager and pass ``sink(label)`` as a runtime's
+    ``on_tool_use``. Events only update in-memory state; output is drawn
+    ``fps`` times a second at most. ``live`` defaults to whether
+    ``console`` is a terminal.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        fps: float = 10,
+        window: int = 5,
+        live: bool | None = None,
+    ) -> None:
+        self.console = console
+        self.fps = fps
+        self.window = window
+        self.live = console.is_terminal if live is None else live
+        self._runs: dict[str, _RunView] = {}
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._display: Live | None = None
+        self._thread: threading.Thread | None = None
+
+    def sink(self, run: str = "") -> Callable[[str, dict], None]:
+        """Return an ``on_tool_use`` callback that files events under ``run``."""
+
+        def _on_tool_use(tool_name: str, tool_input: dict) -> None:
+            self.event(run, tool_name, tool_input)
+
+        return _on_tool_use
+
+    def event(self, run: str, tool_name: str, tool_input: dict) -> None:
+        """Record one tool event; safe to call from any thread."""
+        if tool_name in _HIDDEN_TOOLS:
+            return
+        line = format_tool_event(tool_name, tool_input)
+        with self._lock:
+            view = self._runs.get(run)
+            if view is None:
+                view = self._runs[run] = _RunView(self.window)
+            view.lines.append(line)
+            view.counts[tool_name] += 1
+            view.total += 1
+            if not self.live:
+                self._pending.append(f"  [{run}] {line}" if run else f"  {line}")
+
+    def start(self) -> None:
+        if self.live:
+            self._display = Live(
+                console=self.console,
+                get_renderable=self._render,
+                refresh_per_second=self.fps,
+            )
+            self._display.start()
+        else:
+            self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Draw or flush whatever is still pending and stop."""
+        if self._display is not None:
+            self._display.stop()
+            self._display = None
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._flush()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _render(self) -> RenderableType:
+        with self._lock:
+            runs = [
+                (run, view.total, view.counts.most_common(), list(view.lines))
+                for run, view in self._runs.items()
+            ]
+        parts: list[RenderableType] = []
+        for run, total, counts, lines in runs:
+            header = Text(f"  {run or 'agent'}", style="bold")
+            tally = ", ".join(f"{tool} {n}" for tool, n in counts)
+            header.append(f"  {total} events ({tally})", style="dim")
+            parts.append(header)
+            parts.extend(Text(f"    {line}", style="dim") for line in lines)
+        return Group(*parts)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(1 / self.fps):
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            lines, self._pending = self._pending, []
+        if lines:
+            self.console.file.write("\n".join(lines) + "\n")
+            self.console.file.flush()
@@ -0,0 +1,207 @@
+"""Local SQLite history of check runs, and analytics over it.
+
+Every check run from the CLI or the pytest plugin is recorded with its
+target, the hashes of the target docs and rendered prompt, outcome,
+duration and token usage. ``good-start history`` summarizes the table per
+target: latency percentiles, cost trend and flake rate.
+
+A run is flaky when the outcome changes between runs whose target and
+prompt hashes are identical, since nothing the agent was given changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from good_start.discovery import discover_docs
+from good_start.result import Result
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    target_hash TEXT,
+    prompt_hash TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    duration REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    cache_read_tokens INTEGER,
+    cost_usd REAL,
+    run_id TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_target_started ON runs (target, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+"""
+
+
+def default_history_path() -> Path:
+    data = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data) / "good-start" / "history.db"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def target_hash(target: str | Path) -> str | None:
+    """Hash the docs a check reads: the file itself, or the discovered docs."""
+    path = Path(target)
+    if path.is_file():
+        return _sha256(path.read_bytes())
+    if not path.is_dir():
+        return None
+    digest = hashlib.sha256()
+    for doc in sorted(discover_docs(path), key=lambda d: d.path):
+        digest.update(doc.path.encode() + b"\0")
+        digest.update((path / doc.path).read_bytes())
+    return digest.hexdigest()
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Linear-interpolated percentile (0-100) of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass(frozen=True)
+class TargetStats:
+    target: str
+    runs: int
+    pass_rate: float
+    p50: float | None
+    p95: float | None
+    avg_cost: float | None
+    # Average cost of the newer half of the runs minus the older half.
+    cost_trend: float | None
+    flake_rate: float | None
+
+
+class RunHistory:
+    """Append-only run log in a SQLite database."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else default_history_path()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel pytest workers write to the same database.
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record(self, result: Result, target: str, prompt: str, source: str) -> None:
+        """Add one finished run to the history."""
+        # Results are created when a run finishes.
+        started_at = result.timestamp.timestamp() - (result.duration or 0)
+        row = (
+            started_at,
+            source,
+            str(Path(target).resolve()),
+            target_hash(target),
+            _sha256(prompt.encode()),
+            int(result.passed),
+            result.duration,
+            result.usage.get("input_tokens"),
+            result.usage.get("output_tokens"),
+            result.cache_read_tokens,
+            result.cost_usd,
+            result.run_id,
+        )
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO runs (started_at, source, target, target_hash, "
+                "prompt_hash, passed, duration, input_tokens, output_tokens, "
+                "cache_read_tokens, cost_usd, run_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+        conn.close()
+
+    def runs(
+        self, target: str | None = None, since: float | None = None
+    ) -> list[sqlite3.Row]:
+        """Return recorded runs, oldest first, optionally filtered."""
+        query = "SELECT * FROM runs WHERE 1 = 1"
+        params: list[object] = []
+        if target is not None:
+            query += " AND target = ?"
+            params.append(str(Path(target).resolve()))
+        if since is not None:
+            query += " AND started_at >= ?"
+            params.append(since)
+        query += " ORDER BY started_at"
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+    def summarize(
+        self, target: str | None = None, since: float | None = None
+    ) -> list[TargetStats]:
+        """Return per-target statistics over the selected runs."""
+        by_target: dict[str, list[sqlite3.Row]] = {}
+        for row in self.runs(target, since):
+            by_target.setdefault(row["target"], []).append(row)
+        return [_stats(name, rows) for name, rows in sorted(by_target.items())]
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _stats(target: str, rows: list[sqlite3.Row]) -> TargetStats:
+    durations = [r["duration"] for r in rows if r["duration"] is not None]
+    costs = [r["cost_usd"] for r in rows if r["cost_usd"] is not None]
+
+    cost_trend = None
+    if len(costs) >= 2:
+        half = len(costs) // 2
+        cost_trend = _mean(costs[-half:]) - _mean(costs[:half])
+
+    # Count outcome flips between consecutive runs on identical inputs.
+    last_outcome: dict[tuple[str | None, str], int] = {}
+    flips = comparisons = 0
+    for row in rows:
+        key = (row["target_hash"], row["prompt_hash"])
+        if key in last_outcome:
+            comparisons += 1
+            flips += last_outcome[key] != row["passed"]
+        last_outcome[key] = row["passed"]
+
+    return TargetStats(
+        target=target,
+        runs=len(rows),
+        pass_rate=sum(r["passed"] for r in rows) / len(rows),
+        p50=percentile(durations, 50),
+        p95=percentile(durations, 95),
+        avg_cost=_mean(costs),
+        cost_trend=cost_trend,
+        flake_rate=flips / comparisons if comparisons else None,
+    )
+
+
+def record_run(result: Result, target: str, prompt: str, source: str) -> None:
+    """Record ``result`` in the default history, ignoring storage errors.
+
+    History is best-effort: a read-only home or a locked database must
+    never fail the check itself.
+    """
+    try:
+        RunHistory().record(result, target, prompt, source)
+    except (OSError, sqlite3.Error):
+        pass
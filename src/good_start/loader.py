@@ -1,3 +1,22 @@
+"""Load prompt templates: Markdown with YAML frontmatter and Jinja2 markup.
+
+A prompt can be split into a static system section, identical across
+checks, and a small dynamic user section that carries the target-specific
+parts. The API caches the system prompt as a prefix, so a long static
+section is paid for in full once and read from the cache on later checks.
+Declare the split in the frontmatter with ``user_section``, the line where
+the user section starts:
+
+    ---
+    user_section: "## Task"
+    ---
+
+Rendering marks the split with ``SPLIT_MARKER``, so the rendered prompt
+stays a single string on its way to the agent, which separates the two
+with ``split_prompt``. Prompts without ``user_section`` are sent whole as
+the user message, as before.
+"""
+
 from __future__ import annotations
 
 from dataclasses import dataclass, field
@@ -7,6 +26,8 @@ import frontmatter
 from jinja2 import BaseLoader, Environment
 
 DEFAULT_PROMPT_PATH = Path(__file__).parent / "prompt.md"
+# Separates the system and user sections of a rendered prompt.
+SPLIT_MARKER = "<!-- good-start:user -->"
 
 _jinja_env = Environment(loader=BaseLoader(), keep_trailing_newline=True)
 
@@ -17,9 +38,31 @@ class Prompt:
     metadata: dict[str, object] = field(default_factory=dict)
 
     def render(self, **kwargs: object) -> str:
-        template = _jinja_env.from_string(self.text)
+        template = _jinja_env.from_string(self._marked_text())
         return template.render(**kwargs)
 
+    def _marked_text(self) -> str:
+        """Return the template with ``SPLIT_MARKER`` before the user section."""
+        heading = self.metadata.get("user_section")
+        if not heading:
+            return self.text
+        lines = self.text.splitlines(keepends=True)
+        for i, line in enumerate(lines):
+            if line.strip() == str(heading).strip():
+                return "".join([*lines[:i], SPLIT_MARKER + "\n", *lines[i:]])
+        raise ValueError(f"Prompt has no line {heading!r} to start its user section.")
+
+
+def split_prompt(rendered: str) -> tuple[str | None, str]:
+    """Split a rendered prompt into its system section and user section.
+
+    The system section is None for prompts that don't declare a split.
+    """
+    system, marker, user = rendered.partition(SPLIT_MARKER)
+    if not marker:
+        return None, rendered
+    return system.strip(), user.strip()
+
 
 def load_prompt(path: str | Path = DEFAULT_PROMPT_PATH) -> Prompt:
     post = frontmatter.load(str(path))
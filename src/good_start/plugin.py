@@ -3,14 +3,101 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import re
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
 
 import pytest
 
+from good_start import tracing
+from good_start.discovery import prompt_context
+from good_start.history import record_run
 from good_start.loader import load_prompt
+from good_start.profiling import profiling
+from good_start.report import EXTENSIONS, FORMATS, ReportWriter, open_report
 from good_start.result import Result
 from good_start.runtime import resolve_runtime
+from good_start.tiers import Tier, run_tiered, tier_policy
 
-_result_key = pytest.StashKey[Result]()
+# (target, Result) of each good_start() call in a test, for the report hook.
+_result_key = pytest.StashKey[list[tuple[str, Result]]]()
+_report_key = pytest.StashKey[ReportWriter]()
+_trace_key = pytest.StashKey[AbstractContextManager]()
+
+SHARE_SCOPES = ("session", "module", "function")
+
+
+class _SingleFlight:
+    """Runs each key once per scope, sharing the Result with every caller.
+
+    A caller that finds its key in flight waits for that run instead of
+    starting another. A run that raises isn't kept, so the next caller
+    retries it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._runs: dict[tuple[str, str], Future[Result]] = {}
+
+    def run(
+        self, scope: str, key: str, fn: Callable[[], Result]
+    ) -> tuple[Result, bool]:
+        """Return the Result for ``key`` in ``scope``, and whether it was shared."""
+        future, shared = self._claim(scope, key)
+        if shared:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._fail(scope, key, future, exc)
+            raise
+        future.set_result(result)
+        return result, False
+
+    async def run_async(
+        self, scope: str, key: str, fn: Callable[[], Awaitable[Result]]
+    ) -> tuple[Result, bool]:
+        """Like ``run``, awaiting ``fn()`` and any run already in flight."""
+        future, shared = self._claim(scope, key)
+        if shared:
+            return await asyncio.wrap_future(future), True
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._fail(scope, key, future, exc)
+            raise
+        future.set_result(result)
+        return result, False
+
+    def _claim(self, scope: str, key: str) -> tuple[Future[Result], bool]:
+        with self._lock:
+            future = self._runs.get((scope, key))
+            if future is not None:
+                return future, True
+            future = self._runs[(scope, key)] = Future()
+            return future, False
+
+    def _fail(
+        self, scope: str, key: str, future: Future[Result], exc: BaseException
+    ) -> None:
+        with self._lock:
+            del self._runs[(scope, key)]
+        future.set_exception(exc)
+
+    def discard(self, scope: str) -> None:
+        """Forget the runs of a scope that has ended."""
+        with self._lock:
+            for run in [run for run in self._runs if run[0] == scope]:
+                del self._runs[run]
+
+
+_flights_key = pytest.StashKey[_SingleFlight]()
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -33,6 +120,67 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=False,
         help="Run the good-start agent locally instead of in a container.",
     )
+    group.addoption(
+        "--good-start-tiered",
+        action="store_true",
+        default=False,
+        help="Run a quick smoke pass first and the full agent only if it fails.",
+    )
+    group.addoption(
+        "--good-start-indexed-search",
+        action="store_true",
+        default=False,
+        help="Give the agent indexed file and content search tools instead of "
+        "Glob and Grep.",
+    )
+    group.addoption(
+        "--good-start-smoke-model",
+        action="store",
+        default=None,
+        help="Model for the smoke pass (default: haiku).",
+    )
+    group.addoption(
+        "--good-start-smoke-max-turns",
+        action="store",
+        type=int,
+        default=None,
+        help="Turn budget for the smoke pass (default: 15).",
+    )
+    group.addoption(
+        "--good-start-share",
+        action="store",
+        default=None,
+        choices=SHARE_SCOPES,
+        help="Share identical good-start runs across this scope (default: function).",
+    )
+    group.addoption(
+        "--good-start-profile",
+        action="store",
+        default=None,
+        metavar="DIR",
+        help="Write cProfile stats for each good-start run to DIR/<test id>/.",
+    )
+    group.addoption(
+        "--good-start-format",
+        action="store",
+        default=None,
+        choices=FORMATS,
+        help="Stream a machine-readable report of every good-start run.",
+    )
+    group.addoption(
+        "--good-start-output",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="File for --good-start-format (default: good-start-report.<ext>).",
+    )
+    group.addoption(
+        "--good-start-trace",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Append a trace of each good-start run to PATH as OTLP JSON.",
+    )
     parser.addini(
         "good_start_target",
         help="Default target path for good-start tests.",
@@ -49,22 +197,269 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         type="bool",
         default=False,
     )
+    parser.addini(
+        "good_start_tiered",
+        help="Run a quick smoke pass first and the full agent only if it fails.",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        "good_start_indexed_search",
+        help="Give the agent indexed file and content search tools instead of "
+        "Glob and Grep.",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        "good_start_smoke_model",
+        help="Model for the smoke pass.",
+        default=None,
+    )
+    parser.addini(
+        "good_start_smoke_max_turns",
+        help="Turn budget for the smoke pass.",
+        default=None,
+    )
+    parser.addini(
+        "good_start_share",
+        help="Share identical good-start runs across this scope: "
+        "session, module or function.",
+        default="function",
+    )
 
 
 def pytest_configure(config: pytest.Config) -> None:
     config.addinivalue_line(
         "markers",
-        "good_start(target, prompt): configure good-start agent for this test. "
-        "'target' sets the documentation path; 'prompt' sets a custom prompt file.",
+        "good_start(target, prompt, tiered, indexed_search, share): configure "
+        "good-start agent for this test. 'target' sets the documentation path; "
+        "'prompt' sets a custom prompt file; 'tiered' runs a smoke pass before "
+        "the full agent; 'indexed_search' serves the agent's file and content "
+        "searches from an index; 'share' reuses identical runs across the "
+        "'session', 'module' or 'function'.",
     )
+    config.stash[_flights_key] = _SingleFlight()
+    report_format = config.getoption("good_start_format", None)
+    if report_format:
+        output = config.getoption("good_start_output") or (
+            f"good-start-report.{EXTENSIONS[report_format]}"
+        )
+        config.stash[_report_key] = open_report(report_format, output)
+    trace_path = config.getoption("good_start_trace", None)
+    if trace_path:
+        exporter = tracing.tracing(trace_path)
+        exporter.__enter__()
+        config.stash[_trace_key] = exporter
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    report = config.stash.get(_report_key, None)
+    if report is not None:
+        report.close()
+        del config.stash[_report_key]
+    exporter = config.stash.get(_trace_key, None)
+    if exporter is not None:
+        exporter.__exit__(None, None, None)
+        del config.stash[_trace_key]
+
+
+def pytest_runtest_teardown(item: pytest.Item, nextitem: pytest.Item | None) -> None:
+    flights = item.config.stash.get(_flights_key, None)
+    if flights is None:
+        return
+    flights.discard(item.nodeid)
+    module = _module_id(item)
+    if nextitem is None or _module_id(nextitem) != module:
+        flights.discard(module)
+
+
+def _module_id(item: pytest.Item) -> str:
+    return item.nodeid.split("::")[0]
+
+
+def _run_key(
+    rendered: str, target: str, no_container: bool, tiers: list[Tier] | None
+) -> str:
+    """Return the identity of a run: prompt, target and runtime mode."""
+    data = [rendered, str(Path(target).resolve()), bool(no_container), repr(tiers)]
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
 
 
 def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
     for item in items:
-        if "good_start" in getattr(item, "fixturenames", ()):
+        # A bare marker on the item would hide a configured one on its
+        # module or class from get_closest_marker().
+        if "good_start" in getattr(
+            item, "fixturenames", ()
+        ) and not item.get_closest_marker("good_start"):
             item.add_marker(pytest.mark.good_start)
 
 
+@dataclass
+class _Check:
+    """One resolved good_start() call, ready to run."""
+
+    target: str
+    rendered: str
+    no_container: bool
+    tiers: list[Tier] | None
+    # Single-flight scope and key.
+    scope: str
+    key: str
+    on_tool_use: Callable[[str, dict], None] | None
+
+
+def _resolve_check(
+    request: pytest.FixtureRequest, target: str | None, prompt_path: str | None
+) -> _Check:
+    """Apply the call, marker, CLI and ini settings for one good_start() call."""
+    config = request.config
+    marker = request.node.get_closest_marker("good_start")
+
+    # -- resolve target via precedence chain
+    if target is None:
+        if marker and marker.kwargs.get("target"):
+            target = marker.kwargs["target"]
+        elif config.getoption("good_start_target"):
+            target = config.getoption("good_start_target")
+        else:
+            target = config.getini("good_start_target") or "."
+
+    # -- resolve prompt path via precedence chain
+    if prompt_path is None:
+        if marker and marker.kwargs.get("prompt"):
+            prompt_path = marker.kwargs["prompt"]
+        elif config.getoption("good_start_prompt"):
+            prompt_path = config.getoption("good_start_prompt")
+        else:
+            ini_val = config.getini("good_start_prompt")
+            if ini_val:
+                prompt_path = ini_val
+
+    # -- load and render prompt
+    if prompt_path:
+        prompt = load_prompt(prompt_path)
+    else:
+        prompt = load_prompt()
+
+    rendered = prompt.render(**prompt_context(target))
+
+    # -- resolve runtime mode
+    no_container = config.getoption("good_start_no_container") or config.getini(
+        "good_start_no_container"
+    )
+
+    # -- resolve tiered policy: marker, then CLI flag, then ini
+    if marker and "tiered" in marker.kwargs:
+        tiered = bool(marker.kwargs["tiered"])
+    else:
+        tiered = config.getoption("good_start_tiered") or config.getini(
+            "good_start_tiered"
+        )
+    smoke_max_turns = config.getoption("good_start_smoke_max_turns") or config.getini(
+        "good_start_smoke_max_turns"
+    )
+    # -- resolve indexed search: marker, then CLI flag, then ini
+    if marker and "indexed_search" in marker.kwargs:
+        indexed_search = bool(marker.kwargs["indexed_search"])
+    else:
+        indexed_search = config.getoption("good_start_indexed_search") or config.getini(
+            "good_start_indexed_search"
+        )
+    tiers = None
+    if tiered or indexed_search:
+        tiers = tier_policy(
+            bool(tiered),
+            config.getoption("good_start_smoke_model")
+            or config.getini("good_start_smoke_model"),
+            int(smoke_max_turns) if smoke_max_turns else None,
+            bool(indexed_search),
+        )
+
+    # -- resolve sharing scope: marker, then CLI flag, then ini
+    if marker and marker.kwargs.get("share"):
+        share = marker.kwargs["share"]
+    else:
+        share = config.getoption("good_start_share") or config.getini(
+            "good_start_share"
+        )
+    if share not in SHARE_SCOPES:
+        raise pytest.UsageError(
+            f"good_start share must be one of: {', '.join(SHARE_SCOPES)}; "
+            f"got {share!r}."
+        )
+    scope = {
+        "session": "session",
+        "module": _module_id(request.node),
+        "function": request.node.nodeid,
+    }[share]
+
+    # -- stream tool events into the report if it records them
+    report = config.stash.get(_report_key, None)
+    on_tool_use = None
+    if report is not None and report.records_events:
+        on_tool_use = report.sink(request.node.nodeid)
+
+    return _Check(
+        target=target,
+        rendered=rendered,
+        no_container=bool(no_container),
+        tiers=tiers,
+        scope=scope,
+        key=_run_key(rendered, target, no_container, tiers),
+        on_tool_use=on_tool_use,
+    )
+
+
+async def _execute(request: pytest.FixtureRequest, check: _Check) -> Result:
+    """Run the agent for ``check`` on the current event loop."""
+    config = request.config
+    runtime = resolve_runtime(no_container=check.no_container)
+
+    # -- profile this run if requested
+    profile_root = config.getoption("good_start_profile")
+    if profile_root:
+        test_id = re.sub(r"[^\w.-]+", "_", request.node.nodeid).strip("_")
+        profiler = profiling(Path(profile_root) / test_id)
+    else:
+        profiler = nullcontext()
+
+    # -- run agent, in a trace of its own per test
+    with (
+        profiler,
+        tracing.span("check", test=request.node.nodeid, target=check.target),
+    ):
+        if check.tiers:
+            result = await run_tiered(
+                runtime, check.rendered, check.target, check.tiers, check.on_tool_use
+            )
+        else:
+            result = await runtime.run(
+                check.rendered, check.target, on_tool_use=check.on_tool_use
+            )
+
+    # -- move bulky outputs to disk; sessions keep many results alive
+    try:
+        result.offload()
+    except (OSError, TypeError, ValueError):
+        pass
+    record_run(result, check.target, check.rendered, source="pytest")
+    return result
+
+
+def _finish(request: pytest.FixtureRequest, check: _Check, result: Result) -> Result:
+    """Report ``result`` and stash it for the report hook."""
+    report = request.config.stash.get(_report_key, None)
+    if report is not None:
+        report.result(request.node.nodeid, result)
+    request.node.stash.setdefault(_result_key, []).append((check.target, result))
+    return result
+
+
+def _flights(request: pytest.FixtureRequest) -> _SingleFlight:
+    return request.config.stash.get(_flights_key, None) or _SingleFlight()
+
+
 @pytest.fixture()
 def good_start(request: pytest.FixtureRequest):
     """Factory fixture that runs the good-start agent and returns a Result.
@@ -74,52 +469,43 @@ def good_start(request: pytest.FixtureRequest):
             result = good_start()           # agent finds docs automatically
             result = good_start("README.md") # or check a specific file
             assert result.passed, result.details
+
+    Calls with the same rendered prompt, target and runtime mode share one
+    run, and its Result, within the scope set by the marker's ``share``
+    argument, ``--good-start-share`` or the ``good_start_share`` ini value.
     """
-    config = request.config
 
     def _run(target: str | None = None, prompt_path: str | None = None) -> Result:
-        # -- resolve target via precedence chain
-        if target is None:
-            marker = request.node.get_closest_marker("good_start")
-            if marker and marker.kwargs.get("target"):
-                target = marker.kwargs["target"]
-            elif config.getoption("good_start_target"):
-                target = config.getoption("good_start_target")
-            else:
-                target = config.getini("good_start_target") or "."
-
-        # -- resolve prompt path via precedence chain
-        if prompt_path is None:
-            marker = request.node.get_closest_marker("good_start")
-            if marker and marker.kwargs.get("prompt"):
-                prompt_path = marker.kwargs["prompt"]
-            elif config.getoption("good_start_prompt"):
-                prompt_path = config.getoption("good_start_prompt")
-            else:
-                ini_val = config.getini("good_start_prompt")
-                if ini_val:
-                    prompt_path = ini_val
-
-        # -- load and render prompt
-        if prompt_path:
-            prompt = load_prompt(prompt_path)
-        else:
-            prompt = load_prompt()
+        check = _resolve_check(request, target, prompt_path)
+        result, _ = _flights(request).run(
+            check.scope, check.key, lambda: asyncio.run(_execute(request, check))
+        )
+        return _finish(request, check, result)
 
-        rendered = prompt.render(target=target)
+    return _run
 
-        # -- resolve runtime mode
-        no_container = config.getoption("good_start_no_container") or config.getini(
-            "good_start_no_container"
-        )
-        runtime = resolve_runtime(no_container=no_container)
 
-        # -- run agent
-        result = asyncio.run(runtime.run(rendered, target))
+@pytest.fixture()
+def async_good_start(request: pytest.FixtureRequest):
+    """Like ``good_start``, but awaitable, for tests with a running event loop.
+
+    Runs are scheduled on the test's loop, so one test can check several
+    targets concurrently:
 
-        # -- stash result for report hook
-        request.node.stash[_result_key] = result
-        return result
+        @pytest.mark.anyio
+        async def test_docs(async_good_start):
+            readme, install = await asyncio.gather(
+                async_good_start("README.md"), async_good_start("INSTALL.md")
+            )
+            assert readme.passed and install.passed
+    """
+
+    async def _run(target: str | None = None, prompt_path: str | None = None) -> Result:
+        check = _resolve_check(request, target, prompt_path)
+        result, _ = await _flights(request).run_async(
+            check.scope, check.key, lambda: _execute(request, check)
+        )
+        return _finish(request, check, result)
 
     return _run
 
@@ -128,9 +514,36 @@ def good_start(request: pytest.FixtureRequest):
 def pytest_runtest_makereport(item: pytest.Item, call):
     outcome = yield
     report = outcome.get_result()
-    if report.when == "call" and report.failed:
-        result = item.stash.get(_result_key, None)
-        if result is not None:
-            extra = f"\n\n--- good-start agent details ---\n{result.details}\n"
-            if report.longrepr:
-                report.longrepr = str(report.longrepr) + extra
+    results = item.stash.get(_result_key, [])
+    if report.when != "call" or not results:
+        return
+    # Label each run by its target when a test made several.
+    labelled = [
+        (f" ({target})" if len(results) > 1 else "", result)
+        for target, result in results
+    ]
+    for label, result in labelled:
+        if result.resources:
+            # Shown with -rA / on failure, and recorded as JUnit XML properties.
+            report.sections.append(
+                (f"good-start resources{label}", result.resources.summary())
+            )
+            item.user_properties.append(
+                ("good_start_peak_memory_bytes", result.resources.peak_memory)
+            )
+            if result.resources.cpu_seconds is not None:
+                item.user_properties.append(
+                    ("good_start_cpu_seconds", round(result.resources.cpu_seconds, 2))
+                )
+            item.user_properties += [
+                ("good_start_net_rx_bytes", result.resources.net_rx),
+                ("good_start_net_tx_bytes", result.resources.net_tx),
+                ("good_start_block_read_bytes", result.resources.block_read),
+                ("good_start_block_write_bytes", result.resources.block_write),
+            ]
+    if report.failed and report.longrepr:
+        extra = "".join(
+            f"\n\n--- good-start agent details{label} ---\n{result.details}\n"
+            for label, result in labelled
+        )
+        report.longrepr = str(report.longrepr) + extra
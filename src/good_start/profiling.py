@@ -0,0 +1,96 @@
+"""Opt-in profiling of the host process and the container entrypoint.
+
+``profiling(directory)`` runs cProfile for the duration of the block and
+writes ``host.pstats`` into ``directory``. Since Python 3.12 cProfile sees
+every thread, so container I/O running in worker threads is included.
+While a profile is active, ContainerRuntime also runs the entrypoint under
+cProfile, writing ``<name>.pstats`` into a ``container-*`` subdirectory of
+``directory`` that it mounts into the container. The container runs as an
+unprivileged user, so only that subdirectory is made writable for everyone;
+``directory`` itself keeps its permissions.
+
+Only one cProfile can be active at a time, so blocks that overlap, such as
+concurrent checks in one event loop, share the first block's profiler. It
+is written when the last of them exits, to the first block's directory.
+
+Inspect the files with ``python -m pstats``, or convert them for tools such
+as snakeviz or speedscope.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# Context variables follow asyncio tasks and asyncio.to_thread() workers,
+# so code anywhere under the profiled call can find the output directory.
+_profile_dir: ContextVar[Path | None] = ContextVar(
+    "good_start_profile_dir", default=None
+)
+
+
+# The profiler shared by overlapping profiling() blocks, its output
+# directory, and how many blocks are using it.
+_lock = threading.Lock()
+_shared: tuple[cProfile.Profile, Path] | None = None
+_users = 0
+# Container output subdirectory created for each profile directory.
+_container_dirs: dict[Path, Path] = {}
+
+
+def profile_dir() -> Path | None:
+    """Return the output directory of the active profile, if any."""
+    return _profile_dir.get()
+
+
+def container_profile_dir() -> Path | None:
+    """Return the directory containers write their profiles to, if profiling.
+
+    It is created on first use as a fresh subdirectory of the active
+    profile directory and opened up to every user.
+    """
+    directory = _profile_dir.get()
+    if directory is None:
+        return None
+    with _lock:
+        path = _container_dirs.get(directory)
+        if path is None or not path.is_dir():
+            path = Path(tempfile.mkdtemp(prefix="container-", dir=directory))
+            # The container runs as an unprivileged user that must write here.
+            os.chmod(path, 0o777)
+            _container_dirs[directory] = path
+    return path
+
+
+@contextmanager
+def profiling(directory: str | Path) -> Iterator[Path]:
+    """Profile the enclosed block and write ``host.pstats`` into ``directory``."""
+    directory = Path(directory).resolve()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    global _shared, _users
+    token = _profile_dir.set(directory)
+    with _lock:
+        if _shared is None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            _shared = (profiler, directory)
+        _users += 1
+    try:
+        yield directory
+    finally:
+        _profile_dir.reset(token)
+        with _lock:
+            _users -= 1
+            if _users == 0:
+                assert _shared is not None
+                profiler, out = _shared
+                _shared = None
+                profiler.disable()
+                profiler.dump_stats(out / "host.pstats")
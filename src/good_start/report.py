@@ -0,0 +1,244 @@
+"""Machine-readable check reports: NDJSON, JSON and JUnit XML.
+
+Writers stream each record to their file as it happens instead of building
+one document in memory, so a session with hundreds of checks costs no more
+than one. ``ndjson`` writes one JSON object per line: an ``event`` record
+per tool use and a ``result`` record per check. ``json`` writes a single
+``{"results": [...], "summary": {...}}`` document whose results are
+appended as checks finish. ``junit`` writes a ``<testsuite>`` with one
+``<testcase>`` per check.
+
+Result records carry the AgentFindings fields plus timing, cost, token
+usage and, for container runs, the resource summary.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Self, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from good_start.result import Result
+
+FORMATS = ("ndjson", "json", "junit")
+EXTENSIONS = {"ndjson": "ndjson", "json": "json", "junit": "xml"}
+
+
+def result_record(name: str, result: Result) -> dict:
+    """Return ``result`` as plain JSON data, labelled ``name``."""
+    return {
+        "name": name,
+        **result.to_findings().model_dump(),
+        "timestamp": result.timestamp.isoformat(),
+        "duration": result.duration,
+        "cost_usd": result.cost_usd,
+        "usage": result.usage,
+        "tier": result.tier,
+        "run_id": result.run_id,
+        "resources": (
+            result.resources.to_dict(samples=False) if result.resources else None
+        ),
+    }
+
+
+class ReportWriter(abc.ABC):
+    """Streams check records to ``file``; safe to use from several threads."""
+
+    # Whether tool events are part of the format.
+    records_events = False
+    # Written between consecutive results, under the lock that counts them.
+    result_separator = ""
+
+    def __init__(self, file: TextIO, close_file: bool = False) -> None:
+        self.file = file
+        self._close_file = close_file
+        self._lock = threading.Lock()
+        self.total = 0
+        self.failed = 0
+        self._write(self.header())
+
+    def header(self) -> str:
+        return ""
+
+    def footer(self) -> str:
+        return ""
+
+    def format_event(self, run: str, tool_name: str, tool_input: dict) -> str:
+        return ""
+
+    @abc.abstractmethod
+    def format_result(self, name: str, result: Result) -> str:
+        """Return the text recording one finished check."""
+
+    def sink(self, run: str = "") -> Callable[[str, dict], None]:
+        """Return an ``on_tool_use`` callback that records events under ``run``."""
+
+        def _on_tool_use(tool_name: str, tool_input: dict) -> None:
+            self.event(run, tool_name, tool_input)
+
+        return _on_tool_use
+
+    def event(self, run: str, tool_name: str, tool_input: dict) -> None:
+        if self.records_events:
+            self._write(self.format_event(run, tool_name, tool_input))
+
+    def result(self, name: str, result: Result) -> None:
+        """Write one finished check."""
+        text = self.format_result(name, result)
+        with self._lock:
+            if self.total:
+                text = self.result_separator + text
+            self.total += 1
+            self.failed += not result.passed
+            self._write_locked(text)
+
+    def close(self) -> None:
+        self._write(self.footer())
+        if self._close_file:
+            self.file.close()
+
+    def _write(self, text: str) -> None:
+        with self._lock:
+            self._write_locked(text)
+
+    def _write_locked(self, text: str) -> None:
+        if text:
+            self.file.write(text)
+            self.file.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class NDJSONWriter(ReportWriter):
+    records_events = True
+
+    def format_event(self, run: str, tool_name: str, tool_input: dict) -> str:
+        record = {
+            "type": "event",
+            "run": run,
+            "time": time.time(),
+            "tool": tool_name,
+            "input": tool_input,
+        }
+        return json.dumps(record, default=str) + "\n"
+
+    def format_result(self, name: str, result: Result) -> str:
+        return json.dumps({"type": "result", **result_record(name, result)}) + "\n"
+
+
+class JSONWriter(ReportWriter):
+    result_separator = ",\n"
+
+    def header(self) -> str:
+        return '{"results": [\n'
+
+    def format_result(self, name: str, result: Result) -> str:
+        return json.dumps(result_record(name, result))
+
+    def footer(self) -> str:
+        summary = {
+            "total": self.total,
+            "passed": self.total - self.failed,
+            "failed": self.failed,
+        }
+        return f'\n], "summary": {json.dumps(summary)}}}\n'
+
+
+# ANSI escape sequences, then the characters XML 1.0 does not allow at all.
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b[@-_]")
+_XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _xml_text(text: str) -> str:
+    """Return ``text`` without the characters that would make the XML invalid."""
+    return _XML_INVALID.sub("", _ANSI_ESCAPE.sub("", text))
+
+
+def _escape(text: str) -> str:
+    return escape(_xml_text(text))
+
+
+def _quoteattr(text: str) -> str:
+    return quoteattr(_xml_text(text))
+
+
+class JUnitWriter(ReportWriter):
+    # Suite totals aren't known until the end, and CI tools derive them
+    # from the test cases, so the <testsuite> element carries none.
+    def header(self) -> str:
+        return '<?xml version="1.0" encoding="utf-8"?>\n<testsuite name="good-start">\n'
+
+    def format_result(self, name: str, result: Result) -> str:
+        time_attr = (
+            f" time={_quoteattr(f'{result.duration:.3f}')}" if result.duration else ""
+        )
+        lines = [
+            f'  <testcase classname="good-start" name={_quoteattr(name)}{time_attr}>'
+        ]
+        properties = {
+            "cost_usd": result.cost_usd,
+            "tier": result.tier,
+            "run_id": result.run_id,
+            "verification_command": result.verification_command,
+            **{f"usage.{key}": value for key, value in result.usage.items()},
+        }
+        properties = {k: v for k, v in properties.items() if v is not None}
+        if properties:
+            lines.append("    <properties>")
+            lines += [
+                f"      <property name={_quoteattr(k)} value={_quoteattr(str(v))}/>"
+                for k, v in properties.items()
+            ]
+            lines.append("    </properties>")
+        if not result.passed:
+            message = (
+                result.details.strip().splitlines()[0] if result.details.strip() else ""
+            )
+            lines.append(
+                f"    <failure message={_quoteattr(message)}>"
+                f"{_escape(result.details)}</failure>"
+            )
+        steps = "\n".join(
+            f"{step.tool}{' (error)' if step.is_error else ''}: {step.input}"
+            for step in result.steps
+        )
+        if steps:
+            lines.append(f"    <system-out>{_escape(steps)}</system-out>")
+        lines.append("  </testcase>\n")
+        return "\n".join(lines)
+
+    def footer(self) -> str:
+        return "</testsuite>\n"
+
+
+_WRITERS: dict[str, type[ReportWriter]] = {
+    "ndjson": NDJSONWriter,
+    "json": JSONWriter,
+    "junit": JUnitWriter,
+}
+
+
+def open_report(report_format: str, path: str | Path | None = None) -> ReportWriter:
+    """Return a writer for ``report_format`` on ``path``, or on stdout if None."""
+    if report_format not in _WRITERS:
+        raise ValueError(
+            f"Unknown report format {report_format!r}. "
+            f"Choose from: {', '.join(FORMATS)}."
+        )
+    writer = _WRITERS[report_format]
+    if path is None:
+        return writer(sys.stdout)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return writer(path.open("w", encoding="utf-8"), close_file=True)
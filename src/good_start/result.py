@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from claude_agent_sdk import Message
 from pydantic import BaseModel, Field
 
+from good_start.artifacts import (
+    INLINE_LIMIT,
+    ArtifactRef,
+    ArtifactStore,
+    load_transcript,
+    transcript_jsonl,
+)
+
+if TYPE_CHECKING:
+    from good_start.runtime import ResourceUsage
+
 
 class AgentStep(BaseModel):
     tool: str = Field(description="The tool used (e.g., Bash, Read, Grep, Glob).")
@@ -77,10 +90,115 @@ class Result:
     def __init__(self, agent_messages: list[Message], agent_result: AgentFindings):
         self.passed = agent_result.passed
         self.details = agent_result.details
-        self.steps = agent_result.steps
+        self._steps = list(agent_result.steps)
         self.verification_command = agent_result.verification_command
-        self.messages = agent_messages
+        self._messages = agent_messages
         self.timestamp = datetime.now()
+        # Wall-clock seconds, API cost and token usage, when known.
+        self.duration: float | None = None
+        self.cost_usd: float | None = None
+        self.usage: dict[str, int] = {}
+        # Sampled container resource usage (container runs only).
+        self.resources: ResourceUsage | None = None
+        # Name of the tier whose run decided the verdict, for tiered checks.
+        self.tier: str | None = None
+        # On-disk container logs ("stdout", "stderr"), when the run had any.
+        self.log_paths: dict[str, Path] = {}
+        # Set by offload(): the run's id in the artifact store, and lazy
+        # references to the payloads that were moved there.
+        self.run_id: str | None = None
+        self._step_refs: dict[int, ArtifactRef] = {}
+        self._transcript_ref: ArtifactRef | None = None
+
+    @property
+    def cache_read_tokens(self) -> int | None:
+        """Input tokens read from the API's prompt cache, when known."""
+        return self.usage.get("cache_read_input_tokens")
+
+    @property
+    def cache_write_tokens(self) -> int | None:
+        """Input tokens written to the API's prompt cache, when known."""
+        return self.usage.get("cache_creation_input_tokens")
+
+    @property
+    def steps(self) -> list[AgentStep]:
+        if not self._step_refs:
+            return self._steps
+        return [
+            step.model_copy(update={"output": self._step_refs[i].load()})
+            if i in self._step_refs
+            else step
+            for i, step in enumerate(self._steps)
+        ]
+
+    @property
+    def messages(self) -> list[Message]:
+        if self._transcript_ref is not None:
+            return load_transcript(self._transcript_ref.load())
+        return self._messages
+
+    def offload(
+        self, store: ArtifactStore | None = None, inline_limit: int | None = None
+    ) -> str:
+        """Move large step outputs and the transcript into an artifact store.
+
+        Outputs longer than ``inline_limit`` bytes and the full message
+        transcript are replaced by references that load on access, so
+        ``steps`` and ``messages`` read the same as before. Also writes the
+        run's manifest for ``good-start export``. Returns the run id.
+
+        Raises ``OSError`` if the store can't be written, and ``TypeError``
+        or ``ValueError`` if the transcript can't be encoded; the Result is
+        left unchanged in the latter case.
+        """
+        if self.run_id is not None:
+            return self.run_id
+        store = store or ArtifactStore()
+        limit = INLINE_LIMIT if inline_limit is None else inline_limit
+        transcript = transcript_jsonl(self._messages) if self._messages else None
+
+        manifest_steps = []
+        for i, step in enumerate(self._steps):
+            entry = step.model_dump(exclude={"output"})
+            if len(step.output.encode()) > limit:
+                ref = store.put(step.output)
+                self._step_refs[i] = ref
+                self._steps[i] = step.model_copy(update={"output": ""})
+                entry["artifact"] = ref.digest
+            else:
+                entry["output"] = step.output
+            manifest_steps.append(entry)
+
+        if transcript is not None:
+            self._transcript_ref = store.put(transcript)
+            self._messages = []
+
+        self.run_id = f"{self.timestamp:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        store.save_manifest(
+            self.run_id,
+            {
+                "run_id": self.run_id,
+                "timestamp": self.timestamp.timestamp(),
+                "passed": self.passed,
+                "details": self.details,
+                "verification_command": self.verification_command,
+                "steps": manifest_steps,
+                "transcript": self._transcript_ref.digest
+                if self._transcript_ref
+                else None,
+                "logs": {name: str(path) for name, path in self.log_paths.items()},
+            },
+        )
+        return self.run_id
+
+    def to_findings(self) -> AgentFindings:
+        """Return the serializable AgentFindings this result was built from."""
+        return AgentFindings(
+            passed=self.passed,
+            details=self.details,
+            steps=self.steps,
+            verification_command=self.verification_command,
+        )
 
     def __repr__(self):
         return f"{self.__class__.__name__}(passed={self.passed}, details='{self.details}', timestamp={self.timestamp})"
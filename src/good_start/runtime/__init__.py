@@ -1,18 +1,61 @@
 from good_start.runtime._base import Runtime
+from good_start.runtime._capacity import parse_memory
 from good_start.runtime._local import LocalRuntime
+from good_start.runtime._resources import ResourceUsage, format_size
+from good_start.runtime._staging import STAGE_MODES
 
-__all__ = ["Runtime", "LocalRuntime", "resolve_runtime"]
+__all__ = [
+    "STAGE_MODES",
+    "LocalRuntime",
+    "ResourceUsage",
+    "Runtime",
+    "format_size",
+    "parse_memory",
+    "resolve_runtime",
+]
 
 
-def resolve_runtime(*, no_container: bool = False, verbose: bool = False) -> Runtime:
+def resolve_runtime(
+    *,
+    no_container: bool = False,
+    verbose: bool = False,
+    stage: str | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    default_excludes: bool = True,
+    cpus: float | None = None,
+    memory: str | None = None,
+    endpoints: list[str] | None = None,
+    reuse_sessions: bool = False,
+    cwd: str | None = None,
+) -> Runtime:
     """Return the appropriate runtime based on user preference.
 
     Default is container-based. Pass no_container=True for direct host execution.
+    ``stage``/``include``/``exclude``/``default_excludes`` control which
+    project files are staged into the container, ``cpus``/``memory`` cap each container's
+    resources, and ``endpoints`` lists the container engines to spread
+    runs across. None of these have an effect on the local runtime.
+    ``reuse_sessions`` makes the local runtime share the process-wide pool
+    of persistent SDK clients, and ``cwd`` sets the directory it runs in.
     """
     if no_container:
-        return LocalRuntime()
+        if reuse_sessions:
+            from good_start.session import get_session_pool
+
+            return LocalRuntime(pool=get_session_pool(), cwd=cwd)
+        return LocalRuntime(cwd=cwd)
 
     # Container runtime — import here to defer engine detection
     from good_start.runtime._container import ContainerRuntime
 
-    return ContainerRuntime(verbose=verbose)
+    return ContainerRuntime(
+        verbose=verbose,
+        stage=stage,
+        include=include,
+        exclude=exclude,
+        default_excludes=default_excludes,
+        cpus=cpus,
+        memory=memory,
+        endpoints=endpoints,
+    )
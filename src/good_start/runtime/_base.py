@@ -1,11 +1,28 @@
 from __future__ import annotations
 
-from typing import Protocol
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Protocol
 
 from good_start.result import Result
 
+if TYPE_CHECKING:
+    from good_start.tiers import Tier
+
 
 class Runtime(Protocol):
     """Contract for executing the good-start agent."""
 
-    async def run(self, prompt: str, target: str) -> Result: ...
+    async def run(
+        self,
+        prompt: str,
+        target: str,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+        tier: Tier | None = None,
+    ) -> Result:
+        """Run the agent and return its Result.
+
+        ``on_tool_use`` receives each tool event; when omitted the runtime
+        prints events to stderr. ``tier`` sets the model, turn budget and
+        tools; when omitted the agent runs with the full tier.
+        """
+        ...
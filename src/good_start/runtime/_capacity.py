@@ -0,0 +1,117 @@
+"""Host capacity accounting for concurrent container runs.
+
+Each container run reserves CPU and memory from a process-wide pool sized
+to the host. Runs that don't fit wait until earlier runs release their
+reservation, so one heavy check can't starve the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+_MEMORY_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+_MEMORY_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+
+
+def parse_memory(value: str | int) -> int:
+    """Parse a container memory size (``512m``, ``2g``, ``1.5GiB``) into bytes."""
+    if isinstance(value, int):
+        return value
+    match = _MEMORY_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid memory size {value!r}. Use e.g. '512m' or '2g'.")
+    number, unit = match.groups()
+    return int(float(number) * _MEMORY_UNITS[unit.lower()])
+
+
+def format_memory(num_bytes: int) -> str:
+    """Format bytes as the largest whole unit the container engines accept."""
+    for unit in ("g", "m", "k"):
+        size = _MEMORY_UNITS[unit]
+        if num_bytes >= size and num_bytes % size == 0:
+            return f"{num_bytes // size}{unit}"
+    return f"{num_bytes}b"
+
+
+def _host_memory() -> int:
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def _host_cpus() -> float:
+    if hasattr(os, "sched_getaffinity"):
+        return float(len(os.sched_getaffinity(0)))
+    return float(os.cpu_count() or 1)
+
+
+class HostCapacity:
+    """Pool of host CPU and memory that container runs reserve from."""
+
+    def __init__(self, cpus: float | None = None, memory: int | None = None) -> None:
+        self.total_cpus = cpus if cpus is not None else _host_cpus()
+        # 0 means "unknown": memory is then not used for admission.
+        self.total_memory = memory if memory is not None else _host_memory()
+        self.used_cpus = 0.0
+        self.used_memory = 0
+        self.waiting = 0
+        self._cond: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self.used_cpus = 0.0
+            self.used_memory = 0
+            self.waiting = 0
+        return self._cond
+
+    def _fits(self, cpus: float, memory: int) -> bool:
+        if self.used_cpus + cpus > self.total_cpus:
+            return False
+        return not (self.total_memory and self.used_memory + memory > self.total_memory)
+
+    @asynccontextmanager
+    async def reserve(self, cpus: float, memory: int = 0) -> AsyncIterator[None]:
+        """Hold ``cpus`` and ``memory`` bytes for the duration of the block.
+
+        Requests larger than the host are clamped to the host size so they
+        still run (alone) rather than waiting forever.
+        """
+        cpus = min(cpus, self.total_cpus)
+        if self.total_memory:
+            memory = min(memory, self.total_memory)
+        cond = self._condition()
+        async with cond:
+            self.waiting += 1
+            try:
+                await cond.wait_for(lambda: self._fits(cpus, memory))
+            finally:
+                self.waiting -= 1
+            self.used_cpus += cpus
+            self.used_memory += memory
+        try:
+            yield
+        finally:
+            async with cond:
+                self.used_cpus -= cpus
+                self.used_memory -= memory
+                cond.notify_all()
+
+
+_shared: HostCapacity | None = None
+
+
+def get_capacity() -> HostCapacity:
+    """Return the process-wide host capacity pool."""
+    global _shared
+    if _shared is None:
+        _shared = HostCapacity()
+    return _shared
@@ -1,37 +1,104 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
 import shutil
 import subprocess
 import sys
 import threading
+import time
+import uuid
+from collections.abc import Callable
 from pathlib import Path
 
 from rich.console import Console
 
+from good_start import tracing
 from good_start.display import format_tool_event
+from good_start.profiling import container_profile_dir
 from good_start.result import AgentFindings, Result
+from good_start.runtime._capacity import format_memory, parse_memory
+from good_start.runtime._endpoints import Endpoint, EnginePool, configured_endpoints
+from good_start.runtime._engine_api import (
+    STDOUT,
+    ContainerSpec,
+    EngineAPIError,
+    EngineAPISampler,
+)
+from good_start.runtime._logs import LogCapture, finish_run_log_dir, run_log_dir
+from good_start.runtime._resources import ResourceSampler, format_size
+from good_start.runtime._staging import list_workspace_files, write_workspace_tar
+from good_start.tiers import Tier
 
 IMAGE_NAME = "good-start-agent"
 IMAGE_TAG = "latest"
 FULL_IMAGE = f"{IMAGE_NAME}:{IMAGE_TAG}"
+# good-start is installed in its own venv, off the agent's PATH.
+_IMAGE_PYTHON = "/opt/venv/bin/python"
 
 _CONTAINERFILE = Path(__file__).parent.parent.parent.parent / "Containerfile"
 
 console = Console(stderr=True)
 
+# Non-JSON stderr lines echoed in verbose mode before pointing at the log.
+_ECHO_LINES = 200
+# `<engine> run` exits with this when the engine itself failed.
+_ENGINE_ERROR = 125
 
-class ContainerRuntime:
-    """Runs the agent inside a container (Podman or Docker)."""
 
-    def __init__(self, verbose: bool = False) -> None:
-        self._engine = _detect_engine()
+class ContainerRuntime:
+    """Runs the agent inside a container (Podman or Docker).
+
+    Runs go to the local engine, or are spread across ``endpoints`` (see
+    ``_endpoints``).
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        stage: str | None = None,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        default_excludes: bool = True,
+        cpus: float | None = None,
+        memory: str | None = None,
+        endpoints: list[str] | None = None,
+    ) -> None:
+        self._pool = EnginePool(configured_endpoints(_detect_engine(), endpoints))
         self._verbose = verbose
-
-    async def run(self, prompt: str, target: str) -> Result:
-        self._ensure_image()
-
+        self._stage = stage
+        self._include = include
+        self._exclude = exclude
+        self._default_excludes = default_excludes
+        self._cpus = cpus
+        self._memory = parse_memory(memory) if memory else None
+
+    async def run(
+        self,
+        prompt: str,
+        target: str,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+        tier: Tier | None = None,
+    ) -> Result:
+        with tracing.span(
+            "container.run",
+            target=target,
+            tier=tier.name if tier else None,
+        ) as run_span:
+            result = await self._run(prompt, target, on_tool_use, tier)
+            run_span.set_attribute("passed", result.passed)
+            run_span.set_attribute("cost_usd", result.cost_usd)
+            return result
+
+    async def _run(
+        self,
+        prompt: str,
+        target: str,
+        on_tool_use: Callable[[str, dict], None] | None,
+        tier: Tier | None,
+    ) -> Result:
         api_key = _resolve_api_key()
         if not api_key:
             raise RuntimeError(
@@ -46,29 +113,214 @@ class ContainerRuntime:
         else:
             mount_dir = target_path
 
-        cmd = [
-            self._engine,
-            "run",
-            "--rm",
-            "-v",
-            f"{mount_dir}:/workspace:ro",
-            "-w",
-            "/workspace",
-            "-e",
-            f"ANTHROPIC_API_KEY={api_key}",
-            FULL_IMAGE,
-            "--prompt",
-            prompt,
-            "--target",
-            target,
-        ]
+        # Either bind-mount the project read-only, or stream a filtered
+        # copy into a writable tmpfs so huge trees never reach the agent.
+        staged_files: list[str] | None = None
+        if self._stage:
+            staged_files = list_workspace_files(
+                mount_dir,
+                self._stage,
+                self._include,
+                self._exclude,
+                self._default_excludes,
+            )
+        # Staged on demand for remote endpoints, which can't see host paths.
+        remote_files: list[str] | None = None
 
-        console.print(
-            f"  [dim]Container started ({self._engine}). Agent is working...[/dim]"
-        )
+        cpus = self._cpus
+        memory = self._memory
+
+        if staged_files is not None:
+            console.print(
+                f"  [dim]Staging {len(staged_files)} files ({self._stage}).[/dim]"
+            )
+
+        # Run the container, retrying once with double the memory limit if
+        # the engine OOM-kills it, and on another endpoint if the engine
+        # fails to run it.
+        oom_retried = False
+        failed: list[Endpoint] = []
+        started = time.monotonic()
+        while True:
+            # Named so a cancelled run (e.g. by `good-start watch`) can be
+            # removed from the engine rather than left running.
+            name = f"good-start-{uuid.uuid4().hex[:12]}"
+            log_dir = run_log_dir(name)
+
+            engine_error = None
+            # Unlimited runs still reserve one core so the host isn't
+            # oversubscribed by many concurrent checks.
+            async with self._pool.place(cpus or 1.0, memory or 0, failed) as endpoint:
+                files = staged_files
+                if files is None and endpoint.remote:
+                    if remote_files is None:
+                        remote_files = list_workspace_files(
+                            mount_dir,
+                            "filter",
+                            self._include,
+                            self._exclude,
+                            self._default_excludes,
+                        )
+                        console.print(
+                            f"  [dim]Staging {len(remote_files)} files (filter) "
+                            f"for remote endpoint {endpoint.label}.[/dim]"
+                        )
+                    files = remote_files
+                spec = _container_spec(
+                    name,
+                    prompt,
+                    target,
+                    tier,
+                    api_key,
+                    mount_dir,
+                    files,
+                    cpus,
+                    memory,
+                    # The profile directory only exists on this host.
+                    profile=not endpoint.remote,
+                )
+                with tracing.span("image.ensure", endpoint=endpoint.label):
+                    await asyncio.to_thread(self._ensure_image, endpoint)
+                with tracing.span(
+                    "container.attempt",
+                    container=name,
+                    memory=memory,
+                    endpoint=endpoint.label,
+                    backend="api" if endpoint.api is not None else "cli",
+                ) as attempt:
+                    console.print(
+                        f"  [dim]Container started ({endpoint.label}). "
+                        "Agent is working...[/dim]"
+                    )
+                    # The entrypoint continues this trace inside the container.
+                    if tracing.active():
+                        spec.env["TRACEPARENT"] = attempt.traceparent()
+                    # Ended by the entrypoint's ready event.
+                    startup = tracing.start_span("container.start")
+                    if endpoint.api is not None:
+                        sampler = EngineAPISampler(endpoint.api, name)
+                        run_container = functools.partial(
+                            self._run_container_api, endpoint, spec
+                        )
+                    else:
+                        sampler = ResourceSampler(endpoint.cli, name)
+                        run_container = functools.partial(
+                            self._run_container, _cli_args(endpoint.cli, spec)
+                        )
+                    sampler.start()
+                    try:
+                        returncode, tail, usage = await asyncio.to_thread(
+                            run_container,
+                            mount_dir,
+                            files,
+                            log_dir,
+                            on_tool_use,
+                            startup,
+                        )
+                    except asyncio.CancelledError:
+                        sampler.stop(wait=False)
+                        self._remove(endpoint, name)
+                        raise
+                    except (OSError, EngineAPIError) as exc:
+                        sampler.stop(wait=False)
+                        if not self._fail_over(endpoint, failed, str(exc)):
+                            raise
+                        engine_error = exc
+                    finally:
+                        startup.end()
+                        finish_run_log_dir(log_dir)
+                    if engine_error is not None:
+                        attempt.set_error(str(engine_error))
+                        continue
+                    resources = await asyncio.to_thread(sampler.stop)
+                    attempt.set_attribute("exit_code", returncode)
+                    if returncode == _ENGINE_ERROR and self._fail_over(
+                        endpoint, failed, f"exit code {returncode}"
+                    ):
+                        continue
+
+            if _is_oom(returncode) and memory is not None and not oom_retried:
+                memory *= 2
+                oom_retried = True
+                console.print(
+                    "  [yellow]Container was OOM-killed. Retrying with "
+                    f"--memory {format_memory(memory)}.[/yellow]"
+                )
+                continue
+            break
+
+        # The entrypoint prints AgentFindings JSON as the last line of stdout.
+        # Try to parse it regardless of exit code — the entrypoint catches
+        # SDK errors and still writes valid JSON before exiting.
+        def _result(findings: AgentFindings) -> Result:
+            result = Result(agent_messages=[], agent_result=findings)
+            result.duration = time.monotonic() - started
+            result.cost_usd = usage.get("cost_usd")
+            result.usage = usage.get("usage") or {}
+            result.resources = resources if resources.samples else None
+            result.log_paths = {
+                "stdout": log_dir / "stdout.log",
+                "stderr": log_dir / "stderr.log",
+            }
+            return result
+
+        findings = None
+        with tracing.span("result.parse"):
+            lines = [line for line in tail if line.strip()]
+            json_line = lines[-1].strip() if lines else ""
+            if json_line:
+                try:
+                    findings = AgentFindings.model_validate_json(json_line)
+                except ValueError:
+                    # Not AgentFindings JSON (pydantic's ValidationError is a
+                    # ValueError); handled by the fallback below.
+                    pass
+        if findings is not None:
+            return _result(findings)
 
+        # Fallback: no parseable JSON on stdout
+        if _is_oom(returncode):
+            detail = "Container was killed (OOM). Try increasing container memory."
+            if memory is not None:
+                detail += (
+                    f" The last attempt ran with --memory {format_memory(memory)}."
+                )
+            if resources.samples:
+                detail += (
+                    " Peak memory before the kill: "
+                    f"{format_size(resources.peak_memory)}."
+                )
+        elif returncode != 0:
+            detail = f"Container exited with code {returncode}."
+        else:
+            detail = "Agent did not produce output."
+
+        if self._verbose and lines:
+            console.print("\n".join(lines), style="dim", markup=False)
+        detail += f" Container logs: {log_dir}"
+
+        return _result(AgentFindings(passed=False, details=detail))
+
+    def _run_container(
+        self,
+        cmd: list[str],
+        mount_dir: Path,
+        staged_files: list[str] | None,
+        log_dir: Path,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+        startup: tracing.Span | None = None,
+    ) -> tuple[int, list[str], dict]:
+        """Run the container to completion, streaming tool events.
+
+        Blocking; called from a worker thread. Tool events go to
+        ``on_tool_use`` if given, otherwise to stderr. Both output streams
+        are written to rotating logs in ``log_dir``; only the last few
+        stdout lines are held in memory. Returns the exit code, that stdout
+        tail and the usage the entrypoint reported (empty if none).
+        """
         proc = subprocess.Popen(
             cmd,
+            stdin=subprocess.PIPE if staged_files is not None else None,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
@@ -78,76 +330,193 @@ class ContainerRuntime:
         # Drain stdout in a background thread to prevent pipe deadlock.
         # If the container fills the stdout pipe buffer while we're
         # blocking on stderr.readline(), both sides stall.
-        stdout_chunks: list[str] = []
+        stdout_log = LogCapture(log_dir / "stdout.log")
+        stderr_log = LogCapture(log_dir / "stderr.log")
 
         def _drain_stdout() -> None:
             assert proc.stdout is not None
-            stdout_chunks.append(proc.stdout.read())
+            for line in proc.stdout:
+                stdout_log.write(line)
 
         reader = threading.Thread(target=_drain_stdout, daemon=True)
         reader.start()
 
+        # Feed the staged workspace on stdin from its own thread, for the
+        # same reason: a large tar would otherwise stall stderr streaming.
+        writer = None
+        if staged_files is not None:
+
+            def _write_workspace() -> None:
+                assert proc.stdin is not None
+                try:
+                    write_workspace_tar(mount_dir, staged_files, proc.stdin.buffer)
+                except BrokenPipeError:
+                    pass
+                finally:
+                    try:
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        pass
+
+            writer = threading.Thread(target=_write_workspace, daemon=True)
+            writer.start()
+
         # Stream stderr lines in real-time for tool events.
         assert proc.stderr is not None
+        events = _EventHandler(stderr_log, self._verbose, on_tool_use, startup)
         while True:
             line = proc.stderr.readline()
             if not line and proc.poll() is not None:
                 break
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-                tool_name = event["tool"]
-                if tool_name == "StructuredOutput":
-                    continue
-                text = format_tool_event(tool_name, event["input"])
-                sys.stderr.write(f"  {text}\n")
-                sys.stderr.flush()
-            except (json.JSONDecodeError, KeyError):
-                if self._verbose:
-                    sys.stderr.write(f"  {line}\n")
-                    sys.stderr.flush()
+            events.feed(line)
 
         reader.join()
-        stdout = stdout_chunks[0] if stdout_chunks else ""
-
-        # The entrypoint prints AgentFindings JSON as the last line of stdout.
-        # Try to parse it regardless of exit code — the entrypoint catches
-        # SDK errors and still writes valid JSON before exiting.
-        stdout_lines = stdout.strip().splitlines()
-        json_line = stdout_lines[-1] if stdout_lines else ""
+        if writer is not None:
+            writer.join()
+        stdout_log.close()
+        stderr_log.close()
+        return proc.returncode, list(stdout_log.tail), events.usage
+
+    def _run_container_api(
+        self,
+        endpoint: Endpoint,
+        spec: ContainerSpec,
+        mount_dir: Path,
+        staged_files: list[str] | None,
+        log_dir: Path,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+        startup: tracing.Span | None = None,
+    ) -> tuple[int, list[str], dict]:
+        """Like ``_run_container``, but through ``endpoint``'s engine API.
+
+        The container is attached to before it starts, so no output is
+        lost, and both streams arrive multiplexed on that one connection.
+        """
+        api = endpoint.api
+        assert api is not None
+        stdout_log = LogCapture(log_dir / "stdout.log")
+        stderr_log = LogCapture(log_dir / "stderr.log")
+        events = _EventHandler(stderr_log, self._verbose, on_tool_use, startup)
+
+        api.create(spec)
+        try:
+            with api.attach(spec.name, stdin=spec.stdin) as stream:
+                api.start(spec.name)
+
+                # Feed the staged workspace from its own thread while the
+                # output is read here.
+                writer = None
+                if staged_files is not None:
+
+                    def _write_workspace() -> None:
+                        try:
+                            write_workspace_tar(mount_dir, staged_files, stream.stdin)
+                        except OSError:
+                            pass
+                        finally:
+                            stream.close_stdin()
+
+                    writer = threading.Thread(target=_write_workspace, daemon=True)
+                    writer.start()
+
+                for kind, line in stream.lines():
+                    if kind == STDOUT:
+                        stdout_log.write(line)
+                    else:
+                        events.feed(line)
+                if writer is not None:
+                    writer.join()
+            returncode = api.wait(spec.name)
+        finally:
+            stdout_log.close()
+            stderr_log.close()
+            self._remove(endpoint, spec.name)
+        return returncode, list(stdout_log.tail), events.usage
+
+    def _fail_over(
+        self, endpoint: Endpoint, failed: list[Endpoint], error: str
+    ) -> bool:
+        """Mark ``endpoint`` failed; return True if another may take the run."""
+        endpoint.mark_failed(error)
+        failed.append(endpoint)
+        if not self._pool.can_fail_over(failed):
+            return False
+        console.print(
+            f"  [yellow]Engine {endpoint.label} failed ({error}). "
+            "Retrying on another endpoint.[/yellow]"
+        )
+        return True
 
-        if json_line:
+    def _remove(self, endpoint: Endpoint, name: str) -> None:
+        """Force-remove a container, ignoring one that is already gone."""
+        if endpoint.api is not None:
             try:
-                findings = AgentFindings.model_validate_json(json_line)
-                return Result(agent_messages=[], agent_result=findings)
-            except Exception:
+                endpoint.api.remove(name)
+            except (OSError, EngineAPIError):
                 pass
+            return
+        subprocess.run(
+            [*endpoint.cli, "rm", "-f", name], capture_output=True, check=False
+        )
 
-        # Fallback: no parseable JSON on stdout
-        if proc.returncode == -9:
-            detail = "Container was killed (OOM). Try increasing container memory."
-        elif proc.returncode != 0:
-            detail = f"Container exited with code {proc.returncode}."
-        else:
-            detail = "Agent did not produce output."
-
-        if self._verbose and stdout.strip():
-            console.print(f"  [dim]{stdout.strip()}[/dim]")
-
-        findings = AgentFindings(passed=False, details=detail)
-        return Result(agent_messages=[], agent_result=findings)
+    def _ensure_image(self, endpoint: Endpoint | None = None) -> None:
+        """Make sure ``endpoint`` (by default the first) has the agent image.
 
-    def _ensure_image(self) -> None:
-        """Build the image if it does not exist locally."""
-        result = subprocess.run(
-            [self._engine, "image", "inspect", FULL_IMAGE],
-            capture_output=True,
-        )
-        if result.returncode == 0:
+        A missing image is copied from another endpoint that has it, or
+        built there if none does.
+        """
+        endpoint = endpoint or self._pool.endpoints[0]
+        # Long-lived runtimes (e.g. under `good-start serve`) only need to
+        # inspect the image once per endpoint.
+        if endpoint.image_ready:
             return
+        with endpoint.image_lock:
+            if endpoint.image_ready:
+                return
+            if endpoint.api is not None:
+                exists = endpoint.api.image_exists(FULL_IMAGE)
+            else:
+                result = subprocess.run(
+                    [*endpoint.cli, "image", "inspect", FULL_IMAGE],
+                    capture_output=True,
+                    check=False,
+                )
+                exists = result.returncode == 0
+            if not exists:
+                source = next(
+                    (
+                        e
+                        for e in self._pool.endpoints
+                        if e is not endpoint and e.image_ready
+                    ),
+                    None,
+                )
+                if source is None or not self._copy_image(source, endpoint):
+                    self._build_image(endpoint)
+            endpoint.image_ready = True
+
+    def _copy_image(self, source: Endpoint, target: Endpoint) -> bool:
+        """Stream the image from ``source`` into ``target``; True if it worked."""
+        with console.status(
+            f"[dim]Copying agent image to {target.label}...[/dim]", spinner="dots"
+        ):
+            save = subprocess.Popen(
+                [*source.cli, "save", FULL_IMAGE],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            load = subprocess.run(
+                [*target.cli, "load"],
+                stdin=save.stdout,
+                capture_output=True,
+                check=False,
+            )
+            assert save.stdout is not None
+            save.stdout.close()
+            save.wait()
+        return save.returncode == 0 and load.returncode == 0
 
+    def _build_image(self, endpoint: Endpoint) -> None:
         if not _CONTAINERFILE.exists():
             raise FileNotFoundError(
                 f"Containerfile not found at {_CONTAINERFILE}. "
@@ -159,7 +528,7 @@ class ContainerRuntime:
         ):
             build_result = subprocess.run(
                 [
-                    self._engine,
+                    *endpoint.cli,
                     "build",
                     "-t",
                     FULL_IMAGE,
@@ -175,6 +544,196 @@ class ContainerRuntime:
             if self._verbose:
                 console.print(f"[dim]{build_result.stdout}[/dim]")
 
+    def measure_cold_start(self, runs: int = 5) -> list[float]:
+        """Time ``<engine> run`` to the entrypoint's ready event, ``runs`` times.
+
+        Builds the image first if needed, outside the timings. Each run
+        starts a fresh container with ``--startup-only``, so no agent runs
+        and no API key is needed. Returns the timings in seconds.
+        """
+        endpoint = self._pool.endpoints[0]
+        self._ensure_image(endpoint)
+        cmd = [
+            *endpoint.cli,
+            "run",
+            "--rm",
+            FULL_IMAGE,
+            "--prompt",
+            "",
+            "--startup-only",
+        ]
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+            )
+            assert proc.stderr is not None
+            elapsed = None
+            for line in proc.stderr:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict) and "ready" in event:
+                    elapsed = time.perf_counter() - started
+                    break
+            proc.stderr.close()
+            proc.wait()
+            if elapsed is None:
+                raise RuntimeError(
+                    f"Container exited with code {proc.returncode} before the "
+                    "entrypoint was ready."
+                )
+            timings.append(elapsed)
+        return timings
+
+
+class _EventHandler:
+    """Handles the entrypoint's stderr lines, one at a time.
+
+    JSON lines are tool events, passed to ``on_tool_use`` or printed, the
+    ready event that ends ``startup``, trace spans, or the run's usage
+    report. Anything else is logged, and echoed in verbose mode up to
+    ``_ECHO_LINES``.
+    """
+
+    def __init__(
+        self,
+        log: LogCapture,
+        verbose: bool,
+        on_tool_use: Callable[[str, dict], None] | None,
+        startup: tracing.Span | None = None,
+    ) -> None:
+        self.log = log
+        self.verbose = verbose
+        self.on_tool_use = on_tool_use
+        self.startup = startup
+        self.usage: dict = {}
+        self._echoed = 0
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        self.log.write(line)
+        try:
+            event = json.loads(line)
+            if "ready" in event:
+                if self.startup is not None:
+                    self.startup.end()
+                return
+            if "span" in event:
+                tracing.ingest(event["span"])
+                return
+            if "usage" in event:
+                self.usage = event
+                return
+            tool_name = event["tool"]
+            if tool_name == "StructuredOutput":
+                return
+            if self.on_tool_use is not None:
+                self.on_tool_use(tool_name, event["input"])
+                return
+            text = format_tool_event(tool_name, event["input"])
+            sys.stderr.write(f"  {text}\n")
+            sys.stderr.flush()
+        except (json.JSONDecodeError, KeyError, TypeError):
+            if not self.verbose or self._echoed > _ECHO_LINES:
+                return
+            self._echoed += 1
+            if self._echoed > _ECHO_LINES:
+                line = f"... further output in {self.log.path}"
+            sys.stderr.write(f"  {line}\n")
+            sys.stderr.flush()
+
+
+def _container_spec(
+    name: str,
+    prompt: str,
+    target: str,
+    tier: Tier | None,
+    api_key: str,
+    mount_dir: Path,
+    staged_files: list[str] | None,
+    cpus: float | None,
+    memory: int | None,
+    profile: bool = True,
+) -> ContainerSpec:
+    """Describe one agent container.
+
+    With ``staged_files`` the workspace is a tmpfs that the entrypoint fills
+    from a tar on stdin; otherwise ``mount_dir`` is bind-mounted read-only.
+    With ``profile`` and an active profile, the entrypoint runs under cProfile
+    and writes its stats to the mounted profile directory.
+    """
+    command = ["--prompt", prompt, "--target", target]
+    if staged_files is not None:
+        command.append("--workspace-tar")
+    if tier is not None:
+        command += _tier_args(tier)
+    spec = ContainerSpec(
+        name=name,
+        image=FULL_IMAGE,
+        command=command,
+        workdir="/workspace",
+        env={"ANTHROPIC_API_KEY": api_key},
+        binds=[] if staged_files is not None else [f"{mount_dir}:/workspace:ro"],
+        tmpfs={"/workspace": "rw,exec,mode=1777"} if staged_files is not None else {},
+        cpus=cpus,
+        memory=memory,
+        stdin=staged_files is not None,
+    )
+    profile_out = container_profile_dir() if profile else None
+    if profile_out is not None:
+        spec.binds.append(f"{profile_out}:/profile:rw")
+        spec.entrypoint = _IMAGE_PYTHON
+        spec.command = [
+            "-m",
+            "cProfile",
+            "-o",
+            f"/profile/{name}.pstats",
+            "-m",
+            "good_start._entrypoint",
+            *command,
+        ]
+    return spec
+
+
+def _cli_args(cli: list[str], spec: ContainerSpec) -> list[str]:
+    """Return the ``<engine> run`` command line for ``spec``.
+
+    ``cli`` is the engine command prefix, e.g. ``Endpoint.cli``.
+    """
+    cmd = [*cli, "run", "--rm", "--name", spec.name]
+    if spec.stdin:
+        cmd.append("-i")
+    for path, options in spec.tmpfs.items():
+        cmd += ["--tmpfs", f"{path}:{options}"]
+    for bind in spec.binds:
+        cmd += ["-v", bind]
+    if spec.cpus is not None:
+        cmd += ["--cpus", str(spec.cpus)]
+    if spec.memory is not None:
+        cmd += ["--memory", format_memory(spec.memory)]
+    if spec.entrypoint is not None:
+        cmd += ["--entrypoint", spec.entrypoint]
+    if spec.workdir is not None:
+        cmd += ["-w", spec.workdir]
+    for key, value in spec.env.items():
+        cmd += ["-e", f"{key}={value}"]
+    return [*cmd, spec.image, *spec.command]
+
+
+def _tier_args(tier: Tier) -> list[str]:
+    """Return the entrypoint arguments that select ``tier``."""
+    args = ["--tools", ",".join(tier.allowed_tools)]
+    if tier.model:
+        args += ["--model", tier.model]
+    if tier.max_turns:
+        args += ["--max-turns", str(tier.max_turns)]
+    return args
+
 
 def _resolve_api_key() -> str | None:
     """Return the Anthropic API key from the environment or a .env file."""
@@ -193,6 +752,14 @@ def _resolve_api_key() -> str | None:
     return None
 
 
+def _is_oom(returncode: int) -> bool:
+    """Return True if the exit code means the container was OOM-killed.
+
+    Podman reports a SIGKILL as -9; Docker exits with 128 + 9.
+    """
+    return returncode in (-9, 137)
+
+
 def _detect_engine() -> str:
     """Find a container engine, preferring Podman."""
     for candidate in ("podman", "docker"):
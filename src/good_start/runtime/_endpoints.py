@@ -0,0 +1,256 @@
+"""Spread container runs across several engine endpoints.
+
+By default every run goes to the local engine. ``GOOD_START_ENDPOINTS``
+(or ``--endpoint``) lists engines to use instead, comma-separated:
+
+- ``podman`` or ``docker``: the local engine, as without the setting.
+- ``unix:///path/to/engine.sock``: an engine's API socket on this host,
+  e.g. a second rootless Podman service.
+- ``tcp://host:2375``: a remote engine's API.
+- ``ssh://user@host/run/podman/podman.sock``: a remote engine reached
+  through its CLI (``podman --url`` / ``docker -H``).
+
+Prefix a URL with ``podman+`` or ``docker+`` to name the engine whose CLI
+manages it; otherwise the locally installed one is used.
+
+Each endpoint keeps a capacity pool sized from the engine's own CPU and
+memory totals, and a health flag. ``EnginePool.place`` puts each run on
+the healthy endpoint with the lowest share of its CPUs already placed,
+then waits for capacity there. An endpoint that fails to run a container
+is marked unhealthy and probed again after ``_RECHECK_AFTER`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import os
+import subprocess
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+
+from good_start.runtime._capacity import HostCapacity, get_capacity
+from good_start.runtime._engine_api import EngineAPI, EngineAPIError, connect_engine
+
+ENGINES = ("podman", "docker")
+# Seconds before an unhealthy endpoint is probed again.
+_RECHECK_AFTER = 30.0
+# `<engine> info` templates for the host's CPU count and memory in bytes.
+_INFO_FORMATS = {
+    "podman": "{{.Host.CPUs}} {{.Host.MemTotal}}",
+    "docker": "{{.NCPU}} {{.MemTotal}}",
+}
+
+
+class Endpoint:
+    """One container engine that runs can be placed on.
+
+    ``url`` is None for the local engine. ``api`` is the engine's API
+    client, or None to drive it through its CLI. ``capacity`` is None
+    until the engine has been probed for its size.
+    """
+
+    def __init__(
+        self,
+        engine: str,
+        url: str | None = None,
+        api: EngineAPI | None = None,
+        capacity: HostCapacity | None = None,
+    ) -> None:
+        self.engine = engine
+        self.url = url
+        self.api = api
+        self.capacity = capacity
+        self.label = url or engine
+        self.healthy = True
+        self.error: str | None = None
+        self.checked = 0.0
+        # CPUs of the runs placed here, running or waiting for capacity.
+        self.assigned = 0.0
+        self.image_ready = False
+        self.image_lock = threading.Lock()
+
+    @property
+    def remote(self) -> bool:
+        """Whether the engine runs on another machine (``tcp://``, ``ssh://``).
+
+        Host paths can't be bind-mounted there.
+        """
+        return self.url is not None and not self.url.startswith("unix://")
+
+    @property
+    def cli(self) -> list[str]:
+        """Return the engine command line prefix that targets this endpoint."""
+        if self.url is None:
+            return [self.engine]
+        return [self.engine, "--url" if self.engine == "podman" else "-H", self.url]
+
+    def load(self, cpus: float = 0.0) -> float:
+        """Return the share of this endpoint's CPUs placed, plus ``cpus``."""
+        total = self.capacity.total_cpus if self.capacity else 0
+        return (self.assigned + cpus) / total if total else float("inf")
+
+    def check(self) -> bool:
+        """Probe the engine, sizing its capacity on first contact.
+
+        Returns whether the endpoint is healthy.
+        """
+        self.checked = time.monotonic()
+        try:
+            cpus, memory = self._info()
+        except (
+            OSError,
+            ValueError,
+            EngineAPIError,
+            http.client.HTTPException,
+            subprocess.SubprocessError,
+        ) as exc:
+            self.mark_failed(str(exc) or type(exc).__name__)
+            return False
+        if self.capacity is None:
+            self.capacity = HostCapacity(cpus=max(cpus, 1.0), memory=memory)
+        self.healthy = True
+        self.error = None
+        return True
+
+    def _info(self) -> tuple[float, int]:
+        if self.api is not None:
+            info = self.api.info()
+            return float(info["NCPU"]), int(info["MemTotal"])
+        proc = subprocess.run(
+            [*self.cli, "info", "--format", _INFO_FORMATS[self.engine]],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=False,
+        )
+        if proc.returncode != 0:
+            raise OSError(proc.stderr.strip() or f"exit code {proc.returncode}")
+        cpus, memory = proc.stdout.split()
+        return float(cpus), int(memory)
+
+    def mark_failed(self, error: str) -> None:
+        self.healthy = False
+        self.error = error
+        self.checked = time.monotonic()
+
+    def due_for_check(self) -> bool:
+        return self.capacity is None or (
+            not self.healthy and time.monotonic() - self.checked >= _RECHECK_AFTER
+        )
+
+
+class EnginePool:
+    """Least-loaded placement of container runs across endpoints."""
+
+    def __init__(self, endpoints: list[Endpoint]) -> None:
+        if not endpoints:
+            raise ValueError("An engine pool needs at least one endpoint.")
+        self.endpoints = endpoints
+
+    def can_fail_over(self, exclude: Iterable[Endpoint]) -> bool:
+        """Return True if an endpoint outside ``exclude`` may take a run."""
+        excluded = set(exclude)
+        return any(
+            e not in excluded and (e.healthy or e.due_for_check())
+            for e in self.endpoints
+        )
+
+    async def _candidates(self, exclude: set[Endpoint]) -> list[Endpoint]:
+        endpoints = [e for e in self.endpoints if e not in exclude]
+        probed = [e for e in endpoints if e.due_for_check()]
+        for endpoint in probed:
+            await asyncio.to_thread(endpoint.check)
+        healthy = [e for e in endpoints if e.healthy and e.capacity is not None]
+        if not healthy:
+            # Everything is down: probe the rest now rather than wait out
+            # the recheck interval, so a lone endpoint recovers at once.
+            for endpoint in endpoints:
+                if endpoint not in probed:
+                    await asyncio.to_thread(endpoint.check)
+            healthy = [e for e in endpoints if e.healthy and e.capacity is not None]
+        return healthy
+
+    @asynccontextmanager
+    async def place(
+        self, cpus: float, memory: int = 0, exclude: Iterable[Endpoint] = ()
+    ) -> AsyncIterator[Endpoint]:
+        """Reserve ``cpus`` and ``memory`` on the least-loaded healthy endpoint.
+
+        Endpoints in ``exclude`` are skipped. Raises RuntimeError if no
+        endpoint is healthy.
+        """
+        candidates = await self._candidates(set(exclude))
+        if not candidates:
+            down = "; ".join(
+                f"{e.label}: {e.error or 'excluded'}" for e in self.endpoints
+            )
+            raise RuntimeError(f"No container engine endpoint is available ({down}).")
+        # Ties go to the endpoint listed first.
+        endpoint = min(candidates, key=lambda e: e.load(cpus))
+        assert endpoint.capacity is not None
+        endpoint.assigned += cpus
+        try:
+            async with endpoint.capacity.reserve(cpus, memory):
+                yield endpoint
+        finally:
+            endpoint.assigned -= cpus
+
+
+def local_endpoint(engine: str) -> Endpoint:
+    """Return the local engine as an endpoint, sharing the host capacity pool."""
+    return Endpoint(engine, api=connect_engine(engine), capacity=get_capacity())
+
+
+# Configured endpoints are shared process-wide, so every runtime sees the
+# same health and load.
+_shared: dict[str, Endpoint] = {}
+_shared_lock = threading.Lock()
+
+
+def parse_endpoint(text: str, engine: str) -> Endpoint:
+    """Return the endpoint ``text`` names; ``engine`` is the local engine."""
+    text = text.strip()
+    if text in ENGINES:
+        return local_endpoint(text)
+    with _shared_lock:
+        if text in _shared:
+            return _shared[text]
+        url = text
+        prefix, plus, rest = text.partition("+")
+        if plus and prefix in ENGINES:
+            engine, url = prefix, rest
+        scheme = url.partition("://")[0]
+        if scheme not in ("unix", "tcp", "ssh"):
+            raise ValueError(
+                f"Invalid engine endpoint {text!r}. Use podman, docker, or a "
+                "unix://, tcp:// or ssh:// URL."
+            )
+        backend = os.environ.get("GOOD_START_ENGINE_BACKEND", "auto").lower()
+        api = None
+        if scheme != "ssh" and backend != "cli":
+            api = EngineAPI(
+                engine, url.removeprefix("unix://") if scheme == "unix" else url
+            )
+        endpoint = _shared[text] = Endpoint(engine, url=url, api=api)
+        return endpoint
+
+
+def configured_endpoints(
+    engine: str, endpoints: list[str] | None = None
+) -> list[Endpoint]:
+    """Return the endpoints to run on: ``endpoints``, else ``GOOD_START_ENDPOINTS``.
+
+    With neither, the local ``engine`` is the only endpoint.
+    """
+    if not endpoints:
+        endpoints = [
+            e
+            for e in os.environ.get("GOOD_START_ENDPOINTS", "").split(",")
+            if e.strip()
+        ]
+    if not endpoints:
+        return [local_endpoint(engine)]
+    return [parse_endpoint(text, engine) for text in endpoints]
@@ -0,0 +1,490 @@
+"""Talk to Docker or Podman over the engine's REST API socket.
+
+The CLI backend in ``_container`` spawns a ``podman``/``docker`` process
+for every image inspect, run, ``rm`` and ``stats`` call. When the engine
+exposes its API on a Unix socket (``docker.sock``, or ``podman.sock`` from
+``podman system service``), ``EngineAPI`` makes the same calls over one
+persistent HTTP/1.1 connection instead: containers are created, attached
+to and started directly, output arrives on the attach stream, and the exit
+code comes from the engine's wait endpoint rather than a child process.
+
+Both engines serve the Docker-compatible API, so one client covers them.
+``GOOD_START_ENGINE_BACKEND`` picks the backend: ``auto`` (the default)
+uses the socket when one answers and falls back to the CLI otherwise,
+``api`` requires the socket, and ``cli`` never looks for one.
+
+A client can also be pointed at a remote engine's ``tcp://host:port``
+address; see ``_endpoints``.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Self
+from urllib.parse import quote, urlencode
+
+from good_start.runtime._resources import ResourceSample, ResourceSampler
+
+API_VERSION = "v1.41"
+BACKENDS = ("auto", "api", "cli")
+
+# Multiplexed attach frames: stream type, three padding bytes, payload size.
+_FRAME_HEADER = struct.Struct(">BxxxL")
+STDOUT = 1
+STDERR = 2
+
+_TIMEOUT = 30
+
+
+class EngineAPIError(RuntimeError):
+    """The engine answered an API call with an error status.
+
+    Transport failures, where no answer arrived, are raised with status 0.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"Engine API error {status}: {message}")
+        self.status = status
+
+
+@dataclass
+class ContainerSpec:
+    """Everything needed to start one agent container, for either backend."""
+
+    name: str
+    image: str
+    # Arguments after the image, i.e. the container's command.
+    command: list[str]
+    entrypoint: str | None = None
+    workdir: str | None = None
+    env: dict[str, str] = field(default_factory=dict)
+    binds: list[str] = field(default_factory=list)
+    tmpfs: dict[str, str] = field(default_factory=dict)
+    cpus: float | None = None
+    memory: int | None = None
+    stdin: bool = False
+
+    def create_config(self) -> dict:
+        """Return the body of a ``POST /containers/create`` request."""
+        host_config: dict = {"Binds": self.binds, "Tmpfs": self.tmpfs}
+        if self.cpus is not None:
+            host_config["NanoCpus"] = int(self.cpus * 1e9)
+        if self.memory is not None:
+            host_config["Memory"] = self.memory
+        config: dict = {
+            "Image": self.image,
+            "Cmd": self.command,
+            "Env": [f"{key}={value}" for key, value in self.env.items()],
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "AttachStdin": self.stdin,
+            "OpenStdin": self.stdin,
+            # Closing our end of the attach stream closes the container's
+            # stdin, which ends the workspace tar.
+            "StdinOnce": self.stdin,
+            "Tty": False,
+            "HostConfig": host_config,
+        }
+        if self.entrypoint is not None:
+            config["Entrypoint"] = [self.entrypoint]
+        if self.workdir is not None:
+            config["WorkingDir"] = self.workdir
+        return config
+
+
+def _open_socket(
+    address: Path | tuple[str, int], timeout: float | None
+) -> socket.socket:
+    if isinstance(address, Path):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(str(address))
+        return sock
+    return socket.create_connection(address, timeout=timeout)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: Path, timeout: float | None = _TIMEOUT) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = _open_socket(self.socket_path, self.timeout)
+
+
+class AttachStream:
+    """A hijacked ``attach`` connection: stdin out, multiplexed output in."""
+
+    def __init__(self, sock: socket.socket, reader: BinaryIO) -> None:
+        self._sock = sock
+        self._reader = reader
+        self.stdin = sock.makefile("wb")
+
+    def close_stdin(self) -> None:
+        """Flush and half-close the connection, ending the container's stdin."""
+        try:
+            self.stdin.close()
+            self._sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    def frames(self) -> Iterator[tuple[int, bytes]]:
+        """Yield ``(stream, payload)`` frames until the container exits."""
+        while True:
+            header = self._reader.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            stream, size = _FRAME_HEADER.unpack(header)
+            payload = self._reader.read(size)
+            yield stream, payload
+            if len(payload) < size:
+                return
+
+    def lines(self) -> Iterator[tuple[int, str]]:
+        """Yield ``(stream, line)`` pairs, with each line's newline kept."""
+        pending = {STDOUT: b"", STDERR: b""}
+        for stream, payload in self.frames():
+            if stream not in pending:
+                continue
+            *complete, pending[stream] = (pending[stream] + payload).split(b"\n")
+            for line in complete:
+                yield stream, line.decode("utf-8", errors="replace") + "\n"
+        for stream, rest in pending.items():
+            if rest:
+                yield stream, rest.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        self._reader.close()
+        self.stdin.close()
+        self._sock.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class EngineAPI:
+    """Client for the Docker-compatible API on a Unix socket or TCP address.
+
+    ``address`` is a socket path, a ``tcp://host:port`` URL or a
+    ``(host, port)`` pair. Short calls share one keep-alive connection, so
+    the instance is safe to use from several threads, though they queue
+    behind each other; ``fork`` gives a caller a connection of its own.
+    Long-running calls (attach, wait) open their own.
+    """
+
+    def __init__(self, engine: str, address: str | Path | tuple[str, int]) -> None:
+        self.engine = engine
+        self.address: Path | tuple[str, int]
+        if isinstance(address, tuple):
+            self.address = address
+        elif isinstance(address, str) and address.startswith("tcp://"):
+            host, _, port = address.removeprefix("tcp://").rstrip("/").rpartition(":")
+            self.address = (host, int(port))
+        else:
+            self.address = Path(address)
+        self._conn = self._connection()
+        self._lock = threading.Lock()
+
+    def _connection(
+        self, timeout: float | None = _TIMEOUT
+    ) -> http.client.HTTPConnection:
+        if isinstance(self.address, Path):
+            return _UnixHTTPConnection(self.address, timeout=timeout)
+        host, port = self.address
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _path(self, path: str, **params: object) -> str:
+        query = {k: v for k, v in params.items() if v is not None}
+        url = f"/{API_VERSION}{path}"
+        return f"{url}?{urlencode(query)}" if query else url
+
+    def _request(
+        self, method: str, path: str, body: dict | None = None
+    ) -> tuple[int, bytes]:
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        with self._lock:
+            try:
+                return self._send(method, path, payload, headers)
+            except ConnectionError:
+                # The engine may have closed an idle keep-alive connection;
+                # reconnect once before giving up.
+                self._reconnect()
+            except (OSError, http.client.HTTPException) as exc:
+                self._reconnect()
+                raise _transport_error(exc) from exc
+            try:
+                return self._send(method, path, payload, headers)
+            except (OSError, http.client.HTTPException) as exc:
+                self._reconnect()
+                raise _transport_error(exc) from exc
+
+    def _reconnect(self) -> None:
+        # A failed exchange can leave the connection mid-response, where
+        # every later request would fail too; start over with a fresh one.
+        self._conn.close()
+        self._conn = self._connection()
+
+    def _send(
+        self, method: str, path: str, payload: bytes | None, headers: dict
+    ) -> tuple[int, bytes]:
+        self._conn.request(method, path, payload, headers)
+        response = self._conn.getresponse()
+        return response.status, response.read()
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        body: dict | None = None,
+        ok: tuple[int, ...] = (),
+    ) -> tuple[int, bytes]:
+        status, data = self._request(method, path, body)
+        if status >= 400 and status not in ok:
+            raise EngineAPIError(status, _error_message(data))
+        return status, data
+
+    def ping(self) -> bool:
+        try:
+            status, _ = self._request("GET", "/_ping")
+        except EngineAPIError:
+            return False
+        return status == 200
+
+    def image_exists(self, image: str) -> bool:
+        status, _ = self._call(
+            "GET", self._path(f"/images/{quote(image, safe='')}/json"), ok=(404,)
+        )
+        return status != 404
+
+    def info(self) -> dict:
+        """Return the engine's system info, including ``NCPU`` and ``MemTotal``."""
+        _, data = self._call("GET", self._path("/info"))
+        return json.loads(data)
+
+    def create(self, spec: ContainerSpec) -> str:
+        """Create the container and return its ID."""
+        _, data = self._call(
+            "POST",
+            self._path("/containers/create", name=spec.name),
+            spec.create_config(),
+        )
+        return json.loads(data)["Id"]
+
+    def start(self, container: str) -> None:
+        # 304: already started.
+        self._call("POST", self._path(f"/containers/{container}/start"), ok=(304,))
+
+    def remove(self, container: str) -> None:
+        """Force-remove the container; a missing container is not an error."""
+        self._call(
+            "DELETE",
+            self._path(f"/containers/{container}", force="true"),
+            ok=(404, 409),
+        )
+
+    def stats(self, container: str) -> dict | None:
+        """Return one stats reading, or None if the container is gone."""
+        status, data = self._call(
+            "GET",
+            self._path(
+                f"/containers/{container}/stats", stream="false", **{"one-shot": "true"}
+            ),
+            ok=(404, 409),
+        )
+        return json.loads(data) if status == 200 else None
+
+    def attach(self, container: str, stdin: bool = False) -> AttachStream:
+        """Attach to the container's output (and stdin), before it starts."""
+        sock = _open_socket(self.address, timeout=None)
+        path = self._path(
+            f"/containers/{container}/attach",
+            stream="1",
+            stdout="1",
+            stderr="1",
+            stdin="1" if stdin else "0",
+        )
+        sock.sendall(
+            f"POST {path} HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            "Content-Type: application/vnd.docker.raw-stream\r\n"
+            "Connection: Upgrade\r\n"
+            "Upgrade: tcp\r\n"
+            "\r\n".encode()
+        )
+        reader = sock.makefile("rb")
+        status_line = reader.readline().decode("latin-1")
+        while reader.readline() not in (b"\r\n", b"\n", b""):
+            pass
+        parts = status_line.split(" ", 2)
+        status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+        # Docker upgrades the connection (101); older engines answer 200.
+        if status not in (101, 200):
+            reader.close()
+            sock.close()
+            raise EngineAPIError(status, status_line.strip() or "attach failed")
+        return AttachStream(sock, reader)
+
+    def wait(self, container: str) -> int:
+        """Block until the container exits and return its exit code."""
+        conn = self._connection(timeout=None)
+        try:
+            conn.request("POST", self._path(f"/containers/{container}/wait"))
+            response = conn.getresponse()
+            data = response.read()
+        finally:
+            conn.close()
+        if response.status >= 400:
+            raise EngineAPIError(response.status, _error_message(data))
+        return int(json.loads(data)["StatusCode"])
+
+    def fork(self) -> EngineAPI:
+        """Return a client for the same engine with its own connection."""
+        return EngineAPI(self.engine, self.address)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _transport_error(exc: Exception) -> EngineAPIError:
+    return EngineAPIError(0, str(exc) or type(exc).__name__)
+
+
+def _error_message(data: bytes) -> str:
+    try:
+        return json.loads(data)["message"]
+    except (ValueError, KeyError, TypeError):
+        return data.decode("utf-8", errors="replace").strip()
+
+
+def socket_candidates(engine: str) -> list[Path]:
+    """Return the API sockets to try for ``engine``, most specific first."""
+    host = os.environ.get("CONTAINER_HOST" if engine == "podman" else "DOCKER_HOST")
+    if host:
+        # TCP and SSH hosts are left to the CLI.
+        return (
+            [Path(host.removeprefix("unix://"))] if host.startswith("unix://") else []
+        )
+    if engine == "podman":
+        candidates = [Path("/run/podman/podman.sock")]
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime_dir:
+            candidates.insert(0, Path(runtime_dir) / "podman" / "podman.sock")
+        return candidates
+    return [Path("/var/run/docker.sock"), Path.home() / ".docker/run/docker.sock"]
+
+
+_connections: dict[Path, EngineAPI] = {}
+_connections_lock = threading.Lock()
+
+
+def connect_engine(engine: str) -> EngineAPI | None:
+    """Return an API client for ``engine``, or None to use the CLI.
+
+    Clients are shared process-wide, so every runtime reuses one
+    connection per socket.
+    """
+    backend = os.environ.get("GOOD_START_ENGINE_BACKEND", "auto").lower()
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown GOOD_START_ENGINE_BACKEND {backend!r}. "
+            f"Choose from: {', '.join(BACKENDS)}."
+        )
+    if backend == "cli":
+        return None
+
+    candidates = socket_candidates(engine)
+    with _connections_lock:
+        for path in candidates:
+            if path in _connections:
+                return _connections[path]
+            if not path.exists():
+                continue
+            api = EngineAPI(engine, path)
+            if api.ping():
+                _connections[path] = api
+                return api
+            api.close()
+
+    if backend == "api":
+        tried = ", ".join(str(p) for p in candidates) or "none"
+        raise RuntimeError(
+            f"No {engine} API socket is answering (tried: {tried}). "
+            "Start the engine's API service or set "
+            "GOOD_START_ENGINE_BACKEND=cli."
+        )
+    return None
+
+
+def parse_stats_json(
+    data: dict, elapsed: float, previous: tuple[float, int]
+) -> tuple[ResourceSample, int]:
+    """Turn an API stats reading into a sample.
+
+    ``previous`` is the ``(elapsed, cpu_ns)`` of the last reading; the
+    engine reports cumulative CPU time, so the sample's percentage covers
+    the interval since then. Returns the sample and this reading's CPU time.
+    """
+    cpu_ns = data.get("cpu_stats", {}).get("cpu_usage", {}).get("total_usage", 0)
+    last_elapsed, last_cpu_ns = previous
+    interval = elapsed - last_elapsed
+    cpu_percent = (cpu_ns - last_cpu_ns) / 1e9 / interval * 100 if interval > 0 else 0.0
+    networks = (data.get("networks") or {}).values()
+    blkio = (data.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+    sample = ResourceSample(
+        elapsed=elapsed,
+        cpu_percent=max(cpu_percent, 0.0),
+        memory=(data.get("memory_stats") or {}).get("usage", 0),
+        net_rx=sum(n.get("rx_bytes", 0) for n in networks),
+        net_tx=sum(n.get("tx_bytes", 0) for n in networks),
+        block_read=sum(e["value"] for e in blkio if e.get("op", "").lower() == "read"),
+        block_write=sum(
+            e["value"] for e in blkio if e.get("op", "").lower() == "write"
+        ),
+        cpu_seconds=cpu_ns / 1e9,
+    )
+    return sample, cpu_ns
+
+
+class EngineAPISampler(ResourceSampler):
+    """ResourceSampler that reads stats from the engine API.
+
+    Unlike the ``stats`` command, the API reports cumulative CPU time, so
+    its samples carry CPU seconds. Stats calls can take a second or more,
+    so the sampler polls over its own connection rather than holding up
+    the container calls on ``api``'s.
+    """
+
+    def __init__(self, api: EngineAPI, container: str, interval: float = 1.0) -> None:
+        super().__init__(api.engine, container, interval)
+        self.api = api.fork()
+        self._previous = (0.0, 0)
+
+    def _poll(self) -> None:
+        try:
+            super()._poll()
+        finally:
+            self.api.close()
+
+    def _sample(self) -> ResourceSample | None:
+        data = self.api.stats(self.container)
+        if not data or not data.get("cpu_stats"):
+            return None
+        sample, cpu_ns = parse_stats_json(
+            data, time.monotonic() - self._started, self._previous
+        )
+        self._previous = (sample.elapsed, cpu_ns)
+        return sample
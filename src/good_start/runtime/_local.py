@@ -1,21 +1,48 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+
 from rich.console import Console
 
+from good_start import tracing
 from good_start.agent import Agent
 from good_start.display import print_tool_event
 from good_start.result import Result
+from good_start.session import SessionPool
+from good_start.tiers import Tier
 
 console = Console(stderr=True)
 
 
 class LocalRuntime:
-    """Runs the agent directly on the host machine."""
-
-    async def run(self, prompt: str, target: str) -> Result:
-        agent = Agent()
+    """Runs the agent directly on the host machine.
+
+    Pass a ``SessionPool`` to reuse persistent SDK clients across runs
+    instead of starting a new Claude CLI process for every check, and
+    ``cwd`` to run the agent somewhere other than the current directory.
+    """
+
+    def __init__(self, pool: SessionPool | None = None, cwd: str | None = None) -> None:
+        self._pool = pool
+        self._cwd = cwd
+
+    async def run(
+        self,
+        prompt: str,
+        target: str,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+        tier: Tier | None = None,
+    ) -> Result:
+        agent = Agent(pool=self._pool, cwd=self._cwd)
 
         def _on_tool_use(name: str, tool_input: dict) -> None:
             print_tool_event(name, tool_input, console)
 
-        return await agent.run(prompt, on_tool_use=_on_tool_use)
+        with tracing.span(
+            "local.run", target=target, tier=tier.name if tier else None
+        ) as run_span:
+            result = await agent.run(
+                prompt, on_tool_use=on_tool_use or _on_tool_use, tier=tier
+            )
+            run_span.set_attribute("passed", result.passed)
+            return result
@@ -0,0 +1,122 @@
+"""Bounded-memory capture of container output.
+
+Container stdout and stderr are written line by line to size-capped,
+rotating log files. Only a short tail is kept in memory, which is all the
+host needs to find the final AgentFindings line.
+
+Each run gets its own log directory. Directories are only pruned once their
+run has marked them finished, so concurrent runs never lose their logs.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from collections import deque
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO
+
+MAX_LOG_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 2
+TAIL_LINES = 50
+# Number of finished per-run log directories kept before the oldest are removed.
+KEEP_RUNS = 50
+# Unfinished directories this old belong to runs that died without finishing.
+STALE_SECONDS = 24 * 60 * 60
+FINISHED_MARKER = ".finished"
+
+
+def logs_root() -> Path:
+    """Return the directory that holds per-run container logs."""
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "good-start" / "logs"
+
+
+def run_log_dir(name: str, root: Path | None = None) -> Path:
+    """Create and return the log directory for one run, pruning old ones.
+
+    Only directories of finished runs (see ``finish_run_log_dir``) are
+    pruned, along with unfinished ones older than ``STALE_SECONDS``.
+    """
+    root = root or logs_root()
+    root.mkdir(parents=True, exist_ok=True)
+    stale = time.time() - STALE_SECONDS
+    finished = []
+    for path in root.iterdir():
+        try:
+            if (path / FINISHED_MARKER).exists():
+                finished.append((path.stat().st_mtime_ns, path))
+            elif path.is_dir() and path.stat().st_mtime < stale:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            # Pruned by another run in the meantime.
+            continue
+    finished.sort()
+    for _, old in finished[: max(0, len(finished) - KEEP_RUNS + 1)]:
+        shutil.rmtree(old, ignore_errors=True)
+    path = root / name
+    path.mkdir()
+    return path
+
+
+def finish_run_log_dir(path: Path) -> None:
+    """Mark a run's log directory as finished, so later runs may prune it."""
+    (path / FINISHED_MARKER).touch()
+
+
+class LogCapture:
+    """Append-only rotating log file with a small in-memory tail."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = MAX_LOG_BYTES,
+        backups: int = LOG_BACKUPS,
+        tail_lines: int = TAIL_LINES,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.tail: deque[str] = deque(maxlen=tail_lines)
+        self.total_bytes = 0
+        self._size = 0
+        self._files = ExitStack()
+        self._file = self._open()
+
+    def _open(self) -> IO[str]:
+        return self._files.enter_context(
+            open(self.path, "w", encoding="utf-8", errors="replace")
+        )
+
+    def write(self, line: str) -> None:
+        line = line.rstrip("\n")
+        self.tail.append(line)
+        size = len(line.encode("utf-8", errors="replace")) + 1
+        if self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(line + "\n")
+        self._size += size
+        self.total_bytes += size
+
+    def _rotate(self) -> None:
+        self._files.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                src.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        self._file = self._open()
+        self._size = 0
+
+    def last_line(self) -> str:
+        """Return the last non-empty line written."""
+        for line in reversed(self.tail):
+            if line.strip():
+                return line.strip()
+        return ""
+
+    def close(self) -> None:
+        self._files.close()
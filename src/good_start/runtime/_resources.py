@@ -0,0 +1,227 @@
+"""Sample a running container's resource usage through the engine.
+
+``ResourceSampler`` polls ``<engine> stats --no-stream`` for one container
+from a background thread while it runs. The engine reads the container's
+cgroup for us, which works the same for Docker and Podman, rootful or
+rootless, and inside a VM on macOS where the host can't see the cgroup.
+
+Network and block I/O counters are cumulative and memory is a gauge. Each
+``stats --no-stream`` call is a new process with no previous reading to
+compare against, so the CPU percentage it prints isn't an interval rate
+that can be integrated, and the CLI sampler leaves CPU time unknown. The
+engine API reports cumulative CPU time, so ``EngineAPISampler`` fills it in.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Go template fields shared by `docker stats` and `podman stats`.
+_STATS_FORMAT = "{{.CPUPerc}}|{{.MemUsage}}|{{.NetIO}}|{{.BlockIO}}"
+# Long runs keep at most this many samples; older ones are thinned out.
+MAX_SAMPLES = 600
+
+_SIZE_RE = re.compile(r"^\s*([\d.]+)\s*([kKMGTP]?i?B)?\s*$")
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "kB": 1000,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "TB": 1000**4,
+    "KiB": 1024,
+    "MiB": 1024**2,
+    "GiB": 1024**3,
+    "TiB": 1024**4,
+}
+
+
+def parse_size(text: str) -> int | None:
+    """Parse an engine size such as ``12.5MiB`` or ``3.1kB`` into bytes."""
+    match = _SIZE_RE.match(text)
+    if not match or (match.group(2) or "") not in _SIZE_UNITS:
+        return None
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2) or ""])
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """One reading: seconds since the container started, and its counters.
+
+    ``cpu_seconds`` is the container's cumulative CPU time, when the engine
+    reports it.
+    """
+
+    elapsed: float
+    cpu_percent: float
+    memory: int
+    net_rx: int
+    net_tx: int
+    block_read: int
+    block_write: int
+    cpu_seconds: float | None = None
+
+
+def parse_stats_line(line: str, elapsed: float) -> ResourceSample | None:
+    """Parse one line of ``stats`` output in ``_STATS_FORMAT``."""
+    parts = line.strip().split("|")
+    if len(parts) != 4:
+        return None
+    cpu, mem, net, block = parts
+    try:
+        cpu_percent = float(cpu.strip().rstrip("%") or 0)
+    except ValueError:
+        return None
+    sizes = [
+        parse_size(mem.split("/")[0]),
+        *(parse_size(v) for v in net.split("/")),
+        *(parse_size(v) for v in block.split("/")),
+    ]
+    if len(sizes) != 5 or any(size is None for size in sizes):
+        return None
+    memory, net_rx, net_tx, block_read, block_write = sizes
+    return ResourceSample(
+        elapsed, cpu_percent, memory, net_rx, net_tx, block_read, block_write
+    )
+
+
+@dataclass
+class ResourceUsage:
+    """Summary of a container's resource usage, with the samples behind it."""
+
+    peak_memory: int = 0
+    # None when the engine doesn't report cumulative CPU time.
+    cpu_seconds: float | None = None
+    net_rx: int = 0
+    net_tx: int = 0
+    block_read: int = 0
+    block_write: int = 0
+    # Seconds between the container start and the last sample.
+    elapsed: float = 0.0
+    samples: list[ResourceSample] = field(default_factory=list)
+
+    def add(self, sample: ResourceSample) -> None:
+        """Fold one sample into the totals and the time series."""
+        self.peak_memory = max(self.peak_memory, sample.memory)
+        if sample.cpu_seconds is not None:
+            self.cpu_seconds = max(self.cpu_seconds or 0.0, sample.cpu_seconds)
+        self.net_rx = max(self.net_rx, sample.net_rx)
+        self.net_tx = max(self.net_tx, sample.net_tx)
+        self.block_read = max(self.block_read, sample.block_read)
+        self.block_write = max(self.block_write, sample.block_write)
+        self.elapsed = sample.elapsed
+        self.samples.append(sample)
+        if len(self.samples) > MAX_SAMPLES:
+            # Totals are already folded in; thin out the series, keeping
+            # the latest reading.
+            self.samples = self.samples[-1::-2][::-1]
+
+    def to_dict(self, samples: bool = True) -> dict:
+        data = asdict(self)
+        if not samples:
+            del data["samples"]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ResourceUsage:
+        samples = [ResourceSample(**s) for s in data.get("samples", [])]
+        return cls(**{**data, "samples": samples})
+
+    def summary(self) -> str:
+        """Return a one-line, human-readable summary."""
+        cpu = f"CPU {self.cpu_seconds:.1f}s, " if self.cpu_seconds is not None else ""
+        return (
+            f"peak memory {format_size(self.peak_memory)}, "
+            f"{cpu}"
+            f"disk read {format_size(self.block_read)} / "
+            f"written {format_size(self.block_write)}, "
+            f"network in {format_size(self.net_rx)} / out {format_size(self.net_tx)}"
+        )
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+class ResourceSampler:
+    """Polls engine stats for one container from a background thread.
+
+    ``engine`` is the engine command, or its command line prefix when it
+    needs options such as a remote host.
+    """
+
+    def __init__(
+        self, engine: str | list[str], container: str, interval: float = 1.0
+    ) -> None:
+        self.engine = [engine] if isinstance(engine, str) else list(engine)
+        self.container = container
+        self.interval = interval
+        self.usage = ResourceUsage()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> ResourceUsage:
+        """Stop sampling and return what was collected.
+
+        With ``wait``, blocks until an in-flight ``stats`` call returns, so
+        the result includes it.
+        """
+        self._stop.set()
+        if wait:
+            self._thread.join()
+        return self.usage
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            try:
+                sample = self._sample()
+            except Exception:
+                # Sampling is best-effort and must never break a run.
+                logger.debug("Sampling %s failed", self.container, exc_info=True)
+                sample = None
+            if sample is not None:
+                self.usage.add(sample)
+            self._stop.wait(self.interval)
+
+    def _sample(self) -> ResourceSample | None:
+        try:
+            proc = subprocess.run(
+                [
+                    *self.engine,
+                    "stats",
+                    "--no-stream",
+                    "--format",
+                    _STATS_FORMAT,
+                    self.container,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return None
+        # The container may not exist yet, or have just exited.
+        if proc.returncode != 0 or not isinstance(proc.stdout, str):
+            return None
+        lines = proc.stdout.strip().splitlines()
+        if not lines:
+            return None
+        return parse_stats_line(lines[-1], time.monotonic() - self._started)
@@ -0,0 +1,127 @@
+"""Workspace staging for the container runtime.
+
+Instead of bind-mounting a whole project, the container runtime can stream
+a filtered subset of it into the container as a tar archive. The entrypoint
+unpacks it into a writable tmpfs at /workspace, so the agent only sees the
+files that matter and can still build in place.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import tarfile
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import IO
+
+STAGE_MODES = ("git", "filter")
+
+# Directories that are almost never part of getting-started docs but can
+# hold millions of files. Always left out in "filter" mode, on top of any
+# user excludes, unless default excludes are turned off.
+DEFAULT_EXCLUDES = (
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "target",
+    "dist",
+    "build",
+)
+
+
+def _matches(rel: str, patterns: Iterable[str]) -> bool:
+    """Return True if a relative POSIX path matches any pattern.
+
+    A pattern matches the full path, any single path component, or a
+    directory prefix (``docs/`` matches everything under ``docs``).
+    """
+    parts = rel.split("/")
+    for pattern in patterns:
+        prefix = pattern.rstrip("/")
+        if fnmatch(rel, pattern) or rel == prefix or rel.startswith(prefix + "/"):
+            return True
+        if "/" not in prefix and any(fnmatch(part, prefix) for part in parts):
+            return True
+    return False
+
+
+def _git_files(root: Path) -> list[str]:
+    result = subprocess.run(
+        ["git", "-C", str(root), "ls-files", "-z", "--cached"],
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Cannot stage git-tracked files: {root} is not a git repository."
+        )
+    return [p for p in result.stdout.decode().split("\0") if p]
+
+
+def _walk_files(root: Path, exclude: tuple[str, ...]) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        # Prune excluded directories so we never descend into them.
+        dirnames[:] = [d for d in dirnames if not _matches(rel_dir + d, exclude)]
+        for name in filenames:
+            yield rel_dir + name
+
+
+def list_workspace_files(
+    root: Path,
+    mode: str,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    default_excludes: bool = True,
+) -> list[str]:
+    """Return the relative paths under ``root`` to stage into the container.
+
+    ``mode`` is ``"git"`` (only tracked files) or ``"filter"`` (walk the tree,
+    skipping ``exclude``). In both modes ``include`` patterns, if given,
+    restrict the result and ``exclude`` patterns remove from it. In
+    ``"filter"`` mode ``DEFAULT_EXCLUDES`` are left out as well, unless
+    ``default_excludes`` is False.
+    """
+    if mode not in STAGE_MODES:
+        raise ValueError(
+            f"Unknown stage mode {mode!r}. Expected one of: {', '.join(STAGE_MODES)}."
+        )
+    include = tuple(include or ())
+    exclude = tuple(exclude or ())
+    if mode == "filter" and default_excludes:
+        exclude = DEFAULT_EXCLUDES + exclude
+
+    candidates = _git_files(root) if mode == "git" else _walk_files(root, exclude)
+
+    files = []
+    for rel in candidates:
+        if include and not _matches(rel, include):
+            continue
+        if exclude and _matches(rel, exclude):
+            continue
+        if (root / rel).is_file():
+            files.append(rel)
+    return sorted(files)
+
+
+def write_workspace_tar(root: Path, files: Iterable[str], fileobj: IO[bytes]) -> None:
+    """Stream ``files`` (relative to ``root``) as an uncompressed tar."""
+    with tarfile.open(fileobj=fileobj, mode="w|") as tar:
+        for rel in files:
+            tar.add(root / rel, arcname=rel, recursive=False)
+
+
+def extract_workspace_tar(fileobj: IO[bytes], dest: Path) -> None:
+    """Unpack a staged workspace tar stream into ``dest``."""
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+        tar.extractall(dest, filter="data")
@@ -0,0 +1,198 @@
+"""Adaptive concurrency and retry for agent runs.
+
+Many checks running in parallel share one API rate limit. The scheduler
+bounds how many agent runs are in flight, retries transient API failures
+(429 / overloaded) with jittered exponential backoff, and adjusts the
+concurrency limit AIMD-style: +1 after each clean run, halved whenever a
+run is rate limited.
+
+Failures are classified only from structured data: the status the SDK
+reports on a failed result (``ResultError.api_error_status``, or an error
+``ResultMessage`` / ``AssistantMessage`` that the agent turns into a
+``TransientAPIError``) or an HTTP ``status`` / ``status_code`` attribute.
+Error text is never matched, since a retry restarts a run that may already
+have had side effects.
+
+The scheduler is per process. Local runs in one process share it; each
+agent container runs its own, so concurrent container checks are bounded
+by host capacity rather than by a shared rate limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from claude_agent_sdk import ResultError
+
+T = TypeVar("T")
+
+# HTTP status codes that indicate a retryable API failure.
+TRANSIENT_STATUS = frozenset({429, 500, 502, 503, 504, 529})
+
+
+class TransientAPIError(Exception):
+    """Raised when an agent run fails for a retryable API reason."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True if the exception reports a rate-limit or overload status."""
+    if isinstance(exc, TransientAPIError):
+        return True
+    if isinstance(exc, ResultError):
+        status = exc.api_error_status
+    else:
+        status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    return isinstance(status, int) and status in TRANSIENT_STATUS
+
+
+@dataclass
+class SchedulerStats:
+    queued: int
+    in_flight: int
+    limit: int
+    retries: int
+    rate_limited: int
+    completed: int
+
+
+class Scheduler:
+    """Shared AIMD concurrency limiter with retry/backoff for agent runs."""
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limit = max(min_limit, min(initial_limit, max_limit))
+        self._in_flight = 0
+        self._queued = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._completed = 0
+        self._cond: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    def stats(self) -> SchedulerStats:
+        return SchedulerStats(
+            queued=self._queued,
+            in_flight=self._in_flight,
+            limit=self._limit,
+            retries=self._retries,
+            rate_limited=self._rate_limited,
+            completed=self._completed,
+        )
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` under the concurrency limit, retrying transient failures.
+
+        ``fn`` is called once per attempt, so it must be safe to re-invoke.
+        Non-transient exceptions propagate immediately; a transient failure
+        that exhausts ``max_retries`` re-raises the last exception.
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            rate_limited = False
+            try:
+                value = await fn()
+            except Exception as exc:
+                if not is_transient_error(exc):
+                    raise
+                rate_limited = True
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                self._on_success()
+                return value
+            finally:
+                # Always give the slot back, also when the attempt is cancelled.
+                await self._release(rate_limited=rate_limited)
+            self._retries += 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def _condition(self) -> asyncio.Condition:
+        # The shared scheduler outlives individual asyncio.run() calls, so
+        # rebind the condition to whichever loop is currently running.
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self._in_flight = 0
+            self._queued = 0
+        return self._cond
+
+    async def _acquire(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self._queued += 1
+            try:
+                await cond.wait_for(lambda: self._in_flight < self._limit)
+            finally:
+                self._queued -= 1
+            self._in_flight += 1
+
+    async def _release(self, rate_limited: bool = False) -> None:
+        cond = self._condition()
+        async with cond:
+            self._in_flight -= 1
+            if rate_limited:
+                self._on_rate_limited()
+            cond.notify_all()
+
+    def _on_success(self) -> None:
+        self._completed += 1
+        self._limit = min(self._limit + 1, self.max_limit)
+
+    def _on_rate_limited(self) -> None:
+        self._rate_limited += 1
+        self._limit = max(self._limit // 2, self.min_limit)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(max_delay, base * 2^attempt)].
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+_shared: Scheduler | None = None
+
+
+def get_scheduler() -> Scheduler:
+    """Return the process-wide scheduler shared by all agents."""
+    global _shared
+    if _shared is None:
+        _shared = Scheduler()
+    return _shared
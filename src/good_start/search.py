@@ -0,0 +1,532 @@
+"""Indexed repository search tools for the agent.
+
+The default ``Glob`` and ``Grep`` tools walk the workspace on every call,
+which is slow on large repositories. ``RepoIndex`` walks it once per check,
+recording every file's path and the words in each text file, and
+``search_server`` serves two in-process tools backed by the index:
+
+- ``find_files``: paths matching a glob or substring.
+- ``search_code``: lines matching a regular expression. The pattern's
+  literal parts are looked up in the index's vocabulary, and only files
+  with words containing all of them are read.
+
+A word index rather than a trigram index keeps the build to one regex pass
+per file, which matters more than lookup speed when the index lives for a
+single run.
+
+Results are ranked, shallow files and docs or manifests first, and the
+search stops after ``MAX_RESULTS`` lines, so a broad pattern costs the model
+a short list and a hint to narrow it rather than thousands of lines, and
+costs the host no more reading than it takes to find them. A pattern with
+no literal word to look up reads at most ``MAX_SCAN_FILES`` files. Files
+over ``MAX_FILE_BYTES`` are listed but never searched, and results say
+which were left out.
+
+``with_indexed_search`` in ``good_start.tiers`` swaps ``Glob`` and ``Grep``
+for these tools in a tier; the agent starts building the index when a run
+whose tier allows them begins. Inside ``index_once``, as around the tiers
+of one check, later runs reuse the index the first one built.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import threading
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from claude_agent_sdk import create_sdk_mcp_server, tool
+
+from good_start.discovery import LOCKFILES, MANIFESTS
+
+logger = logging.getLogger(__name__)
+
+SERVER_NAME = "repo"
+FIND_FILES_TOOL = f"mcp__{SERVER_NAME}__find_files"
+SEARCH_CODE_TOOL = f"mcp__{SERVER_NAME}__search_code"
+SEARCH_TOOLS = (FIND_FILES_TOOL, SEARCH_CODE_TOOL)
+
+# Most paths or matching lines returned by one call, matching lines shown
+# per file, and characters shown per line.
+MAX_RESULTS = 50
+MAX_PER_FILE = 10
+MAX_LINE_CHARS = 200
+# Larger files are listed by path but their contents are not indexed.
+MAX_FILE_BYTES = 1024**2
+# Files read for a pattern the index can't narrow, best ranked first.
+MAX_SCAN_FILES = 2000
+
+# Directories that hold generated or vendored files, never indexed.
+SKIP_DIRS = frozenset(
+    {
+        ".git",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+_DOC_SUFFIXES = (".md", ".rst", ".txt", ".adoc")
+_REGEX_SPECIAL = set(".^$*+?{}[]\\|()")
+# Escapes followed by a character code, and how many characters it takes.
+_CODE_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+
+# Large files named in a search's note about what it left out.
+_MAX_LARGE_NAMED = 3
+
+# Roots already indexed in the current ``index_once`` block. Context
+# variables follow asyncio tasks and asyncio.to_thread() workers, so every
+# run under the block sees the same set.
+_indexed_roots: ContextVar[set[Path] | None] = ContextVar(
+    "good_start_indexed_roots", default=None
+)
+
+
+# Words of ASCII letters, digits and underscores that the index records.
+# Shorter words are too common to narrow a search.
+_WORD = re.compile(rb"\w{3,}")
+
+
+def _rank(path: str) -> tuple[int, int, str]:
+    """Sort key: shallow paths first, docs and manifests ahead of the rest."""
+    name = path.rsplit("/", 1)[-1]
+    notable = name in MANIFESTS or name in LOCKFILES or name.endswith(_DOC_SUFFIXES)
+    return (path.count("/"), 0 if notable else 1, path)
+
+
+def _path_matches(path: str, pattern: str) -> bool:
+    """Match a glob against a relative path; plain text matches as a substring.
+
+    A glob without ``/`` matches the file name at any depth, like ``**/``.
+    """
+    if not any(c in pattern for c in "*?["):
+        return pattern.lower() in path.lower()
+    pattern = pattern.removeprefix("**/")
+    if "/" not in pattern:
+        return fnmatch(path.rsplit("/", 1)[-1], pattern)
+    return fnmatch(path, pattern.replace("**/", "*"))
+
+
+def literal_fragments(pattern: str) -> list[str]:
+    """Return substrings every match of the regular expression must contain.
+
+    Conservative: a pattern with alternation or a ``(?...)`` group yields
+    none, and characters made optional by a quantifier, the contents of
+    groups and escaped characters given by code (``\\x41``, ``\\N{...}``,
+    octal) are left out.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return []
+    fragments: list[str] = []
+    current: list[str] = []
+
+    def _cut() -> None:
+        if current:
+            fragments.append("".join(current))
+            current.clear()
+
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            i += 2
+            if nxt.isalnum():
+                # A class like \d or \s, an anchor like \b, or a character
+                # code or backreference, whose digits aren't literal.
+                _cut()
+                if nxt in _CODE_ESCAPES:
+                    i += _CODE_ESCAPES[nxt]
+                elif nxt == "N":
+                    i = pattern.find("}", i) + 1 or len(pattern)
+                elif nxt.isdigit():
+                    # Octal codes and group numbers have up to three digits.
+                    end = min(i + 2, len(pattern))
+                    while i < end and pattern[i].isdigit():
+                        i += 1
+            else:
+                current.append(nxt)
+            continue
+        if c in "*?{":
+            # The previous character may not appear at all.
+            if current:
+                current.pop()
+            _cut()
+            if c == "{":
+                i = pattern.find("}", i) + 1 or len(pattern)
+                continue
+        elif c == "[":
+            _cut()
+            i = pattern.find("]", i + 2) + 1 or len(pattern)
+            continue
+        elif c == "(":
+            _cut()
+            i = _group_end(pattern, i)
+            continue
+        elif c in _REGEX_SPECIAL:
+            _cut()
+        else:
+            current.append(c)
+        i += 1
+    _cut()
+    return [f for f in fragments if len(f) >= 3]
+
+
+def _group_end(pattern: str, start: int) -> int:
+    """Return the index just past the group opened at ``start``."""
+    depth = 0
+    i = start
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(pattern)
+
+
+class RepoIndex:
+    """File path and word index of a directory tree."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.paths: list[str] = []
+        # Lowercased word -> ids (into ``paths``) of files containing it.
+        self._postings: dict[bytes, array] = {}
+        # Ids of files whose contents were indexed, and of files too large
+        # to be.
+        self._indexed: set[int] = set()
+        self._large: set[int] = set()
+        self._vocabulary: bytes | None = None
+
+    @classmethod
+    def build(cls, root: str | Path) -> RepoIndex:
+        index = cls(root)
+        for rel in index._walk():
+            index.add(rel)
+        return index
+
+    def _walk(self) -> list[str]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = Path(dirpath).relative_to(self.root).as_posix()
+            rel_dir = "" if rel_dir == "." else rel_dir + "/"
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            found.extend(rel_dir + name for name in sorted(filenames))
+        return found
+
+    def add(self, rel: str) -> None:
+        """Index one file, given as a path relative to the root."""
+        file_id = len(self.paths)
+        self.paths.append(rel)
+        try:
+            path = self.root / rel
+            if path.stat().st_size > MAX_FILE_BYTES:
+                self._large.add(file_id)
+                return
+            data = path.read_bytes()
+        except OSError:
+            return
+        if b"\0" in data[:8192]:
+            return
+        self._indexed.add(file_id)
+        self._vocabulary = None
+        for word in set(_WORD.findall(data.lower())):
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = array("I")
+            posting.append(file_id)
+
+    def _files_containing(self, run: bytes) -> set[int]:
+        """Return ids of files with a word that contains ``run``."""
+        if self._vocabulary is None:
+            # One newline-separated string, so a single regex scan finds
+            # every word containing a substring.
+            self._vocabulary = b"\n".join(self._postings)
+        ids: set[int] = set()
+        for match in re.finditer(
+            rb"^.*" + re.escape(run) + rb".*$", self._vocabulary, re.MULTILINE
+        ):
+            ids.update(self._postings[match.group()])
+        return ids
+
+    def _candidates(self, fragments: list[str]) -> list[int] | None:
+        """Return ids of indexed files that may contain every fragment.
+
+        Returns None if no fragment has a word the index can look up.
+        """
+        runs = {
+            run
+            for fragment in fragments
+            for run in _WORD.findall(fragment.encode().lower())
+        }
+        if not runs:
+            return None
+        ids: set[int] | None = None
+        # The longest runs are the most selective.
+        for run in sorted(runs, key=len, reverse=True):
+            found = self._files_containing(run)
+            ids = found if ids is None else ids & found
+            if not ids:
+                break
+        return sorted(ids or ())
+
+    def find_files(self, pattern: str, limit: int = MAX_RESULTS) -> str:
+        """Return the paths matching ``pattern``, best first, one per line."""
+        matches = sorted(
+            (p for p in self.paths if _path_matches(p, pattern)), key=_rank
+        )
+        if not matches:
+            return f"No files match {pattern!r}."
+        lines = matches[:limit]
+        if len(matches) > limit:
+            lines.append(
+                f"... {len(matches) - limit} more files; narrow the pattern to see them."
+            )
+        return "\n".join(lines)
+
+    def search(
+        self,
+        pattern: str,
+        glob: str | None = None,
+        ignore_case: bool = False,
+        limit: int = MAX_RESULTS,
+    ) -> str:
+        """Return ``path:line: text`` for lines matching ``pattern``, best first.
+
+        Stops once ``limit`` lines are found, so the total isn't counted.
+        Files too large to index are not read; a note names them instead.
+        Raises ``re.error`` for an invalid pattern.
+        """
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        fragments = literal_fragments(pattern)
+        if ignore_case:
+            # The index folds ASCII case only.
+            fragments = [f for f in fragments if f.isascii()]
+        candidates = self._candidates(fragments)
+        ids = [
+            i
+            for i in (sorted(self._indexed) if candidates is None else candidates)
+            if glob is None or _path_matches(self.paths[i], glob)
+        ]
+        ranked = sorted((self.paths[i] for i in ids), key=_rank)
+        # Without a word to look up, every file would have to be read.
+        skipped = len(ranked) - MAX_SCAN_FILES if candidates is None else 0
+        if skipped > 0:
+            ranked = ranked[:MAX_SCAN_FILES]
+
+        lines: list[str] = []
+        more = False
+        for rel in ranked:
+            if len(lines) >= limit:
+                more = True
+                break
+            try:
+                text = (self.root / rel).read_text(errors="replace")
+            except OSError:
+                continue
+            shown = 0
+            for number, line in enumerate(text.splitlines(), start=1):
+                if not regex.search(line):
+                    continue
+                if shown == MAX_PER_FILE or len(lines) >= limit:
+                    more = True
+                    break
+                lines.append(f"{rel}:{number}: {line.strip()[:MAX_LINE_CHARS]}")
+                shown += 1
+
+        if not lines:
+            lines.append(f"No matches for {pattern!r}.")
+        elif more:
+            lines.append(
+                f"... {len(lines)} matches shown, and there may be more; "
+                "narrow the pattern or glob to see the rest."
+            )
+        if skipped > 0:
+            lines.append(
+                f"... searched only the first {MAX_SCAN_FILES} files, since the "
+                f"pattern has no word of 3+ letters to look up ({skipped} files "
+                "skipped); add one or a glob to search everything."
+            )
+        large = sorted(
+            (
+                self.paths[i]
+                for i in self._large
+                if glob is None or _path_matches(self.paths[i], glob)
+            ),
+            key=_rank,
+        )
+        if large:
+            named = ", ".join(large[:_MAX_LARGE_NAMED])
+            if len(large) > _MAX_LARGE_NAMED:
+                named += ", ..."
+            lines.append(
+                f"... {len(large)} files too large to index were not searched "
+                f"({named}); use Bash grep if they matter."
+            )
+        return "\n".join(lines)
+
+
+class SearchServer:
+    """In-process MCP server whose tools search the latest index of ``root``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._index: Future[RepoIndex] | None = None
+        self.config = create_sdk_mcp_server(
+            SERVER_NAME, tools=[self._find_files_tool(), self._search_code_tool()]
+        )
+
+    def refresh(self) -> None:
+        """Start indexing the tree in the background, unless already underway.
+
+        Inside ``index_once``, an index this block already built is kept.
+        """
+        roots = _indexed_roots.get()
+        with self._lock:
+            index = self._index
+            if index is not None and not index.done():
+                return
+            # A failed build is retried rather than kept.
+            reusable = index is not None and index.exception() is None
+            if reusable and roots is not None and self.root in roots:
+                return
+            future: Future[RepoIndex] = Future()
+            self._index = future
+            if roots is not None:
+                roots.add(self.root)
+            future: Future[RepoIndex] = Future()
+            self._index = future
+
+        def _build() -> None:
+            try:
+                future.set_result(RepoIndex.build(self.root))
+            except Exception as exc:
+                # Tool calls waiting on the index get the error.
+                logger.exception("Indexing %s failed", self.root)
+                future.set_exception(exc)
+
+        threading.Thread(target=_build, name="good-start-index", daemon=True).start()
+
+    async def index(self) -> RepoIndex:
+        """Return the index, waiting for a build in progress."""
+        if self._index is None:
+            self.refresh()
+        assert self._index is not None
+        return await asyncio.wrap_future(self._index)
+
+    def _find_files_tool(self) -> Any:
+        @tool(
+            "find_files",
+            "Find files in the repository by glob (e.g. '*.md', 'docs/*.rst') or "
+            "by a substring of the path. Uses a prebuilt index, so prefer it to "
+            f"Bash find or ls. Returns at most {MAX_RESULTS} paths, "
+            "top-level files and docs first.",
+            {
+                "type": "object",
+                "properties": {
+                    "pattern": {
+                        "type": "string",
+                        "description": "Glob or path substring",
+                    }
+                },
+                "required": ["pattern"],
+            },
+        )
+        async def find_files(args: dict[str, Any]) -> dict[str, Any]:
+            index = await self.index()
+            text = await asyncio.to_thread(index.find_files, args["pattern"])
+            return {"content": [{"type": "text", "text": text}]}
+
+        return find_files
+
+    def _search_code_tool(self) -> Any:
+        @tool(
+            "search_code",
+            "Search file contents in the repository with a regular expression. "
+            "Uses a prebuilt index, so prefer it to Bash grep. Returns at most "
+            f"{MAX_RESULTS} matching lines as path:line: text, top-level files "
+            "and docs first.",
+            {
+                "type": "object",
+                "properties": {
+                    "pattern": {
+                        "type": "string",
+                        "description": "Python regular expression",
+                    },
+                    "glob": {
+                        "type": "string",
+                        "description": "Only search files matching this glob",
+                    },
+                    "ignore_case": {"type": "boolean"},
+                },
+                "required": ["pattern"],
+            },
+        )
+        async def search_code(args: dict[str, Any]) -> dict[str, Any]:
+            index = await self.index()
+            try:
+                text = await asyncio.to_thread(
+                    index.search,
+                    args["pattern"],
+                    args.get("glob"),
+                    bool(args.get("ignore_case")),
+                )
+            except re.error as exc:
+                return {
+                    "content": [{"type": "text", "text": f"Invalid pattern: {exc}"}],
+                    "is_error": True,
+                }
+            return {"content": [{"type": "text", "text": text}]}
+
+        return search_code
+
+
+@contextmanager
+def index_once() -> Iterator[None]:
+    """Index each root at most once for the runs inside the block.
+
+    Wrap one check's tiers in it, so a later tier searches the index the
+    first one built rather than walking the tree again.
+    """
+    token = _indexed_roots.set(set())
+    try:
+        yield
+    finally:
+        _indexed_roots.reset(token)
+
+
+# One server per root, shared process-wide so pooled sessions, which are
+# keyed by their options, keep seeing the same server.
+_servers: dict[Path, SearchServer] = {}
+_servers_lock = threading.Lock()
+
+
+def search_server(root: str | Path = ".") -> SearchServer:
+    """Return the shared search server for ``root``."""
+    root = Path(root).resolve()
+    with _servers_lock:
+        if root not in _servers:
+            _servers[root] = SearchServer(root)
+        return _servers[root]
@@ -0,0 +1,171 @@
+"""Split install docs into independent sections and check them in parallel.
+
+Docs that offer several install paths (pip, conda, Homebrew, from source)
+are split by heading into one section per path. Each section is checked in
+its own run at the same time and the results are combined into one Result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from good_start.discovery import prompt_context
+from good_start.loader import Prompt
+from good_start.result import AgentFindings, AgentStep, Result
+from good_start.runtime import Runtime
+from good_start.tiers import Tier, run_tiered
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+# Words that mark a heading as one install path among several.
+_INSTALL_KEYWORDS = (
+    "install",
+    "pip",
+    "uv",
+    "conda",
+    "mamba",
+    "homebrew",
+    "brew",
+    "apt",
+    "yum",
+    "dnf",
+    "source",
+    "docker",
+    "npm",
+    "cargo",
+    "binary",
+    "windows",
+    "macos",
+    "linux",
+)
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    level: int
+    text: str
+
+
+def _headings(text: str) -> list[tuple[int, int, str]]:
+    """Return (line index, level, title) for headings outside code fences."""
+    found = []
+    in_fence = False
+    for i, line in enumerate(text.splitlines()):
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = _HEADING_RE.match(line)
+        if match:
+            found.append((i, len(match.group(1)), match.group(2)))
+    return found
+
+
+def _is_install_heading(title: str) -> bool:
+    words = re.findall(r"[a-z]+", title.lower())
+    return any(word in _INSTALL_KEYWORDS for word in words)
+
+
+def split_install_sections(text: str) -> list[Section]:
+    """Return the independent install sections of a markdown document.
+
+    Picks the shallowest heading level with at least two install-looking
+    headings, and returns one Section per heading at that level. Returns an
+    empty list when the document doesn't offer alternative install paths.
+    """
+    headings = _headings(text)
+    lines = text.splitlines()
+    for level in range(1, 7):
+        at_level = [(i, title) for i, lvl, title in headings if lvl == level]
+        matching = [(i, title) for i, title in at_level if _is_install_heading(title)]
+        if len(matching) < 2:
+            continue
+
+        sections = []
+        for i, title in matching:
+            # A section runs until the next heading at this level or above.
+            end = next(
+                (j for j, lvl, _ in headings if j > i and lvl <= level), len(lines)
+            )
+            body = "\n".join(lines[i:end]).strip()
+            sections.append(Section(title=title, level=level, text=body))
+        return sections
+    return []
+
+
+def combine_section_results(
+    sections: list[Section], results: list[Result | BaseException]
+) -> Result:
+    """Merge per-section results into one Result.
+
+    The combined result passes only if every section passed. ``details``
+    lists each section's pass/fail status followed by its findings.
+    """
+    lines = []
+    steps: list[AgentStep] = []
+    verification = None
+    num_passed = 0
+    durations: list[float] = []
+    costs: list[float] = []
+    usage: dict[str, int] = {}
+    for section, result in zip(sections, results, strict=True):
+        if isinstance(result, BaseException):
+            lines.append(f"- {section.title}: FAILED\n  Error: {result}")
+            continue
+        if result.duration is not None:
+            durations.append(result.duration)
+        if result.cost_usd is not None:
+            costs.append(result.cost_usd)
+        for key, value in result.usage.items():
+            usage[key] = usage.get(key, 0) + value
+        if result.passed:
+            num_passed += 1
+        status = "PASSED" if result.passed else "FAILED"
+        lines.append(f"- {section.title}: {status}\n  {result.details}")
+        steps.extend(result.steps)
+        verification = verification or result.verification_command
+
+    summary = f"{num_passed} of {len(sections)} install sections passed."
+    findings = AgentFindings(
+        passed=num_passed == len(sections),
+        details=summary + "\n\n" + "\n".join(lines),
+        steps=steps,
+        verification_command=verification,
+    )
+    combined = Result(agent_messages=[], agent_result=findings)
+    # Sections run concurrently: the slowest one sets the wall time.
+    combined.duration = max(durations, default=None)
+    combined.cost_usd = sum(costs) if costs else None
+    combined.usage = usage
+    return combined
+
+
+async def run_sections(
+    runtime: Runtime,
+    prompt: Prompt,
+    target: str,
+    sections: list[Section],
+    tiers: list[Tier] | None = None,
+    on_tool_use_for: Callable[[str], Callable[[str, dict], None]] | None = None,
+) -> Result:
+    """Check each section of ``target`` concurrently and combine the results.
+
+    With ``tiers``, each section escalates through them independently.
+    ``on_tool_use_for`` returns the tool-event callback for a section title.
+    """
+    runs = []
+    for section in sections:
+        rendered = prompt.render(**prompt_context(target), section=section.title)
+        on_tool_use = on_tool_use_for(section.title) if on_tool_use_for else None
+        if tiers:
+            runs.append(run_tiered(runtime, rendered, target, tiers, on_tool_use))
+        else:
+            runs.append(runtime.run(rendered, target, on_tool_use=on_tool_use))
+    results = await asyncio.gather(*runs, return_exceptions=True)
+    return combine_section_results(sections, results)
@@ -0,0 +1,367 @@
+"""Long-lived good-start daemon and its thin client.
+
+``good-start serve`` listens on a local Unix socket and runs check jobs from
+a priority queue with a fixed pool of workers. Runtimes are cached per set
+of runtime options, so engine detection and the image inspect happen once
+per daemon instead of once per check, and ``--no-container`` jobs share a
+pool of persistent SDK clients.
+
+The wire protocol is newline-delimited JSON. A client sends one request
+line and reads response lines until the connection closes:
+
+    -> {"type": "check", "prompt": ..., "target": ..., "cwd": ..., "priority": 0,
+        "options": {...}, "tier": {...} | null}
+    <- {"type": "queued", "position": 1}
+    <- {"type": "event", "tool": "Bash", "input": {...}}
+    <- {"type": "result", "findings": {...}, "duration": 12.3, "cost_usd": ..., "usage": {...}}
+
+    -> {"type": "status"}
+    <- {"type": "status", "queued": 0, "running": 1, "completed": 7}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from good_start.result import AgentFindings, Result
+from good_start.runtime import ResourceUsage, Runtime, resolve_runtime
+from good_start.session import get_session_pool
+from good_start.tiers import Tier
+
+logger = logging.getLogger(__name__)
+
+# Runtime options a client may set per job. Anything else is ignored.
+RUNTIME_OPTIONS = (
+    "no_container",
+    "stage",
+    "include",
+    "exclude",
+    "default_excludes",
+    "cpus",
+    "memory",
+    "endpoints",
+)
+
+# Lines can carry a rendered prompt or a large findings payload.
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def default_socket_path() -> Path:
+    """Return the per-user default socket path for the daemon."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / f"good-start-{os.getuid()}.sock"
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    prompt: str = field(compare=False)
+    target: str = field(compare=False)
+    options: dict[str, Any] = field(compare=False)
+    tier: Tier | None = field(compare=False)
+    events: asyncio.Queue[dict[str, Any]] = field(compare=False)
+
+
+class Server:
+    """Priority job queue that runs checks on cached runtimes."""
+
+    def __init__(
+        self,
+        socket_path: str | Path | None = None,
+        workers: int = 2,
+        verbose: bool = False,
+        runtime_factory: Callable[..., Runtime] = resolve_runtime,
+    ) -> None:
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.workers = workers
+        self.verbose = verbose
+        self._runtime_factory = runtime_factory
+        self._runtimes: dict[str, Runtime] = {}
+        self._queue: asyncio.PriorityQueue[_Job] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self.running = 0
+        self.completed = 0
+
+    def _runtime(self, options: dict[str, Any]) -> Runtime:
+        key = json.dumps(options, sort_keys=True)
+        runtime = self._runtimes.get(key)
+        if runtime is None:
+            kwargs = dict(options)
+            if options.get("no_container"):
+                # Local checks share persistent SDK clients across jobs.
+                kwargs["reuse_sessions"] = True
+            runtime = self._runtime_factory(verbose=self.verbose, **kwargs)
+            self._runtimes[key] = runtime
+        return runtime
+
+    async def serve_forever(self) -> None:
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        server = await asyncio.start_unix_server(
+            self._handle, path=str(self.socket_path), limit=_STREAM_LIMIT
+        )
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in workers:
+                task.cancel()
+            await get_session_pool().close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+
+            # Container runtimes report events from a worker thread.
+            def _on_tool_use(name: str, tool_input: dict, job: _Job = job) -> None:
+                message = {"type": "event", "tool": name, "input": tool_input}
+                loop.call_soon_threadsafe(job.events.put_nowait, message)
+
+            try:
+                runtime = self._runtime(job.options)
+                result = await runtime.run(
+                    job.prompt, job.target, on_tool_use=_on_tool_use, tier=job.tier
+                )
+                message = {
+                    "type": "result",
+                    "findings": result.to_findings().model_dump(mode="json"),
+                    "duration": result.duration,
+                    "cost_usd": result.cost_usd,
+                    "usage": result.usage,
+                    "resources": result.resources.to_dict()
+                    if result.resources
+                    else None,
+                }
+            except Exception as exc:
+                # Any failure goes back to the client; the daemon keeps serving.
+                logger.exception("Check of %s failed", job.target)
+                message = {"type": "error", "message": str(exc)}
+            finally:
+                self.running -= 1
+                self.completed += 1
+                self._queue.task_done()
+            # Let any events scheduled from the runtime thread land first.
+            loop.call_soon(job.events.put_nowait, message)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            line = await reader.readline()
+            request = json.loads(line) if line else {}
+            if not isinstance(request, dict):
+                await _send(
+                    writer,
+                    {"type": "error", "message": "Request must be a JSON object."},
+                )
+                return
+            kind = request.get("type")
+            if kind == "status":
+                await _send(
+                    writer,
+                    {
+                        "type": "status",
+                        "queued": self._queue.qsize(),
+                        "running": self.running,
+                        "completed": self.completed,
+                    },
+                )
+            elif kind == "check":
+                await self._handle_check(request, writer)
+            else:
+                await _send(
+                    writer, {"type": "error", "message": f"Unknown request: {kind!r}"}
+                )
+        except (json.JSONDecodeError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_check(
+        self, request: dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        problem = _check_request_error(request)
+        if problem is None:
+            try:
+                tier = Tier.from_dict(request["tier"]) if request.get("tier") else None
+            except (KeyError, TypeError, ValueError) as exc:
+                problem = f"Invalid tier: {exc}"
+        if problem is not None:
+            await _send(writer, {"type": "error", "message": problem})
+            return
+        options = {
+            key: value
+            for key, value in (request.get("options") or {}).items()
+            if key in RUNTIME_OPTIONS
+        }
+        if options.get("no_container"):
+            # Local checks run in the client's directory, which the prompt's
+            # paths are relative to, not in the daemon's.
+            options["cwd"] = request.get("cwd") or _target_dir(
+                request.get("target", ".")
+            )
+        job = _Job(
+            priority=int(request.get("priority", 0)),
+            seq=next(self._seq),
+            prompt=request["prompt"],
+            target=request.get("target", "."),
+            options=options,
+            tier=tier,
+            events=asyncio.Queue(),
+        )
+        await self._queue.put(job)
+        await _send(writer, {"type": "queued", "position": self._queue.qsize()})
+        while True:
+            message = await job.events.get()
+            await _send(writer, message)
+            if message["type"] in ("result", "error"):
+                break
+
+
+def _check_request_error(request: dict[str, Any]) -> str | None:
+    """Return what is wrong with a check request, or None if it is usable."""
+    if not isinstance(request.get("prompt"), str):
+        return "Check request needs a string 'prompt'."
+    for key, kind in (("target", str), ("cwd", str), ("options", dict)):
+        value = request.get(key)
+        if value is not None and not isinstance(value, kind):
+            return f"Check request field {key!r} must be a {kind.__name__}."
+    tier = request.get("tier")
+    if tier is not None and not isinstance(tier, dict):
+        return "Check request field 'tier' must be an object."
+    priority = request.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        return "Check request field 'priority' must be an integer."
+    return None
+
+
+def _target_dir(target: str) -> str:
+    path = Path(target)
+    return str(path.parent if path.is_file() else path)
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def _request(socket_path: str | Path, request: dict[str, Any]):
+    try:
+        reader, writer = await asyncio.open_unix_connection(
+            str(socket_path), limit=_STREAM_LIMIT
+        )
+    except (FileNotFoundError, ConnectionRefusedError) as exc:
+        raise RuntimeError(
+            f"No good-start server is listening on {socket_path}. "
+            "Start one with `good-start serve`."
+        ) from exc
+    await _send(writer, request)
+    return reader, writer
+
+
+async def submit_check(
+    prompt: str,
+    target: str,
+    options: dict[str, Any] | None = None,
+    priority: int = 0,
+    socket_path: str | Path | None = None,
+    on_tool_use: Callable[[str, dict], None] | None = None,
+    tier: Tier | None = None,
+) -> Result:
+    """Submit a check to a running daemon and wait for its Result.
+
+    ``target`` is resolved against the caller's working directory, since
+    the daemon's own working directory is unrelated; local checks run in
+    the caller's working directory for the same reason.
+    """
+    request = {
+        "type": "check",
+        "prompt": prompt,
+        "target": str(Path(target).resolve()),
+        "cwd": str(Path.cwd()),
+        "priority": priority,
+        "options": options or {},
+        "tier": tier.to_dict() if tier is not None else None,
+    }
+    reader, writer = await _request(socket_path or default_socket_path(), request)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise RuntimeError("good-start server closed the connection.")
+            message = json.loads(line)
+            kind = message.get("type")
+            if kind == "event" and on_tool_use is not None:
+                on_tool_use(message["tool"], message["input"])
+            elif kind == "result":
+                findings = AgentFindings.model_validate(message["findings"])
+                result = Result(agent_messages=[], agent_result=findings)
+                result.duration = message.get("duration")
+                result.cost_usd = message.get("cost_usd")
+                result.usage = message.get("usage") or {}
+                if message.get("resources"):
+                    result.resources = ResourceUsage.from_dict(message["resources"])
+                return result
+            elif kind == "error":
+                raise RuntimeError(message["message"])
+    finally:
+        writer.close()
+
+
+class ServerRuntime:
+    """Runtime that delegates checks to a running daemon."""
+
+    def __init__(
+        self,
+        options: dict[str, Any] | None = None,
+        priority: int = 0,
+        socket_path: str | Path | None = None,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+    ) -> None:
+        self._options = options
+        self._priority = priority
+        self._socket_path = socket_path
+        self._on_tool_use = on_tool_use
+
+    async def run(
+        self,
+        prompt: str,
+        target: str,
+        on_tool_use: Callable[[str, dict], None] | None = None,
+        tier: Tier | None = None,
+    ) -> Result:
+        return await submit_check(
+            prompt,
+            target,
+            options=self._options,
+            priority=self._priority,
+            socket_path=self._socket_path,
+            on_tool_use=on_tool_use or self._on_tool_use,
+            tier=tier,
+        )
+
+
+async def server_status(socket_path: str | Path | None = None) -> dict[str, Any]:
+    """Return the daemon's queue depth and job counters."""
+    reader, writer = await _request(
+        socket_path or default_socket_path(), {"type": "status"}
+    )
+    try:
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
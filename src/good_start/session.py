@@ -0,0 +1,205 @@
+"""Pool of pre-connected Claude SDK clients.
+
+The one-shot ``query()`` starts a fresh Claude CLI subprocess for every
+check. A ``SessionPool`` instead keeps a spare ``ClaudeSDKClient`` connected
+ahead of time, so a check starts on a CLI process that is already running.
+Each client serves exactly one check and is then disconnected, so no
+conversation, tool or shell state carries over from one check to the next;
+taking a spare starts connecting its replacement.
+
+The SDK requires a client to be connected and disconnected from the same
+task, so each pooled client lives in its own worker task and receives its
+prompt through a queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from claude_agent_sdk import (
+    ClaudeAgentOptions,
+    ClaudeSDKClient,
+    ClaudeSDKError,
+    Message,
+)
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# Failures a client can hit talking to its CLI process; these are handed
+# to the check that was running instead of crashing the worker task.
+_CLIENT_ERRORS = (ClaudeSDKError, OSError)
+
+
+class _Session:
+    """One connected client that serves a single prompt, then disconnects."""
+
+    def __init__(
+        self,
+        key: str,
+        options: ClaudeAgentOptions,
+        client_factory: Callable[[ClaudeAgentOptions], Any],
+    ) -> None:
+        self.key = key
+        self.inbox: asyncio.Queue[tuple[str, asyncio.Queue[Any]] | None] = (
+            asyncio.Queue()
+        )
+        self.alive = True
+        self.client: Any = None
+        self.task = asyncio.create_task(self._serve(options, client_factory))
+
+    async def interrupt(self) -> None:
+        """Ask the client to stop the response it is currently producing."""
+        if self.client is None:
+            return
+        try:
+            await self.client.interrupt()
+        except _CLIENT_ERRORS as exc:
+            # The check is being abandoned either way; the client is retired
+            # once its response ends or its connection drops.
+            logger.debug("Interrupting SDK client failed: %s", exc)
+
+    async def _serve(
+        self,
+        options: ClaudeAgentOptions,
+        client_factory: Callable[[ClaudeAgentOptions], Any],
+    ) -> None:
+        error: Exception | None = None
+        out: asyncio.Queue[Any] | None = None
+        try:
+            async with client_factory(options) as client:
+                self.client = client
+                item = await self.inbox.get()
+                if item is None:
+                    return
+                prompt, out = item
+                try:
+                    await client.query(prompt)
+                    async for message in client.receive_response():
+                        out.put_nowait(message)
+                except _CLIENT_ERRORS as exc:
+                    out.put_nowait(exc)
+                else:
+                    out.put_nowait(_DONE)
+                out = None
+        except _CLIENT_ERRORS as exc:
+            error = exc
+        except Exception as exc:
+            logger.exception("SDK client session failed")
+            error = exc
+        finally:
+            self.alive = False
+            # Fail the running check and anything still queued so callers
+            # don't wait forever.
+            error = error or RuntimeError("SDK session closed.")
+            if out is not None:
+                out.put_nowait(error)
+            while not self.inbox.empty():
+                item = self.inbox.get_nowait()
+                if item is not None:
+                    item[1].put_nowait(error)
+
+    def close(self) -> None:
+        """Disconnect once idle; a running prompt is finished first."""
+        self.inbox.put_nowait(None)
+
+
+class SessionPool:
+    """Keeps up to ``size`` spare SDK clients connected for upcoming checks.
+
+    Spares are kept per set of options, since a client's options are fixed
+    when it connects. Concurrency is left to the caller: every check gets
+    its own client, and a check with no spare ready connects one itself.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        client_factory: Callable[[ClaudeAgentOptions], Any] = ClaudeSDKClient,
+    ) -> None:
+        self.size = size
+        self._client_factory = client_factory
+        self._sessions: list[_Session] = []
+        self._idle: list[_Session] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def connections(self) -> int:
+        return sum(1 for s in self._sessions if s.alive)
+
+    def _check_loop(self) -> None:
+        # Sessions are tasks on one event loop; a new loop starts a new pool.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._sessions = []
+            self._idle = []
+        self._sessions = [s for s in self._sessions if s.alive]
+        self._idle = [s for s in self._idle if s.alive]
+
+    def _start(self, key: str, options: ClaudeAgentOptions) -> _Session:
+        session = _Session(key, options, self._client_factory)
+        self._sessions.append(session)
+        return session
+
+    def _acquire(self, options: ClaudeAgentOptions) -> _Session:
+        key = repr(options)
+        self._check_loop()
+        session = next((s for s in self._idle if s.key == key), None)
+        if session is not None:
+            self._idle.remove(session)
+        else:
+            session = self._start(key, options)
+        # Connect the next check's client while this one runs.
+        if self.size > 0:
+            while len(self._idle) >= self.size:
+                self._idle.pop(0).close()
+            self._idle.append(self._start(key, options))
+        return session
+
+    async def stream(
+        self, prompt: str, options: ClaudeAgentOptions
+    ) -> AsyncIterator[Message]:
+        """Run ``prompt`` on a fresh client, yielding messages like ``query()``."""
+        session = self._acquire(options)
+        out: asyncio.Queue[Any] = asyncio.Queue()
+        session.inbox.put_nowait((prompt, out))
+        finished = False
+        try:
+            while True:
+                item = await out.get()
+                if item is _DONE:
+                    finished = True
+                    return
+                if isinstance(item, Exception):
+                    finished = True
+                    raise item
+                yield item
+        finally:
+            if not finished:
+                # The caller stopped early (e.g. an abort rule fired): stop
+                # the agent. The client drains the rest of the response and
+                # then disconnects.
+                await session.interrupt()
+
+    async def close(self) -> None:
+        """Disconnect every client in the pool."""
+        sessions, self._sessions, self._idle = self._sessions, [], []
+        for session in sessions:
+            session.close()
+        await asyncio.gather(*(s.task for s in sessions), return_exceptions=True)
+
+
+_shared: SessionPool | None = None
+
+
+def get_session_pool() -> SessionPool:
+    """Return the process-wide session pool."""
+    global _shared
+    if _shared is None:
+        _shared = SessionPool()
+    return _shared
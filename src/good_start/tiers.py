@@ -0,0 +1,157 @@
+"""Tiered execution: a cheap smoke pass first, the full agent on escalation.
+
+Most docs either work or fail in an obvious way, which a faster model with
+a tight turn budget can establish. With a tiered policy the smoke tier runs
+first; only if it does not pass does the full tier run, with a summary of
+the smoke pass's steps and findings appended to its prompt as a head start.
+Each tier runs in a fresh runtime invocation, so nothing the smoke pass
+installed leaks into the full run's environment.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from good_start.result import Result
+from good_start.search import FIND_FILES_TOOL, SEARCH_CODE_TOOL, index_once
+
+if TYPE_CHECKING:
+    from good_start.runtime import Runtime
+
+DEFAULT_TOOLS = ("Bash", "Glob", "Grep", "Read")
+# Indexed replacements for the default tools that rescan the workspace.
+INDEXED_TOOLS = {"Glob": FIND_FILES_TOOL, "Grep": SEARCH_CODE_TOOL}
+
+# How many of the smoke pass's steps to pass on, and how much of each output.
+_CONTEXT_STEPS = 30
+_CONTEXT_OUTPUT_CHARS = 300
+
+
+@dataclass(frozen=True)
+class Tier:
+    """Model, turn budget and tools for one pass of the agent."""
+
+    name: str
+    model: str | None = None
+    max_turns: int | None = None
+    allowed_tools: tuple[str, ...] = field(default=DEFAULT_TOOLS)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Tier:
+        return cls(**{**data, "allowed_tools": tuple(data["allowed_tools"])})
+
+
+SMOKE_TIER = Tier("smoke", model="haiku", max_turns=15, allowed_tools=("Bash", "Read"))
+FULL_TIER = Tier("full")
+
+
+def with_indexed_search(tier: Tier) -> Tier:
+    """Return ``tier`` with ``Glob`` and ``Grep`` served from a repository index."""
+    return replace(
+        tier,
+        allowed_tools=tuple(INDEXED_TOOLS.get(t, t) for t in tier.allowed_tools),
+    )
+
+
+def tier_policy(
+    tiered: bool,
+    smoke_model: str | None = None,
+    smoke_max_turns: int | None = None,
+    indexed_search: bool = False,
+) -> list[Tier]:
+    """Return the tiers to run, in order, for the given settings."""
+    if not tiered:
+        tiers = [FULL_TIER]
+    else:
+        smoke = SMOKE_TIER
+        if smoke_model:
+            smoke = replace(smoke, model=smoke_model)
+        if smoke_max_turns:
+            smoke = replace(smoke, max_turns=smoke_max_turns)
+        tiers = [smoke, FULL_TIER]
+    if indexed_search:
+        tiers = [with_indexed_search(tier) for tier in tiers]
+    return tiers
+
+
+def escalation_context(tier: Tier, result: Result) -> str:
+    """Summarize an earlier tier's attempt for the next tier's prompt."""
+    lines = [
+        "",
+        "",
+        f"## Earlier attempt ({tier.name} pass)",
+        "",
+        (
+            "A quick first pass with a smaller budget did not confirm that the "
+            "instructions work. Its findings were:"
+        ),
+        "",
+        result.details.strip(),
+    ]
+    steps = result.steps[-_CONTEXT_STEPS:]
+    if steps:
+        lines += ["", "Steps it ran, in order:"]
+        for step in steps:
+            output = step.output.strip()
+            if len(output) > _CONTEXT_OUTPUT_CHARS:
+                output = "..." + output[-_CONTEXT_OUTPUT_CHARS:]
+            status = " (error)" if step.is_error else ""
+            lines.append(f"- {step.tool}{status}: {step.input}")
+            if output:
+                lines.append(f"  {output}")
+    lines += [
+        "",
+        (
+            "Use this as a head start, but start from a clean environment and "
+            "verify every step yourself; the earlier pass may have stopped "
+            "early or been wrong."
+        ),
+    ]
+    return "\n".join(lines)
+
+
+async def run_tiered(
+    runtime: Runtime,
+    prompt: str,
+    target: str,
+    tiers: list[Tier],
+    on_tool_use: Callable[[str, dict], None] | None = None,
+) -> Result:
+    """Run ``tiers`` in order until one passes or the last one finishes.
+
+    The returned Result is the deciding tier's, with ``tier`` set to its
+    name and duration, cost and token usage summed over every tier run.
+    A single-tier policy leaves ``tier`` unset, as an untiered run does.
+    Tiers that run in this process share one search index.
+    """
+    spent: list[Result] = []
+    previous: tuple[Tier, Result] | None = None
+    with index_once():
+        for i, tier in enumerate(tiers):
+            text = (
+                prompt if previous is None else prompt + escalation_context(*previous)
+            )
+            result = await runtime.run(text, target, on_tool_use=on_tool_use, tier=tier)
+            spent.append(result)
+            if result.passed or i == len(tiers) - 1:
+                break
+            previous = (tier, result)
+
+    if len(tiers) > 1:
+        result.tier = tier.name
+    if len(spent) > 1:
+        durations = [r.duration for r in spent if r.duration is not None]
+        costs = [r.cost_usd for r in spent if r.cost_usd is not None]
+        usage: dict[str, int] = {}
+        for r in spent:
+            for key, value in r.usage.items():
+                usage[key] = usage.get(key, 0) + value
+        result.duration = sum(durations) if durations else None
+        result.cost_usd = sum(costs) if costs else None
+        result.usage = usage
+    return result
@@ -0,0 +1,250 @@
+"""Opt-in tracing of check runs, exported as OTLP JSON.
+
+``tracing(path)`` collects spans for the duration of the block and appends
+each finished trace to ``path`` as one line of OTLP/JSON (an
+``ExportTraceServiceRequest``), the format the OpenTelemetry Collector's
+``file`` exporter writes and its ``otlpjsonfile`` receiver reads. Load the
+file into a collector to forward traces to any tracing UI.
+
+Spans are opened with ``span(name, **attributes)``. The current span lives
+in a context variable, so spans nest across ``await`` and
+``asyncio.to_thread()`` without being passed around. Outside ``tracing()``
+spans are still created, which keeps call sites simple, but never exported.
+
+ContainerRuntime passes the current span into the container as a W3C
+``TRACEPARENT`` variable. The entrypoint continues the trace from it and
+prints each finished span as a ``{"span": ...}`` line on stderr, which the
+host adds to its own trace.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TextIO
+
+# OTLP status codes.
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+class Span:
+    """One timed operation in a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+        attributes: dict | None = None,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = {k: v for k, v in (attributes or {}).items() if v is not None}
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: object) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.error = message
+
+    def end(self) -> None:
+        """Finish the span and export it; later calls do nothing."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        exporter = _exporter.get()
+        if exporter is not None:
+            exporter.export(self)
+
+    def traceparent(self) -> str:
+        """Return this span's context as a W3C ``traceparent`` header."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": _STATUS_ERROR, "message": self.error}
+                if self.error is not None
+                else {"code": _STATUS_OK}
+            ),
+        }
+
+
+def _otlp_value(value: object) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class FileExporter:
+    """Buffers spans per trace and appends each trace to a file when it ends.
+
+    A trace ends when its local root span (one without a parent) does;
+    traces still open when the exporter closes are written then.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._traces: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        self.ingest(span.to_otlp())
+        if span.parent_id is None:
+            self._flush(span.trace_id)
+
+    def ingest(self, data: dict) -> None:
+        """Add an OTLP span, e.g. one reported by the container."""
+        with self._lock:
+            self._traces.setdefault(data["traceId"], []).append(data)
+
+    def close(self) -> None:
+        for trace_id in list(self._traces):
+            self._flush(trace_id)
+
+    def _flush(self, trace_id: str) -> None:
+        with self._lock:
+            spans = self._traces.pop(trace_id, [])
+            if not spans:
+                return
+            request = {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": "good-start"},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {"scope": {"name": "good_start"}, "spans": spans}
+                        ],
+                    }
+                ]
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(request) + "\n")
+
+
+class StreamExporter:
+    """Writes each finished span as a ``{"span": ...}`` line to a stream."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def export(self, span: Span) -> None:
+        print(json.dumps({"span": span.to_otlp()}), file=self.stream, flush=True)
+
+    def ingest(self, data: dict) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# (trace ID, span ID) of the current span, which may live in another process.
+_parent: ContextVar[tuple[str, str] | None] = ContextVar(
+    "good_start_trace_parent", default=None
+)
+_exporter: ContextVar[FileExporter | StreamExporter | None] = ContextVar(
+    "good_start_trace_exporter", default=None
+)
+
+
+def active() -> bool:
+    """Return True if spans are being exported."""
+    return _exporter.get() is not None
+
+
+def start_span(name: str, **attributes: object) -> Span:
+    """Start a span under the current one without making it current.
+
+    For operations that begin and end in different places, such as a tool
+    call and its result. Call ``end()`` on the span when it's done.
+    """
+    parent = _parent.get()
+    if parent is None:
+        return Span(name, attributes=attributes)
+    return Span(name, trace_id=parent[0], parent_id=parent[1], attributes=attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: object) -> Iterator[Span]:
+    """Run the block in a new span, recording any exception as an error."""
+    current = start_span(name, **attributes)
+    token = _parent.set((current.trace_id, current.span_id))
+    try:
+        yield current
+    except BaseException as exc:
+        current.set_error(str(exc) or type(exc).__name__)
+        raise
+    finally:
+        _parent.reset(token)
+        current.end()
+
+
+def ingest(data: dict) -> None:
+    """Add a span reported by another process to the active trace export."""
+    exporter = _exporter.get()
+    if exporter is not None:
+        exporter.ingest(data)
+
+
+@contextmanager
+def tracing(path: str | Path) -> Iterator[FileExporter]:
+    """Export spans started in the block to ``path``."""
+    exporter = FileExporter(path)
+    token = _exporter.set(exporter)
+    try:
+        yield exporter
+    finally:
+        _exporter.reset(token)
+        exporter.close()
+
+
+def continue_trace(traceparent: str | None = None) -> bool:
+    """Continue a trace from a W3C ``traceparent``, exporting to stderr.
+
+    Used inside the container; reads ``TRACEPARENT`` when no value is
+    given. Returns False, leaving tracing off, if there is none.
+    """
+    traceparent = traceparent or os.environ.get("TRACEPARENT")
+    parts = (traceparent or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return False
+    _parent.set((parts[1], parts[2]))
+    _exporter.set(StreamExporter(sys.stderr))
+    return True
@@ -0,0 +1,151 @@
+"""Re-run checks whenever the target documentation changes.
+
+``watch`` polls the target doc and the local files it references (links,
+inline code paths), waits for edits to settle, then starts a fresh check.
+Any edit cancels the check that is still running, so only the latest
+version of the docs is ever reported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from good_start.discovery import discover_docs
+from good_start.result import Result
+
+# Markdown link targets: [text](path) and ![alt](path), minus any #anchor.
+_LINK_RE = re.compile(r"!?\[[^\]]*\]\(\s*<?([^)\s>#]+)")
+# Inline code spans that look like a relative file path (`requirements.txt`).
+_CODE_RE = re.compile(r"`([\w./-]+\.[\w]+)`")
+
+Snapshot = dict[Path, int | None]
+
+
+def referenced_files(doc: Path, root: Path | None = None) -> set[Path]:
+    """Return existing local files that ``doc`` links to or names in code spans.
+
+    Paths are resolved relative to the doc's directory first and then to
+    ``root`` (the project root). URLs and missing files are ignored.
+    """
+    root = root or doc.parent
+    try:
+        text = doc.read_text(errors="replace")
+    except OSError:
+        return set()
+
+    found = set()
+    for match in (*_LINK_RE.finditer(text), *_CODE_RE.finditer(text)):
+        ref = match.group(1)
+        if "://" in ref or ref.startswith("mailto:"):
+            continue
+        for base in (doc.parent, root):
+            candidate = (base / ref).resolve()
+            if candidate.is_file():
+                found.add(candidate)
+                break
+    return found
+
+
+def watched_files(target: str | Path) -> set[Path]:
+    """Return the files whose edits should trigger a re-check of ``target``."""
+    target = Path(target)
+    if target.is_dir():
+        docs = {
+            (target / c.path).resolve()
+            for c in discover_docs(target)
+            if c.kind in ("doc", "manifest")
+        }
+        root = target
+    else:
+        docs = {target.resolve()}
+        root = Path.cwd()
+
+    files = set(docs)
+    for doc in docs:
+        if doc.suffix.lower() in (".md", ".markdown", ".rst", ".txt", ""):
+            files |= referenced_files(doc, root)
+    return files
+
+
+def snapshot(paths: set[Path]) -> Snapshot:
+    """Return each path's modification time (None if it no longer exists)."""
+    snap: Snapshot = {}
+    for path in paths:
+        try:
+            snap[path] = path.stat().st_mtime_ns
+        except OSError:
+            snap[path] = None
+    return snap
+
+
+async def watch(
+    target: str | Path,
+    run_check: Callable[[], Awaitable[Result]],
+    on_result: Callable[[Result], None],
+    on_change: Callable[[list[Path]], None] | None = None,
+    debounce: float = 1.0,
+    poll_interval: float = 0.25,
+    stop: asyncio.Event | None = None,
+) -> None:
+    """Run ``run_check`` now and again after every settled edit to ``target``.
+
+    Edits are debounced: a check starts only once no file has changed for
+    ``debounce`` seconds, and a check still running when an edit lands is
+    cancelled. Runs until ``stop`` is set (or forever).
+    """
+    stop = stop or asyncio.Event()
+    files = watched_files(target)
+    last = snapshot(files)
+    pending: list[Path] = []
+    quiet_since: float | None = None
+    loop = asyncio.get_running_loop()
+
+    async def _check() -> None:
+        on_result(await run_check())
+
+    task: asyncio.Task[None] | None = asyncio.create_task(_check())
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except TimeoutError:
+                pass
+
+            current = snapshot(files)
+            changed = [p for p in current if current[p] != last.get(p)]
+            if changed:
+                pending.extend(p for p in changed if p not in pending)
+                quiet_since = loop.time()
+                # The doc may now reference different files.
+                files = watched_files(target)
+                last = snapshot(files)
+                # Whatever is running is checking stale docs.
+                if task is not None and not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    task = None
+
+            if (
+                pending
+                and quiet_since is not None
+                and loop.time() - quiet_since >= debounce
+            ):
+                if on_change is not None:
+                    on_change(sorted(pending))
+                pending = []
+                quiet_since = None
+                task = asyncio.create_task(_check())
+
+            if task is not None and task.done():
+                # Surface errors from the check itself (e.g. no API key).
+                exc = None if task.cancelled() else task.exception()
+                if exc is not None:
+                    raise exc
+                task = None
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
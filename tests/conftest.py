@@ -1 +1,181 @@
+import json
+import shutil
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
 pytest_plugins = ["pytester"]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    """Keep logs, artifacts and run history written by tests out of $HOME."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+
+
+@pytest.fixture(autouse=True)
+def _cli_engine_backend(monkeypatch):
+    """Never talk to a real container engine socket from the tests."""
+    monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "cli")
+    monkeypatch.delenv("GOOD_START_ENDPOINTS", raising=False)
+
+
+def _frame(stream: int, data: bytes) -> bytes:
+    return struct.pack(">BxxxL", stream, len(data)) + data
+
+
+class FakeEngine:
+    """A tiny Docker-compatible API server on a Unix socket, or TCP if no path."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.ncpu = 4
+        self.has_image = True
+        self.stdout = b'{"passed": true, "details": "All good"}\n'
+        self.stderr = b'{"usage": {"input_tokens": 10}, "cost_usd": 0.5}\n'
+        self.exit_codes = [0]
+        # Seconds each container runs before writing its output.
+        self.run_time = 0.0
+        self.fail_create = False
+        self.stats = {
+            "cpu_stats": {"cpu_usage": {"total_usage": 2_000_000_000}},
+            "memory_stats": {"usage": 64 * 1024**2},
+            "networks": {"eth0": {"rx_bytes": 100, "tx_bytes": 50}},
+            "blkio_stats": {
+                "io_service_bytes_recursive": [
+                    {"op": "Read", "value": 10},
+                    {"op": "Write", "value": 20},
+                ]
+            },
+        }
+        self.requests: list[tuple[str, str]] = []
+        self.created: list[dict] = []
+        self.stdin = b""
+        self.connections = 0
+        self._started = threading.Event()
+        if path is not None:
+            self.server = socketserver.ThreadingUnixStreamServer(
+                str(path), self._handler()
+            )
+            self.url = f"unix://{path}"
+        else:
+            self.server = socketserver.ThreadingTCPServer(
+                ("127.0.0.1", 0), self._handler()
+            )
+            self.url = f"tcp://127.0.0.1:{self.server.server_address[1]}"
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        engine = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                engine.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None):
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self, method):
+                path, _, query = self.path.partition("?")
+                path = path.removeprefix("/v1.41")
+                engine.requests.append((method, path))
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+
+                if path == "/_ping":
+                    return self._reply(200, "OK")
+                if path == "/info":
+                    return self._reply(200, {"NCPU": engine.ncpu, "MemTotal": 8 << 30})
+                if path.startswith("/images/"):
+                    if engine.has_image:
+                        return self._reply(200, {})
+                    return self._reply(404, {"message": "no such image"})
+                if path == "/containers/create":
+                    if engine.fail_create:
+                        return self._reply(500, {"message": "boom"})
+                    engine.created.append(body)
+                    return self._reply(201, {"Id": "abc123"})
+                if path.endswith("/attach"):
+                    return self._attach("stdin=1" in query)
+                if path.endswith("/start"):
+                    engine._started.set()
+                    return self._reply(204)
+                if path.endswith("/wait"):
+                    # The last exit code repeats for any further containers.
+                    codes = engine.exit_codes
+                    code = codes.pop(0) if len(codes) > 1 else codes[0]
+                    return self._reply(200, {"StatusCode": code})
+                if path.endswith("/stats"):
+                    return self._reply(200, engine.stats)
+                if method == "DELETE":
+                    return self._reply(204)
+                return self._reply(404, {"message": "not found"})
+
+            def _attach(self, stdin):
+                self.wfile.write(
+                    b"HTTP/1.1 101 UPGRADED\r\n"
+                    b"Connection: Upgrade\r\nUpgrade: tcp\r\n\r\n"
+                )
+                self.wfile.flush()
+                engine._started.wait(5)
+                engine._started.clear()
+                if stdin:
+                    engine.stdin = self.rfile.read()
+                time.sleep(engine.run_time)
+                # Split a line across frames, as the engine may.
+                half = len(engine.stdout) // 2
+                self.wfile.write(_frame(1, engine.stdout[:half]))
+                self.wfile.write(_frame(2, engine.stderr))
+                self.wfile.write(_frame(1, engine.stdout[half:]))
+                self.close_connection = True
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self._route("POST")
+
+            def do_DELETE(self):
+                self._route("DELETE")
+
+        return Handler
+
+
+@pytest.fixture
+def make_engine():
+    """Return a factory for FakeEngines, closed after the test."""
+    # Unix socket paths are short; pytest's tmp_path can be too long.
+    directory = Path(tempfile.mkdtemp(prefix="gs-"))
+    engines: list[FakeEngine] = []
+
+    def _make(tcp: bool = False) -> FakeEngine:
+        path = None if tcp else directory / f"engine{len(engines)}.sock"
+        engines.append(FakeEngine(path))
+        return engines[-1]
+
+    yield _make
+    for fake in engines:
+        fake.close()
+    shutil.rmtree(directory, ignore_errors=True)
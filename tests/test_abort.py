@@ -0,0 +1,135 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from good_start.abort import (
+    AbortMonitor,
+    DownloadNotFound,
+    EarlyAbort,
+    RepeatedInstallFailure,
+    ToolEvent,
+)
+from good_start.agent import Agent
+from good_start.loader import Prompt
+from good_start.scheduler import Scheduler
+
+MISSING = "ERROR: No matching distribution found for not-a-real-pkg"
+
+
+def _bash(command: str, output: str) -> ToolEvent:
+    return ToolEvent("Bash", {"command": command}, output)
+
+
+class TestRepeatedInstallFailure:
+    def test_fires_at_threshold(self):
+        monitor = AbortMonitor([RepeatedInstallFailure(threshold=2)])
+        monitor.observe(_bash("pip install not-a-real-pkg", MISSING))
+        with pytest.raises(EarlyAbort) as exc_info:
+            monitor.observe(_bash("pip3 install not-a-real-pkg==1.0", MISSING))
+        decision = exc_info.value.decision
+        assert decision.rule == "repeated-install-failure"
+        assert "pip3 install not-a-real-pkg==1.0" in decision.evidence
+        assert MISSING in decision.evidence
+
+    def test_ignores_other_failures(self):
+        monitor = AbortMonitor([RepeatedInstallFailure(threshold=1)])
+        monitor.observe(
+            _bash("pip install foo", "error: Microsoft Visual C++ required")
+        )
+        monitor.observe(_bash("cat README.md", MISSING))
+        assert len(monitor.history) == 2
+
+    def test_npm_not_found(self):
+        monitor = AbortMonitor([RepeatedInstallFailure(threshold=1)])
+        with pytest.raises(EarlyAbort):
+            monitor.observe(_bash("npm install nope", "npm ERR! code E404"))
+
+
+class TestDownloadNotFound:
+    def test_curl_404(self):
+        monitor = AbortMonitor([DownloadNotFound()])
+        with pytest.raises(EarlyAbort) as exc_info:
+            monitor.observe(
+                _bash(
+                    "curl -fsSL https://example.com/install.sh | sh",
+                    "curl: (22) The requested URL returned error: 404",
+                )
+            )
+        assert exc_info.value.decision.rule == "download-not-found"
+
+    def test_non_download_404_ignored(self):
+        monitor = AbortMonitor([DownloadNotFound()])
+        monitor.observe(_bash("grep -r 404 .", "docs/errors.md: 404 Not Found"))
+
+
+class TestMonitorMatchesResults:
+    def test_tool_result_content_blocks(self):
+        monitor = AbortMonitor([])
+        monitor.tool_started("t1", "Bash", {"command": "ls"})
+        monitor.tool_finished("t1", [{"type": "text", "text": "a.txt"}])
+        assert monitor.history == [ToolEvent("Bash", {"command": "ls"}, "a.txt")]
+
+
+def _fake_query(calls: dict):
+    """Fake SDK query: the agent keeps retrying a missing package."""
+
+    async def _query(prompt, options):
+        for i in range(10):
+            calls["n"] = i + 1
+            yield AssistantMessage(
+                content=[
+                    ToolUseBlock(
+                        id=f"t{i}", name="Bash", input={"command": "pip install nope"}
+                    )
+                ],
+                model="m",
+            )
+            yield UserMessage(
+                content=[ToolResultBlock(tool_use_id=f"t{i}", content=MISSING)]
+            )
+        yield ResultMessage(
+            subtype="success",
+            duration_ms=1,
+            duration_api_ms=1,
+            is_error=False,
+            num_turns=1,
+            session_id="s",
+            structured_output={"passed": False, "details": "gave up"},
+        )
+
+    return _query
+
+
+class TestAgentEarlyAbort:
+    def test_agent_stops_when_rule_fires(self):
+        calls: dict = {}
+        with patch("good_start.agent.query", _fake_query(calls)):
+            agent = Agent(prompt=Prompt(text="p"), scheduler=Scheduler(base_delay=0))
+            result = asyncio.run(agent.run())
+
+        assert result.passed is False
+        assert result.details.startswith("Stopped early (repeated-install-failure)")
+        assert "No matching distribution" in result.details
+        assert calls["n"] == 3
+        assert [s.input for s in result.steps] == ["pip install nope"] * 3
+
+    def test_rules_can_be_disabled(self):
+        calls: dict = {}
+        with patch("good_start.agent.query", _fake_query(calls)):
+            agent = Agent(
+                prompt=Prompt(text="p"),
+                scheduler=Scheduler(base_delay=0),
+                abort_rules=[],
+            )
+            result = asyncio.run(agent.run())
+
+        assert result.details == "gave up"
+        assert calls["n"] == 10
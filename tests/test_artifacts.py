@@ -0,0 +1,126 @@
+import json
+import tarfile
+
+import pytest
+from claude_agent_sdk import (
+    AssistantMessage,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from good_start.artifacts import ArtifactStore
+from good_start.result import AgentFindings, AgentStep, Result
+
+
+def _result(*outputs: str, messages=None) -> Result:
+    findings = AgentFindings(
+        passed=True,
+        details="ok",
+        steps=[
+            AgentStep(tool="Bash", input=f"cmd {i}", output=o)
+            for i, o in enumerate(outputs)
+        ],
+    )
+    return Result(agent_messages=messages or [], agent_result=findings)
+
+
+class TestArtifactStore:
+    def test_round_trip(self, tmp_path):
+        store = ArtifactStore(tmp_path)
+        ref = store.put("hello world")
+        assert ref.size == 11
+        assert ref.load() == "hello world"
+        assert store.get(ref.digest) == b"hello world"
+
+    def test_deduplicates_identical_content(self, tmp_path):
+        store = ArtifactStore(tmp_path)
+        first = store.put("x" * 10_000)
+        second = store.put(b"x" * 10_000)
+        assert first.digest == second.digest
+        objects = [p for p in (tmp_path / "objects").rglob("*") if p.is_file()]
+        assert len(objects) == 1
+        # Stored compressed.
+        assert objects[0].stat().st_size < 1000
+
+    def test_missing_artifact(self, tmp_path):
+        with pytest.raises(KeyError):
+            ArtifactStore(tmp_path).get("0" * 64)
+
+
+class TestResultOffload:
+    def test_large_outputs_move_to_store(self, tmp_path):
+        store = ArtifactStore(tmp_path)
+        big = "installing...\n" * 1000
+        result = _result("small", big)
+
+        run_id = result.offload(store)
+
+        assert result.run_id == run_id
+        assert result._steps[0].output == "small"
+        assert result._steps[1].output == ""
+        assert [s.output for s in result.steps] == ["small", big]
+
+    def test_transcript_loads_on_access(self, tmp_path):
+        result = _result(messages=["first", "second"])
+        result.offload(ArtifactStore(tmp_path))
+        assert result._messages == []
+        assert result.messages == ["first", "second"]
+
+    def test_transcript_round_trips_sdk_messages(self, tmp_path):
+        messages = [
+            AssistantMessage(
+                content=[
+                    TextBlock(text="Installing"),
+                    ToolUseBlock(id="t1", name="Bash", input={"command": "ls"}),
+                ],
+                model="claude",
+            ),
+            UserMessage(content=[ToolResultBlock(tool_use_id="t1", content="a b")]),
+        ]
+        result = _result(messages=messages)
+        result.offload(ArtifactStore(tmp_path))
+        assert result.messages == messages
+
+    def test_transcript_is_not_pickled(self, tmp_path):
+        store = ArtifactStore(tmp_path)
+        result = _result(messages=[AssistantMessage(content=[], model="claude")])
+        result.offload(store)
+        line = store.get(result._transcript_ref.digest).decode()
+        assert json.loads(line)["_type"] == "AssistantMessage"
+
+    def test_unencodable_transcript_leaves_result_unchanged(self, tmp_path):
+        result = _result("x" * 5000, messages=[{(1, 2): "tuple key"}])
+        with pytest.raises(TypeError):
+            result.offload(ArtifactStore(tmp_path))
+        assert result.run_id is None
+        assert result._steps[0].output == "x" * 5000
+        assert result.messages == [{(1, 2): "tuple key"}]
+
+    def test_offload_is_idempotent(self, tmp_path):
+        store = ArtifactStore(tmp_path)
+        result = _result("x" * 5000)
+        assert result.offload(store) == result.offload(store)
+        assert len(list((tmp_path / "runs").iterdir())) == 1
+
+    def test_export_bundles_run(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store")
+        big = "y" * 5000
+        result = _result("small", big, messages=["hello"])
+        run_id = result.offload(store)
+        assert store.latest_run() == run_id
+
+        bundle = store.export(run_id, tmp_path / "bundle.tar.gz")
+
+        with tarfile.open(bundle) as tar:
+            names = sorted(tar.getnames())
+            step = tar.extractfile(f"{run_id}/steps/001-Bash.txt").read()
+            transcript = tar.extractfile(f"{run_id}/transcript.jsonl").read()
+        assert names == [
+            f"{run_id}/manifest.json",
+            f"{run_id}/steps/001-Bash.txt",
+            f"{run_id}/transcript.jsonl",
+        ]
+        assert step.decode() == big
+        assert b"hello" in transcript
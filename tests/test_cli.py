@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -119,7 +120,17 @@ class TestNoContainerFlag:
 
         runner.invoke(app, ["check", ".", "--no-container"])
 
-        mock_resolve.assert_called_once_with(no_container=True, verbose=False)
+        mock_resolve.assert_called_once_with(
+            no_container=True,
+            verbose=False,
+            stage=None,
+            include=None,
+            exclude=None,
+            default_excludes=True,
+            cpus=None,
+            memory=None,
+            endpoints=None,
+        )
 
     @patch("good_start.cli.resolve_runtime")
     def test_default_uses_container(self, mock_resolve):
@@ -128,7 +139,295 @@ class TestNoContainerFlag:
 
         runner.invoke(app, ["check", "."])
 
-        mock_resolve.assert_called_once_with(no_container=False, verbose=False)
+        mock_resolve.assert_called_once_with(
+            no_container=False,
+            verbose=False,
+            stage=None,
+            include=None,
+            exclude=None,
+            default_excludes=True,
+            cpus=None,
+            memory=None,
+            endpoints=None,
+        )
+
+
+class TestStageOptions:
+    @patch("good_start.cli.resolve_runtime")
+    def test_stage_options_passed_to_runtime(self, mock_resolve):
+        result = _make_result(passed=True, details="OK")
+        mock_resolve.return_value = _mock_runtime(result)
+
+        runner.invoke(
+            app,
+            ["check", ".", "--stage", "git", "--exclude", "data", "--exclude", "*.bin"],
+        )
+
+        kwargs = mock_resolve.call_args.kwargs
+        assert kwargs["stage"] == "git"
+        assert kwargs["exclude"] == ["data", "*.bin"]
+
+    def test_invalid_stage_mode(self):
+        cli_result = runner.invoke(app, ["check", ".", "--stage", "bogus"])
+
+        assert cli_result.exit_code == 1
+        assert "--stage must be one of" in cli_result.output
+
+
+class TestResourceLimitOptions:
+    @patch("good_start.cli.resolve_runtime")
+    def test_limits_passed_to_runtime(self, mock_resolve):
+        result = _make_result(passed=True, details="OK")
+        mock_resolve.return_value = _mock_runtime(result)
+
+        runner.invoke(app, ["check", ".", "--cpus", "1.5", "--memory", "2g"])
+
+        kwargs = mock_resolve.call_args.kwargs
+        assert kwargs["cpus"] == 1.5
+        assert kwargs["memory"] == "2g"
+
+    def test_invalid_memory(self):
+        cli_result = runner.invoke(app, ["check", ".", "--memory", "lots"])
+
+        assert cli_result.exit_code == 1
+        assert "Invalid memory size" in cli_result.output
+
+
+class TestEndpointOption:
+    @patch("good_start.cli.resolve_runtime")
+    def test_endpoints_passed_to_runtime(self, mock_resolve):
+        result = _make_result(passed=True, details="OK")
+        mock_resolve.return_value = _mock_runtime(result)
+
+        runner.invoke(
+            app,
+            ["check", ".", "--endpoint", "podman", "--endpoint", "tcp://ci-2:2375"],
+        )
+
+        assert mock_resolve.call_args.kwargs["endpoints"] == [
+            "podman",
+            "tcp://ci-2:2375",
+        ]
+
+    @patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+    def test_invalid_endpoint(self, _which):
+        cli_result = runner.invoke(app, ["check", ".", "--endpoint", "ftp://x"])
+
+        assert cli_result.exit_code == 1
+        assert "Invalid engine endpoint" in cli_result.output
+
+
+class TestSectionsOption:
+    @patch("good_start.cli.resolve_runtime")
+    def test_checks_each_section(self, mock_resolve, tmp_path):
+        doc = tmp_path / "INSTALL.md"
+        doc.write_text("## Install with pip\n\npip\n\n## Install with conda\n\nconda\n")
+        result = _make_result(passed=True, details="OK")
+        mock_resolve.return_value = _mock_runtime(result)
+
+        cli_result = runner.invoke(app, ["check", str(doc), "--sections"])
+
+        assert cli_result.exit_code == 0
+        assert "2 of 2 install sections passed" in cli_result.output
+        assert mock_resolve.return_value.run.call_count == 2
+
+    def test_requires_file_target(self):
+        cli_result = runner.invoke(app, ["check", ".", "--sections"])
+
+        assert cli_result.exit_code == 1
+        assert "--sections requires a file target" in cli_result.output
+
+
+class TestServerOption:
+    @patch("good_start.cli.resolve_runtime")
+    @patch("good_start.server.submit_check", new_callable=AsyncMock)
+    def test_server_flag_submits_to_daemon(self, mock_submit, mock_resolve):
+        mock_submit.return_value = _make_result(passed=True, details="From daemon")
+
+        cli_result = runner.invoke(app, ["check", ".", "--server", "--priority", "3"])
+
+        assert cli_result.exit_code == 0
+        assert "From daemon" in cli_result.output
+        mock_resolve.assert_not_called()
+        assert mock_submit.call_args.kwargs["priority"] == 3
+
+    @patch("good_start.server.submit_check", new_callable=AsyncMock)
+    def test_server_forwards_endpoints(self, mock_submit):
+        mock_submit.return_value = _make_result(passed=True, details="ok")
+
+        cli_result = runner.invoke(
+            app, ["check", ".", "--server", "--endpoint", "tcp://build-2:2375"]
+        )
+
+        assert cli_result.exit_code == 0
+        options = mock_submit.call_args.kwargs["options"]
+        assert options["endpoints"] == ["tcp://build-2:2375"]
+
+    def test_server_not_running(self, tmp_path):
+        cli_result = runner.invoke(
+            app, ["check", ".", "--server", "--socket", str(tmp_path / "none.sock")]
+        )
+
+        assert cli_result.exit_code == 1
+        assert "No good-start server" in cli_result.output
+
+
+class TestTieredOption:
+    @patch("good_start.cli.resolve_runtime")
+    def test_escalates_to_full_tier(self, mock_resolve):
+        runtime = MagicMock()
+        runtime.run = AsyncMock(
+            side_effect=[_make_result(False, "smoke failed"), _make_result(True, "ok")]
+        )
+        mock_resolve.return_value = runtime
+
+        cli_result = runner.invoke(
+            app, ["check", ".", "--tiered", "--smoke-model", "sonnet"]
+        )
+
+        assert cli_result.exit_code == 0
+        assert "full tier" in cli_result.output
+        smoke, full = (call.kwargs["tier"] for call in runtime.run.call_args_list)
+        assert smoke.model == "sonnet"
+        assert full.name == "full"
+
+    @patch("good_start.cli.resolve_runtime")
+    def test_indexed_search_without_tiers(self, mock_resolve):
+        runtime = _mock_runtime(_make_result(True, "ok"))
+        mock_resolve.return_value = runtime
+
+        cli_result = runner.invoke(app, ["check", ".", "--indexed-search"])
+
+        assert cli_result.exit_code == 0
+        assert "full tier" not in cli_result.output
+        tier = runtime.run.call_args.kwargs["tier"]
+        assert "mcp__repo__search_code" in tier.allowed_tools
+        assert "Grep" not in tier.allowed_tools
+
+
+class TestProfileOption:
+    @patch("good_start.cli.resolve_runtime")
+    def test_writes_host_profile(self, mock_resolve, tmp_path):
+        mock_resolve.return_value = _mock_runtime(_make_result(True, "ok"))
+
+        cli_result = runner.invoke(app, ["check", ".", "--profile", str(tmp_path)])
+
+        assert cli_result.exit_code == 0
+        assert (tmp_path / "host.pstats").exists()
+
+    @patch("good_start.cli.resolve_runtime")
+    def test_profile_written_on_failure(self, mock_resolve, tmp_path):
+        mock_resolve.return_value = _mock_runtime(_make_result(False, "broken"))
+
+        cli_result = runner.invoke(app, ["check", ".", "--profile", str(tmp_path)])
+
+        assert cli_result.exit_code == 1
+        assert (tmp_path / "host.pstats").exists()
+
+
+class TestStatsOption:
+    @patch("good_start.cli.resolve_runtime")
+    def test_prints_resource_usage(self, mock_resolve):
+        from good_start.runtime import ResourceUsage
+
+        result = _make_result(True, "ok")
+        result.duration = 12.0
+        result.cost_usd = 0.5
+        result.resources = ResourceUsage(peak_memory=256 * 1024**2, cpu_seconds=3.5)
+        mock_resolve.return_value = _mock_runtime(result)
+
+        cli_result = runner.invoke(app, ["check", ".", "--stats"])
+
+        assert cli_result.exit_code == 0
+        assert "Peak memory" in cli_result.output
+        assert "256.0MiB" in cli_result.output
+        assert "$0.5000" in cli_result.output
+
+    @patch("good_start.cli.resolve_runtime")
+    def test_no_stats_available(self, mock_resolve):
+        mock_resolve.return_value = _mock_runtime(_make_result(True, "ok"))
+        cli_result = runner.invoke(app, ["check", ".", "--stats"])
+        assert "No run statistics available" in cli_result.output
+
+
+class TestFormatOption:
+    @patch("good_start.cli.resolve_runtime")
+    def test_json_replaces_panel(self, mock_resolve):
+        result = _make_result(False, "pip install failed")
+        result.duration = 3.0
+        mock_resolve.return_value = _mock_runtime(result)
+
+        cli_result = runner.invoke(app, ["check", ".", "--format", "json"])
+
+        assert cli_result.exit_code == 1
+        data = json.loads(cli_result.stdout)
+        assert data["results"][0]["details"] == "pip install failed"
+        assert data["results"][0]["duration"] == 3.0
+        assert data["summary"]["failed"] == 1
+        assert "FAILED" not in cli_result.stdout
+
+    @patch("good_start.cli.resolve_runtime")
+    def test_ndjson_streams_tool_events(self, mock_resolve, tmp_path):
+        async def _run(prompt, target, on_tool_use=None, tier=None):
+            on_tool_use("Bash", {"command": "pip install ."})
+            return _make_result(True, "ok")
+
+        runtime = MagicMock()
+        runtime.run = _run
+        mock_resolve.return_value = runtime
+        out = tmp_path / "report.ndjson"
+
+        cli_result = runner.invoke(
+            app, ["check", ".", "--format", "ndjson", "-o", str(out)]
+        )
+
+        assert cli_result.exit_code == 0
+        records = [json.loads(line) for line in out.read_text().splitlines()]
+        assert [r["type"] for r in records] == ["event", "result"]
+        assert records[0]["input"] == {"command": "pip install ."}
+
+    def test_unknown_format(self):
+        cli_result = runner.invoke(app, ["check", ".", "--format", "yaml"])
+        assert cli_result.exit_code == 1
+        assert "--format must be one of" in cli_result.output
+
+
+class TestExportCommand:
+    @patch("good_start.cli.resolve_runtime")
+    def test_exports_latest_run(self, mock_resolve, tmp_path):
+        mock_resolve.return_value = _mock_runtime(_make_result(True, "ok"))
+        runner.invoke(app, ["check", "."])
+
+        bundle = tmp_path / "run.tar.gz"
+        cli_result = runner.invoke(app, ["export", "-o", str(bundle)])
+
+        assert cli_result.exit_code == 0
+        assert bundle.exists()
+
+    def test_no_runs(self):
+        cli_result = runner.invoke(app, ["export"])
+        assert cli_result.exit_code == 1
+        assert "no recorded runs" in cli_result.output
+
+
+class TestHistoryCommand:
+    @patch("good_start.cli.resolve_runtime")
+    def test_checks_are_recorded(self, mock_resolve):
+        result = _make_result(passed=True, details="ok")
+        result.duration = 42.0
+        mock_resolve.return_value = _mock_runtime(result)
+        runner.invoke(app, ["check", "."])
+
+        cli_result = runner.invoke(app, ["history"])
+
+        assert cli_result.exit_code == 0
+        assert "42.0s" in cli_result.output
+        assert "100%" in cli_result.output
+
+    def test_empty_history(self):
+        cli_result = runner.invoke(app, ["history"])
+        assert cli_result.exit_code == 0
+        assert "No recorded runs" in cli_result.output
 
 
 class TestHelpOutput:
@@ -0,0 +1,65 @@
+"""Cold-start benchmark for the agent image.
+
+The benchmark starts real containers, so it only runs when
+``GOOD_START_BENCHMARK=1`` and an engine is installed. It fails if the
+median time from ``<engine> run`` to the entrypoint's ready event exceeds
+``GOOD_START_COLD_START_BUDGET`` seconds.
+"""
+
+import io
+import os
+import shutil
+import statistics
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from good_start.runtime._container import ContainerRuntime
+
+COLD_START_BUDGET = float(os.environ.get("GOOD_START_COLD_START_BUDGET", "3.0"))
+
+
+def _proc(stderr: str, returncode: int = 0):
+    proc = MagicMock()
+    proc.stderr = io.StringIO(stderr)
+    proc.returncode = returncode
+    return proc
+
+
+@patch("good_start.runtime._container.subprocess.Popen")
+@patch("good_start.runtime._container.subprocess.run")
+@patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+class TestMeasureColdStart:
+    def test_times_each_run_to_ready_event(self, _which, mock_run, mock_popen):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.side_effect = lambda *a, **kw: _proc('noise\n{"ready": true}\n')
+
+        timings = ContainerRuntime().measure_cold_start(runs=3)
+
+        assert len(timings) == 3
+        assert all(t >= 0 for t in timings)
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[:3] == ["podman", "run", "--rm"]
+        assert cmd[-1] == "--startup-only"
+
+    def test_raises_when_never_ready(self, _which, mock_run, mock_popen):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.return_value = _proc("Traceback...\n", returncode=1)
+
+        with pytest.raises(RuntimeError, match="exited with code 1"):
+            ContainerRuntime().measure_cold_start(runs=1)
+
+
+@pytest.mark.skipif(
+    os.environ.get("GOOD_START_BENCHMARK") != "1"
+    or not (shutil.which("podman") or shutil.which("docker")),
+    reason="set GOOD_START_BENCHMARK=1 with podman or docker installed",
+)
+def test_cold_start_within_budget():
+    timings = ContainerRuntime().measure_cold_start(runs=5)
+    median = statistics.median(timings)
+    assert median <= COLD_START_BUDGET, (
+        f"Median cold start {median:.2f}s (max {max(timings):.2f}s) exceeds "
+        f"the {COLD_START_BUDGET:.2f}s budget: {timings}"
+    )
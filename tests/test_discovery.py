@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from good_start.discovery import DocCandidate, discover_docs, prompt_context
+from good_start.loader import load_prompt
+
+
+def _touch(root: Path, *paths: str) -> None:
+    for rel in paths:
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("")
+
+
+class TestDiscoverDocs:
+    def test_ranks_docs_before_manifests_and_lockfiles(self, tmp_path: Path):
+        _touch(
+            tmp_path,
+            "uv.lock",
+            "pyproject.toml",
+            "CONTRIBUTING.md",
+            "README.md",
+            "docs/install.md",
+        )
+        index = discover_docs(tmp_path)
+        assert [c.path for c in index] == [
+            "README.md",
+            "docs/install.md",
+            "CONTRIBUTING.md",
+            "pyproject.toml",
+            "uv.lock",
+        ]
+        assert [c.kind for c in index] == [
+            "doc",
+            "doc",
+            "doc",
+            "manifest",
+            "lockfile",
+        ]
+
+    def test_top_level_outranks_nested(self, tmp_path: Path):
+        _touch(tmp_path, "INSTALL.md", "docs/install.md")
+        index = discover_docs(tmp_path)
+        assert index[0] == DocCandidate("INSTALL.md", "doc", 90)
+
+    def test_skips_non_doc_directories(self, tmp_path: Path):
+        _touch(tmp_path, "node_modules/pkg/README.md", "src/README.md")
+        assert discover_docs(tmp_path) == []
+
+    def test_ignores_nested_manifests(self, tmp_path: Path):
+        _touch(tmp_path, "docs/package.json")
+        assert discover_docs(tmp_path) == []
+
+    def test_ignores_unrelated_files(self, tmp_path: Path):
+        _touch(tmp_path, "notes.md", "README.png")
+        assert discover_docs(tmp_path) == []
+
+
+class TestPromptContext:
+    def test_dot_target_includes_index(self, tmp_path: Path, monkeypatch):
+        _touch(tmp_path, "README.md")
+        monkeypatch.chdir(tmp_path)
+        context = prompt_context(".")
+        assert context["target"] == "."
+        assert [c.path for c in context["doc_index"]] == ["README.md"]
+
+    def test_file_target_skips_scan(self):
+        assert prompt_context("README.md") == {"target": "README.md"}
+
+    def test_index_rendered_into_prompt(self, tmp_path: Path, monkeypatch):
+        _touch(tmp_path, "README.md", "Cargo.toml")
+        monkeypatch.chdir(tmp_path)
+        rendered = load_prompt().render(**prompt_context("."))
+        assert "- `README.md` (doc)" in rendered
+        assert "- `Cargo.toml` (manifest)" in rendered
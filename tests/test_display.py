@@ -1,4 +1,8 @@
-from good_start.display import format_tool_event
+import io
+
+from rich.console import Console
+
+from good_start.display import EventRenderer, format_tool_event
 
 
 class TestFormatToolEvent:
@@ -18,6 +22,66 @@ class TestFormatToolEvent:
         result = format_tool_event("Glob", {"pattern": "*.md"})
         assert result == "* *.md"
 
+    def test_indexed_search_tools(self):
+        assert (
+            format_tool_event(
+                "mcp__repo__search_code", {"pattern": "pip", "glob": "*.md"}
+            )
+            == "? search 'pip' *.md"
+        )
+        assert format_tool_event("mcp__repo__find_files", {"pattern": "*.md"}) == (
+            "* find *.md"
+        )
+
     def test_unknown_tool(self):
         result = format_tool_event("CustomTool", {"arg": "value"})
         assert result.startswith("# CustomTool")
+
+
+class _CountingFile(io.StringIO):
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestEventRenderer:
+    def test_plain_output_is_batched(self):
+        out = _CountingFile()
+        console = Console(file=out, force_terminal=False)
+        with EventRenderer(console, fps=1) as renderer:
+            sink = renderer.sink()
+            for i in range(500):
+                sink("Bash", {"command": f"echo {i}"})
+
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 500
+        assert lines[0] == "  $ echo 0"
+        assert out.writes < 10
+
+    def test_plain_output_labels_runs(self):
+        out = io.StringIO()
+        console = Console(file=out, force_terminal=False)
+        with EventRenderer(console) as renderer:
+            renderer.sink("pip")("Read", {"file_path": "README.md"})
+            renderer.sink("conda")("StructuredOutput", {})
+
+        assert out.getvalue() == "  [pip] > README.md\n"
+
+    def test_live_view_shows_window_and_counters(self):
+        out = io.StringIO()
+        console = Console(file=out, force_terminal=True, width=100)
+        renderer = EventRenderer(console, window=3)
+        assert renderer.live
+        sink = renderer.sink("pip")
+        for i in range(10):
+            sink("Bash", {"command": f"step-{i}"})
+        sink("Read", {"file_path": "README.md"})
+
+        console.print(renderer._render())
+        text = out.getvalue()
+        assert "pip" in text
+        assert "11 events (Bash 10, Read 1)" in text
+        assert "step-8" in text and "README.md" in text
+        assert "step-7" not in text
@@ -0,0 +1,274 @@
+import asyncio
+import io
+import subprocess
+import tarfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from good_start.profiling import profiling
+from good_start.runtime import _endpoints
+from good_start.runtime._capacity import HostCapacity
+from good_start.runtime._container import FULL_IMAGE, ContainerRuntime
+from good_start.runtime._endpoints import (
+    Endpoint,
+    EnginePool,
+    configured_endpoints,
+    parse_endpoint,
+)
+from good_start.runtime._engine_api import EngineAPI
+
+
+@pytest.fixture(autouse=True)
+def _fresh_endpoints():
+    _endpoints._shared.clear()
+    yield
+    _endpoints._shared.clear()
+
+
+def _endpoint(name: str, cpus: float) -> Endpoint:
+    return Endpoint("podman", url=name, capacity=HostCapacity(cpus=cpus, memory=0))
+
+
+class TestPlacement:
+    def test_least_loaded_placement(self):
+        small, large = _endpoint("small", 2), _endpoint("large", 4)
+        pool = EnginePool([small, large])
+        placed: list[str] = []
+
+        async def _run():
+            async with pool.place(1.0) as endpoint:
+                placed.append(endpoint.label)
+                await asyncio.sleep(0.05)
+
+        async def _main():
+            await asyncio.gather(*(_run() for _ in range(6)))
+
+        asyncio.run(_main())
+        # Spread in proportion to each endpoint's size, with nothing queued.
+        assert placed.count("small") == 2
+        assert placed.count("large") == 4
+        assert small.assigned == large.assigned == 0
+
+    def test_skips_unhealthy_and_excluded(self):
+        first, second, third = (_endpoint(n, 2) for n in ("a", "b", "c"))
+        first.mark_failed("down")
+        pool = EnginePool([first, second, third])
+
+        async def _main():
+            async with pool.place(1.0, exclude=[second]) as endpoint:
+                return endpoint.label
+
+        assert asyncio.run(_main()) == "c"
+
+    def test_no_endpoint_available(self):
+        endpoint = _endpoint("a", 2)
+        endpoint.mark_failed("down")
+        pool = EnginePool([endpoint])
+
+        async def _main():
+            async with pool.place(1.0):
+                pass
+
+        with (
+            patch.object(Endpoint, "_info", side_effect=OSError("refused")),
+            pytest.raises(RuntimeError, match="a: refused"),
+        ):
+            asyncio.run(_main())
+        assert not endpoint.healthy
+
+    def test_recovered_endpoint_rejoins(self, monkeypatch):
+        monkeypatch.setattr(_endpoints, "_RECHECK_AFTER", 0.0)
+        down, up = _endpoint("down", 8), _endpoint("up", 1)
+        down.mark_failed("refused")
+        pool = EnginePool([down, up])
+
+        async def _main():
+            async with pool.place(1.0) as endpoint:
+                return endpoint.label
+
+        with patch.object(Endpoint, "_info", return_value=(8.0, 0)):
+            assert asyncio.run(_main()) == "down"
+        assert down.healthy
+
+
+class TestEndpoint:
+    @patch("good_start.runtime._endpoints.subprocess.run")
+    def test_check_sizes_capacity_from_cli(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(
+            [], 0, stdout="6 17179869184\n"
+        )
+        endpoint = Endpoint("docker", url="ssh://ci@build-2")
+
+        assert endpoint.check()
+        assert endpoint.capacity.total_cpus == 6
+        assert endpoint.capacity.total_memory == 16 * 1024**3
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:4] == ["docker", "-H", "ssh://ci@build-2", "info"]
+
+    def test_check_over_api(self, make_engine):
+        fake = make_engine(tcp=True)
+        fake.ncpu = 3
+        endpoint = Endpoint("docker", url=fake.url, api=EngineAPI("docker", fake.url))
+
+        assert endpoint.check()
+        assert endpoint.capacity.total_cpus == 3
+
+    @patch("good_start.runtime._endpoints.subprocess.run")
+    def test_failed_check_marks_unhealthy(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(
+            [], 125, stderr="cannot connect"
+        )
+        endpoint = Endpoint("podman", url="ssh://ci@build-2")
+
+        assert not endpoint.check()
+        assert endpoint.error == "cannot connect"
+
+
+class TestParseEndpoint:
+    def test_unix_socket_uses_api(self, monkeypatch):
+        monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "auto")
+        endpoint = parse_endpoint("unix:///run/user/1001/podman/podman.sock", "podman")
+        assert str(endpoint.api.address) == "/run/user/1001/podman/podman.sock"
+        assert endpoint.cli == [
+            "podman",
+            "--url",
+            "unix:///run/user/1001/podman/podman.sock",
+        ]
+
+    def test_engine_prefix_and_ssh(self):
+        endpoint = parse_endpoint("docker+ssh://ci@build-2", "podman")
+        assert endpoint.engine == "docker"
+        assert endpoint.api is None
+        assert endpoint.cli == ["docker", "-H", "ssh://ci@build-2"]
+
+    def test_cli_backend_skips_api(self):
+        assert parse_endpoint("tcp://build-2:2375", "docker").api is None
+
+    def test_endpoints_are_shared(self):
+        assert parse_endpoint("tcp://a:1", "docker") is parse_endpoint(
+            "tcp://a:1", "docker"
+        )
+
+    def test_invalid_endpoint(self):
+        with pytest.raises(ValueError, match="Invalid engine endpoint"):
+            parse_endpoint("http://a", "docker")
+
+    def test_from_environment(self, monkeypatch):
+        monkeypatch.setenv("GOOD_START_ENDPOINTS", "podman, tcp://b:2375")
+        labels = [e.label for e in configured_endpoints("podman")]
+        assert labels == ["podman", "tcp://b:2375"]
+
+    def test_defaults_to_local_engine(self):
+        (endpoint,) = configured_endpoints("docker")
+        assert endpoint.url is None
+        assert endpoint.cli == ["docker"]
+
+
+@pytest.fixture
+def runtime_mocks():
+    with (
+        patch(
+            "good_start.runtime._container.shutil.which",
+            return_value="/usr/bin/podman",
+        ),
+        patch(
+            "good_start.runtime._container._resolve_api_key",
+            return_value="sk-test",
+        ),
+        patch("good_start.runtime._container.subprocess.Popen") as popen,
+        patch("good_start.runtime._container.subprocess.run") as run,
+    ):
+        yield popen, run
+
+
+class TestShardedRuntime:
+    @pytest.fixture(autouse=True)
+    def _api_backend(self, monkeypatch):
+        monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "auto")
+
+    def test_runs_spread_across_engines(self, make_engine, runtime_mocks):
+        engines = [make_engine(), make_engine(tcp=True)]
+        for fake in engines:
+            fake.ncpu = 1
+            fake.run_time = 0.3
+        rt = ContainerRuntime(endpoints=[fake.url for fake in engines])
+
+        async def _main():
+            return await asyncio.gather(*(rt.run("prompt", ".") for _ in range(2)))
+
+        results = asyncio.run(_main())
+
+        assert all(result.passed for result in results)
+        assert [len(fake.created) for fake in engines] == [1, 1]
+
+    def test_remote_engine_gets_staged_workspace(
+        self, make_engine, runtime_mocks, tmp_path
+    ):
+        project = tmp_path / "project"
+        (project / "node_modules").mkdir(parents=True)
+        (project / "node_modules" / "x.js").write_text("x")
+        (project / "README.md").write_text("# Project\n")
+        local, remote = make_engine(), make_engine(tcp=True)
+        rt = ContainerRuntime(endpoints=[local.url])
+        remote_rt = ContainerRuntime(endpoints=[remote.url])
+
+        with profiling(tmp_path / "prof"):
+            asyncio.run(rt.run("prompt", str(project)))
+            asyncio.run(remote_rt.run("prompt", str(project)))
+
+        (local_spec,) = local.created
+        assert local_spec["HostConfig"]["Binds"][0] == f"{project}:/workspace:ro"
+        (remote_spec,) = remote.created
+        # Host paths don't exist on the remote engine: no binds at all, and
+        # the project arrives as a tar on stdin instead.
+        assert not remote_spec["HostConfig"].get("Binds")
+        assert "/workspace" in remote_spec["HostConfig"]["Tmpfs"]
+        assert "--workspace-tar" in remote_spec["Cmd"]
+        with tarfile.open(fileobj=io.BytesIO(remote.stdin)) as tar:
+            assert tar.getnames() == ["README.md"]
+
+    def test_fails_over_to_healthy_engine(self, make_engine, runtime_mocks):
+        broken, healthy = make_engine(), make_engine()
+        broken.fail_create = True
+        rt = ContainerRuntime(endpoints=[broken.url, healthy.url])
+
+        result = asyncio.run(rt.run("prompt", "."))
+
+        assert result.passed
+        assert len(healthy.created) == 1
+        (down, _) = rt._pool.endpoints
+        assert not down.healthy
+        assert "boom" in down.error
+
+    def test_single_engine_failure_raises(self, make_engine, runtime_mocks):
+        broken = make_engine()
+        broken.fail_create = True
+        rt = ContainerRuntime(endpoints=[broken.url])
+
+        with pytest.raises(Exception, match="boom"):
+            asyncio.run(rt.run("prompt", "."))
+
+    def test_image_copied_from_engine_that_has_it(self, make_engine, runtime_mocks):
+        popen, run = runtime_mocks
+        source, target = make_engine(), make_engine()
+        target.has_image = False
+        save = MagicMock()
+        save.returncode = 0
+        popen.return_value = save
+        run.return_value = subprocess.CompletedProcess([], 0)
+        rt = ContainerRuntime(endpoints=[source.url, target.url])
+        first, second = rt._pool.endpoints
+
+        rt._ensure_image(first)
+        rt._ensure_image(second)
+
+        assert popen.call_args[0][0] == [
+            "podman",
+            "--url",
+            source.url,
+            "save",
+            FULL_IMAGE,
+        ]
+        assert run.call_args[0][0] == ["podman", "--url", target.url, "load"]
+        assert second.image_ready
@@ -0,0 +1,214 @@
+import asyncio
+import http.client
+import io
+import tarfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from good_start.runtime import _engine_api
+from good_start.runtime._container import ContainerRuntime
+from good_start.runtime._engine_api import (
+    ContainerSpec,
+    EngineAPI,
+    EngineAPIError,
+    EngineAPISampler,
+    connect_engine,
+    parse_stats_json,
+)
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_connections():
+    _engine_api._connections.clear()
+    yield
+    _engine_api._connections.clear()
+
+
+@pytest.fixture
+def api_backend(engine, monkeypatch):
+    monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "api")
+    monkeypatch.setenv("CONTAINER_HOST", f"unix://{engine.path}")
+    with (
+        patch(
+            "good_start.runtime._container.shutil.which",
+            return_value="/usr/bin/podman",
+        ),
+        patch(
+            "good_start.runtime._container._resolve_api_key",
+            return_value="sk-test",
+        ),
+        patch("good_start.runtime._container.subprocess.Popen") as popen,
+    ):
+        yield engine
+    popen.assert_not_called()
+
+
+class TestEngineAPI:
+    def test_requests_share_one_connection(self, engine):
+        api = EngineAPI("podman", engine.path)
+        assert api.ping()
+        assert api.image_exists("good-start-agent:latest")
+        assert api.image_exists("good-start-agent:latest")
+        assert engine.connections == 1
+
+    def test_missing_image(self, engine):
+        engine.has_image = False
+        assert not EngineAPI("podman", engine.path).image_exists("nope:latest")
+
+    def test_error_status_raises(self, engine):
+        engine.fail_create = True
+        api = EngineAPI("podman", engine.path)
+        with pytest.raises(EngineAPIError, match="boom") as exc_info:
+            api.create(ContainerSpec(name="c", image="img", command=[]))
+        assert exc_info.value.status == 500
+
+    def test_broken_connection_is_replaced(self, engine):
+        api = EngineAPI("podman", engine.path)
+        assert api.ping()
+        broken = api._conn
+        error = http.client.BadStatusLine("garbage")
+        with (
+            patch.object(broken, "getresponse", side_effect=error),
+            pytest.raises(EngineAPIError, match="garbage") as exc_info,
+        ):
+            api.info()
+        assert exc_info.value.status == 0
+        assert api._conn is not broken
+        assert api.info()["NCPU"] == 4
+
+    def test_unreachable_engine_raises_api_error(self, engine):
+        api = EngineAPI("podman", engine.path)
+        engine.close()
+        with pytest.raises(EngineAPIError):
+            api.info()
+        assert not api.ping()
+
+    def test_create_config(self):
+        spec = ContainerSpec(
+            name="c",
+            image="img",
+            command=["--prompt", "p"],
+            entrypoint="python",
+            workdir="/workspace",
+            env={"KEY": "v"},
+            binds=["/src:/workspace:ro"],
+            cpus=1.5,
+            memory=1024,
+        )
+        config = spec.create_config()
+        assert config["Entrypoint"] == ["python"]
+        assert config["Env"] == ["KEY=v"]
+        assert config["HostConfig"]["NanoCpus"] == 1_500_000_000
+        assert config["HostConfig"]["Memory"] == 1024
+        assert config["OpenStdin"] is False
+
+
+class TestEngineDiscovery:
+    def test_auto_falls_back_to_cli(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "auto")
+        monkeypatch.setenv("CONTAINER_HOST", f"unix://{tmp_path}/missing.sock")
+        assert connect_engine("podman") is None
+
+    def test_api_backend_requires_socket(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "api")
+        monkeypatch.setenv("CONTAINER_HOST", f"unix://{tmp_path}/missing.sock")
+        with pytest.raises(RuntimeError, match="No podman API socket"):
+            connect_engine("podman")
+
+    def test_connection_is_shared(self, engine, monkeypatch):
+        monkeypatch.setenv("GOOD_START_ENGINE_BACKEND", "auto")
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{engine.path}")
+        api = connect_engine("docker")
+        assert api is not None
+        assert connect_engine("docker") is api
+
+    def test_cli_backend_skips_discovery(self, engine, monkeypatch):
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{engine.path}")
+        assert connect_engine("docker") is None
+        assert engine.requests == []
+
+
+class TestContainerOverAPI:
+    def test_successful_run(self, api_backend):
+        rt = ContainerRuntime(cpus=2, memory="1g")
+        result = asyncio.run(rt.run("prompt", "."))
+
+        assert result.passed is True
+        assert result.details == "All good"
+        assert result.cost_usd == 0.5
+        assert result.usage == {"input_tokens": 10}
+
+        config = api_backend.created[0]
+        assert config["Image"] == "good-start-agent:latest"
+        assert config["Cmd"][:2] == ["--prompt", "prompt"]
+        assert config["HostConfig"]["Binds"] == [f"{Path.cwd()}:/workspace:ro"]
+        assert config["HostConfig"]["NanoCpus"] == 2_000_000_000
+        assert config["HostConfig"]["Memory"] == 1024**3
+        assert config["Env"] == ["ANTHROPIC_API_KEY=sk-test"]
+        methods = [method for method, _ in api_backend.requests]
+        assert "DELETE" in methods
+        assert (result.log_paths["stdout"]).read_text().strip().endswith("}")
+
+    def test_staged_workspace_streams_over_attach(self, api_backend, tmp_path):
+        (tmp_path / "README.md").write_text("# Project")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "x.js").write_text("x")
+
+        rt = ContainerRuntime(stage="filter")
+        result = asyncio.run(rt.run("prompt", str(tmp_path)))
+
+        assert result.passed is True
+        config = api_backend.created[0]
+        assert config["OpenStdin"] is True
+        assert config["HostConfig"]["Tmpfs"] == {"/workspace": "rw,exec,mode=1777"}
+        assert "--workspace-tar" in config["Cmd"]
+        with tarfile.open(fileobj=io.BytesIO(api_backend.stdin)) as tar:
+            names = tar.getnames()
+        assert "README.md" in names
+        assert not any(n.startswith("node_modules") for n in names)
+
+    def test_oom_exit_code_retries(self, api_backend):
+        api_backend.stdout = b""
+        api_backend.exit_codes = [137, 0]
+
+        rt = ContainerRuntime(memory="1g")
+        asyncio.run(rt.run("prompt", "."))
+
+        memories = [c["HostConfig"]["Memory"] for c in api_backend.created]
+        assert memories == [1024**3, 2 * 1024**3]
+
+
+class TestAPIStats:
+    def test_cpu_percent_from_cumulative_time(self):
+        data = {"cpu_stats": {"cpu_usage": {"total_usage": 3_000_000_000}}}
+        sample, cpu_ns = parse_stats_json(data, 4.0, (2.0, 1_000_000_000))
+        # Two CPU seconds over two wall seconds.
+        assert sample.cpu_percent == pytest.approx(100.0)
+        assert cpu_ns == 3_000_000_000
+
+    def test_sampler_reads_engine_stats(self, engine):
+        api = EngineAPI("podman", engine.path)
+        assert api.ping()
+        sampler = EngineAPISampler(api, "good-start-abc", interval=0.01)
+        sampler.start()
+        while not sampler.usage.samples:
+            threading.Event().wait(0.01)
+        usage = sampler.stop()
+
+        # Stats are polled on a connection of the sampler's own, closed when
+        # it stops, so they never queue container calls behind them.
+        assert engine.connections == 2
+        assert sampler.api._conn.sock is None
+
+        assert usage.peak_memory == 64 * 1024**2
+        assert usage.cpu_seconds == pytest.approx(2.0)
+        assert (usage.net_rx, usage.net_tx) == (100, 50)
+        assert (usage.block_read, usage.block_write) == (10, 20)
@@ -57,3 +57,26 @@ class TestEntrypoint:
         call_kwargs = mock_agent_cls.return_value.run.call_args[1]
         assert "on_tool_use" in call_kwargs
         assert call_kwargs["on_tool_use"] is not None
+
+    @patch("good_start._entrypoint.Agent")
+    def test_ready_event_comes_first(self, mock_agent_cls, capsys, monkeypatch):
+        result = _make_result(passed=True, details="OK")
+        mock_agent_cls.return_value.run = AsyncMock(return_value=result)
+
+        monkeypatch.setattr(sys, "argv", ["_entrypoint", "--prompt", "test prompt"])
+        main()
+
+        first = capsys.readouterr().err.splitlines()[0]
+        assert json.loads(first) == {"ready": True}
+
+    @patch("good_start._entrypoint.Agent")
+    def test_startup_only_skips_agent(self, mock_agent_cls, capsys, monkeypatch):
+        monkeypatch.setattr(
+            sys, "argv", ["_entrypoint", "--prompt", "", "--startup-only"]
+        )
+        main()
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert json.loads(captured.err) == {"ready": True}
+        mock_agent_cls.assert_not_called()
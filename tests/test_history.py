@@ -0,0 +1,159 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ResultMessage
+
+from good_start.agent import Agent
+from good_start.history import RunHistory, percentile, record_run, target_hash
+from good_start.loader import Prompt
+from good_start.result import AgentFindings, Result
+
+
+def _make_result(passed: bool, duration=None, cost=None, minutes_ago=0) -> Result:
+    result = Result(
+        agent_messages=[], agent_result=AgentFindings(passed=passed, details="d")
+    )
+    result.timestamp = datetime.now() - timedelta(minutes=minutes_ago)
+    result.duration = duration
+    result.cost_usd = cost
+    result.usage = {"input_tokens": 100, "output_tokens": 20}
+    return result
+
+
+@pytest.fixture()
+def doc(tmp_path):
+    path = tmp_path / "README.md"
+    path.write_text("# Install\n\npip install x\n")
+    return path
+
+
+class TestPercentile:
+    def test_interpolates(self):
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([10], 95) == 10
+        assert percentile(list(range(1, 101)), 95) == pytest.approx(95.05)
+
+    def test_empty(self):
+        assert percentile([], 50) is None
+
+
+class TestTargetHash:
+    def test_changes_with_content(self, doc):
+        before = target_hash(doc)
+        doc.write_text("# Install\n\nuv add x\n")
+        assert target_hash(doc) != before
+
+    def test_directory_hashes_discovered_docs(self, doc):
+        assert target_hash(doc.parent) is not None
+        assert target_hash(doc.parent / "missing") is None
+
+
+class TestRunHistory:
+    def test_record_and_read(self, tmp_path, doc):
+        history = RunHistory(tmp_path / "h.db")
+        history.record(_make_result(True, 12.0, 0.05), str(doc), "prompt", "cli")
+
+        (row,) = history.runs()
+        assert row["target"] == str(doc.resolve())
+        assert row["source"] == "cli"
+        assert row["passed"] == 1
+        assert row["duration"] == 12.0
+        assert row["input_tokens"] == 100
+        assert row["target_hash"] == target_hash(doc)
+
+    def test_summary(self, tmp_path, doc):
+        history = RunHistory(tmp_path / "h.db")
+        outcomes = [True, False, True, True]
+        for i, passed in enumerate(outcomes):
+            result = _make_result(passed, 10.0 * (i + 1), 0.01 * (i + 1), 10 - i)
+            history.record(result, str(doc), "prompt", "pytest")
+
+        (stats,) = history.summarize()
+        assert stats.runs == 4
+        assert stats.pass_rate == 0.75
+        assert stats.p50 == 25.0
+        assert stats.p95 == pytest.approx(38.5)
+        assert stats.avg_cost == pytest.approx(0.025)
+        assert stats.cost_trend == pytest.approx(0.02)
+        # Two flips (pass->fail, fail->pass) over three comparisons.
+        assert stats.flake_rate == pytest.approx(2 / 3)
+
+    def test_changed_inputs_are_not_flakes(self, tmp_path, doc):
+        history = RunHistory(tmp_path / "h.db")
+        history.record(_make_result(False, minutes_ago=5), str(doc), "p", "cli")
+        doc.write_text("# Install\n\nfixed instructions\n")
+        history.record(_make_result(True), str(doc), "p", "cli")
+
+        (stats,) = history.summarize()
+        assert stats.flake_rate is None
+
+    def test_filters(self, tmp_path, doc):
+        history = RunHistory(tmp_path / "h.db")
+        history.record(_make_result(True, minutes_ago=60 * 48), str(doc), "p", "cli")
+        history.record(_make_result(True), str(doc), "p", "cli")
+        history.record(_make_result(True), str(tmp_path), "p", "cli")
+
+        since = (datetime.now() - timedelta(days=1)).timestamp()
+        assert len(history.summarize()) == 2
+        assert history.summarize(str(doc))[0].runs == 2
+        assert history.summarize(str(doc), since)[0].runs == 1
+
+    def test_record_run_ignores_storage_errors(self, doc):
+        with patch("good_start.history.RunHistory.record", side_effect=OSError):
+            record_run(_make_result(True), str(doc), "p", "cli")
+
+
+class TestAgentUsage:
+    def test_agent_result_carries_usage(self):
+        async def _query(prompt, options):
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1,
+                duration_api_ms=1,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                total_cost_usd=0.12,
+                usage={"input_tokens": 50, "output_tokens": 7, "service_tier": "x"},
+                structured_output={"passed": True, "details": "ok"},
+            )
+
+        with patch("good_start.agent.query", _query):
+            result = asyncio.run(Agent(prompt=Prompt(text="p")).run())
+
+        assert result.cost_usd == 0.12
+        assert result.usage == {"input_tokens": 50, "output_tokens": 7}
+        assert result.duration is not None
+
+    def test_agent_sends_static_section_as_system_prompt(self):
+        seen = {}
+
+        async def _query(prompt, options):
+            seen["prompt"], seen["system"] = prompt, options.system_prompt
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1,
+                duration_api_ms=1,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                usage={
+                    "input_tokens": 12,
+                    "cache_read_input_tokens": 900,
+                    "cache_creation_input_tokens": 40,
+                },
+                structured_output={"passed": True, "details": "ok"},
+            )
+
+        prompt = Prompt(
+            text="Rules.\n## Task\nCheck {{ target }}.",
+            metadata={"user_section": "## Task"},
+        )
+        with patch("good_start.agent.query", _query):
+            result = asyncio.run(Agent().run(prompt.render(target="README.md")))
+
+        assert seen == {"prompt": "## Task\nCheck README.md.", "system": "Rules."}
+        assert result.cache_read_tokens == 900
+        assert result.cache_write_tokens == 40
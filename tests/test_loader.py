@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from good_start.loader import Prompt, load_prompt
+from good_start.loader import SPLIT_MARKER, Prompt, load_prompt, split_prompt
 
 GOOD_START = "good_start"
 BAD_START = "bad_start"
@@ -65,12 +65,12 @@ class TestLoadPromptFromProject:
             Path(__file__).resolve().parent.parent / "src" / "good_start" / "prompt.md"
         )
         prompt = load_prompt(path)
-        assert prompt.metadata["version"] == "1.0.0"
+        assert prompt.metadata["version"] == "1.1.0"
         assert isinstance(prompt.text, str)
 
     def test_loads_default_prompt(self):
         prompt = load_prompt()
-        assert prompt.metadata["version"] == "1.0.0"
+        assert prompt.metadata["version"] == "1.1.0"
         assert isinstance(prompt.text, str)
 
 
@@ -101,3 +101,35 @@ class TestPromptRender:
         prompt = Prompt(text="{% if verbose %}Details{% else %}Summary{% endif %}")
         assert prompt.render(verbose=True) == "Details"
         assert prompt.render(verbose=False) == "Summary"
+
+
+class TestPromptSplit:
+    def test_frontmatter_declares_user_section(self):
+        prompt = Prompt(
+            text="Static rules.\n\n## Task\n\nCheck {{ target }}.\n",
+            metadata={"user_section": "## Task"},
+        )
+        system, user = split_prompt(prompt.render(target="README.md"))
+        assert system == "Static rules."
+        assert user == "## Task\n\nCheck README.md."
+
+    def test_no_split_sends_whole_prompt(self):
+        rendered = Prompt(text="Check {{ target }}.").render(target="README.md")
+        assert SPLIT_MARKER not in rendered
+        assert split_prompt(rendered) == (None, "Check README.md.")
+
+    def test_missing_user_section_line(self):
+        prompt = Prompt(text="No task here.", metadata={"user_section": "## Task"})
+        with pytest.raises(ValueError, match="## Task"):
+            prompt.render()
+
+    def test_default_prompt_system_section_is_static(self):
+        prompt = load_prompt()
+        first, _ = split_prompt(prompt.render(target="README.md"))
+        second, user = split_prompt(
+            prompt.render(target=".", doc_index=[], section="With pip")
+        )
+        assert first == second
+        assert "README.md" not in first
+        assert "README.md" in split_prompt(prompt.render(target="README.md"))[1]
+        assert "Identify the project's getting-started documentation" in user
@@ -1,7 +1,11 @@
+import asyncio
+import json
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from good_start.plugin import _SingleFlight
 from good_start.result import AgentFindings, Result
 
 
@@ -75,6 +79,150 @@ class TestFixtureCallable:
         assert "Custom instructions for ." in rendered_prompt
 
 
+class TestTieredFixture:
+    @pytest.mark.good_start(tiered=True)
+    @patch("good_start.plugin.resolve_runtime")
+    def test_marker_enables_tiers(self, mock_resolve, good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        mock_resolve.return_value = runtime
+
+        result = good_start()
+
+        assert result.tier == "smoke"
+        assert runtime.run.call_args.kwargs["tier"].name == "smoke"
+
+    @patch("good_start.plugin.resolve_runtime")
+    def test_untiered_by_default(self, mock_resolve, good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        mock_resolve.return_value = runtime
+
+        result = good_start()
+
+        assert result.tier is None
+        assert "tier" not in runtime.run.call_args.kwargs
+
+    @pytest.mark.good_start(indexed_search=True)
+    @patch("good_start.plugin.resolve_runtime")
+    def test_marker_enables_indexed_search(self, mock_resolve, good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        mock_resolve.return_value = runtime
+
+        result = good_start()
+
+        assert result.tier is None
+        tools = runtime.run.call_args.kwargs["tier"].allowed_tools
+        assert "mcp__repo__find_files" in tools
+
+
+class TestSharedRuns:
+    @patch("good_start.plugin.resolve_runtime")
+    def test_identical_calls_share_one_run(self, mock_resolve, good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        mock_resolve.return_value = runtime
+
+        first = good_start("README.md")
+        second = good_start("README.md")
+
+        assert first is second
+        runtime.run.assert_called_once()
+
+    @patch("good_start.plugin.resolve_runtime")
+    def test_different_targets_run_separately(self, mock_resolve, good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        mock_resolve.return_value = runtime
+
+        good_start("README.md")
+        good_start(".")
+
+        assert runtime.run.call_count == 2
+
+    @patch("good_start.plugin.resolve_runtime")
+    def test_failed_run_is_retried(self, mock_resolve, good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        runtime.run.side_effect = [
+            RuntimeError("engine down"),
+            runtime.run.return_value,
+        ]
+        mock_resolve.return_value = runtime
+
+        with pytest.raises(RuntimeError, match="engine down"):
+            good_start()
+        assert good_start().passed
+        assert runtime.run.call_count == 2
+
+    def test_concurrent_callers_wait_for_one_run(self):
+        flights = _SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def _slow() -> Result:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return _make_result(passed=True, details="OK")
+
+        results = []
+        owner = threading.Thread(
+            target=lambda: results.append(flights.run("session", "k", _slow))
+        )
+        owner.start()
+        started.wait(5)
+        waiter = threading.Thread(
+            target=lambda: results.append(flights.run("session", "k", _slow))
+        )
+        waiter.start()
+        release.set()
+        owner.join()
+        waiter.join()
+
+        assert len(calls) == 1
+        assert results[0][0] is results[1][0]
+        assert sorted(shared for _, shared in results) == [False, True]
+
+    @pytest.mark.good_start(share="galaxy")
+    def test_invalid_share_scope(self, good_start):
+        with pytest.raises(pytest.UsageError, match="share must be one of"):
+            good_start()
+
+
+class TestAsyncFixture:
+    @pytest.mark.anyio
+    @patch("good_start.plugin.resolve_runtime")
+    async def test_runs_on_current_loop(self, mock_resolve, async_good_start):
+        running = []
+        peak = []
+
+        async def _run(prompt, target, on_tool_use=None):
+            running.append(target)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(target)
+            return _make_result(passed=True, details=target)
+
+        runtime = MagicMock()
+        runtime.run = _run
+        mock_resolve.return_value = runtime
+
+        readme, install = await asyncio.gather(
+            async_good_start("README.md"), async_good_start("docs")
+        )
+
+        assert (readme.details, install.details) == ("README.md", "docs")
+        assert max(peak) == 2
+
+    @pytest.mark.anyio
+    @patch("good_start.plugin.resolve_runtime")
+    async def test_gathered_duplicates_share_run(self, mock_resolve, async_good_start):
+        runtime = _mock_runtime(_make_result(passed=True, details="OK"))
+        mock_resolve.return_value = runtime
+
+        first, second = await asyncio.gather(async_good_start(), async_good_start())
+
+        assert first is second
+        runtime.run.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # Integration tests — pytester runs real pytest in a subprocess
 # ---------------------------------------------------------------------------
@@ -90,6 +238,8 @@ class TestPluginRegistration:
         result.stdout.fnmatch_lines(["*--good-start-target*"])
         result.stdout.fnmatch_lines(["*--good-start-prompt*"])
         result.stdout.fnmatch_lines(["*--good-start-no-container*"])
+        result.stdout.fnmatch_lines(["*--good-start-tiered*"])
+        result.stdout.fnmatch_lines(["*--good-start-profile*"])
 
     def test_fixture_is_available(self, pytester: pytest.Pytester):
         """A test requesting the fixture can be collected."""
@@ -153,6 +303,122 @@ class TestPluginExecution:
         result = pytester.runpytest("-v")
         result.stdout.fnmatch_lines(["*test_docs*PASSED*"])
 
+    def test_report_includes_resources(self, pytester: pytest.Pytester):
+        """Container resource usage is added as a report section and properties."""
+        pytester.makeconftest(
+            """
+            from unittest.mock import AsyncMock, MagicMock, patch
+            from good_start.result import AgentFindings, Result
+            from good_start.runtime import ResourceUsage
+
+            _patcher = None
+
+            def pytest_configure(config):
+                global _patcher
+                _patcher = patch("good_start.plugin.resolve_runtime")
+                mock_resolve = _patcher.start()
+                result = Result([], AgentFindings(passed=True, details="ok"))
+                result.resources = ResourceUsage(peak_memory=2048, cpu_seconds=1.5)
+                runtime = MagicMock()
+                runtime.run = AsyncMock(return_value=result)
+                mock_resolve.return_value = runtime
+
+            def pytest_unconfigure(config):
+                if _patcher:
+                    _patcher.stop()
+            """
+        )
+        pytester.makepyfile(
+            """
+            def test_docs(good_start):
+                assert good_start().passed
+            """
+        )
+        result = pytester.runpytest("-rA", "--junitxml=report.xml")
+        result.stdout.fnmatch_lines(["*good-start resources*"])
+        result.stdout.fnmatch_lines(["*peak memory 2.0KiB, CPU 1.5s*"])
+        xml = (pytester.path / "report.xml").read_text()
+        assert 'name="good_start_peak_memory_bytes" value="2048"' in xml
+
+    def test_profile_per_test(self, pytester: pytest.Pytester, tmp_path):
+        """--good-start-profile writes one host profile per test."""
+        pytester.makeconftest(
+            """
+            from unittest.mock import AsyncMock, MagicMock, patch
+            from good_start.result import AgentFindings, Result
+
+            _patcher = None
+
+            def pytest_configure(config):
+                global _patcher
+                _patcher = patch("good_start.plugin.resolve_runtime")
+                mock_resolve = _patcher.start()
+                findings = AgentFindings(passed=True, details="All good!")
+                runtime = MagicMock()
+                runtime.run = AsyncMock(return_value=Result([], findings))
+                mock_resolve.return_value = runtime
+
+            def pytest_unconfigure(config):
+                if _patcher:
+                    _patcher.stop()
+            """
+        )
+        pytester.makepyfile(
+            """
+            def test_docs(good_start):
+                assert good_start().passed
+            """
+        )
+        out = tmp_path / "profiles"
+        result = pytester.runpytest(f"--good-start-profile={out}")
+        result.assert_outcomes(passed=1)
+        (test_dir,) = out.iterdir()
+        assert test_dir.name.endswith("test_docs")
+        assert (test_dir / "host.pstats").exists()
+
+    def test_streams_report(self, pytester: pytest.Pytester):
+        """--good-start-format writes one record per run as tests finish."""
+        pytester.makeconftest(
+            """
+            from unittest.mock import MagicMock, patch
+            from good_start.result import AgentFindings, Result
+
+            _patcher = None
+
+            async def _run(prompt, target, on_tool_use=None, tier=None):
+                on_tool_use("Bash", {"command": "pip install ."})
+                return Result([], AgentFindings(passed=True, details="ok"))
+
+            def pytest_configure(config):
+                global _patcher
+                _patcher = patch("good_start.plugin.resolve_runtime")
+                mock_resolve = _patcher.start()
+                runtime = MagicMock()
+                runtime.run = _run
+                mock_resolve.return_value = runtime
+
+            def pytest_unconfigure(config):
+                if _patcher:
+                    _patcher.stop()
+            """
+        )
+        pytester.makepyfile(
+            """
+            def test_one(good_start):
+                assert good_start().passed
+
+            def test_two(good_start):
+                assert good_start().passed
+            """
+        )
+        result = pytester.runpytest("--good-start-format=ndjson")
+        result.assert_outcomes(passed=2)
+        lines = (pytester.path / "good-start-report.ndjson").read_text().splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["type"] for r in records] == ["event", "result"] * 2
+        assert records[1]["name"].endswith("::test_one")
+        assert records[0]["run"] == records[1]["name"]
+
     def test_failure_includes_details(self, pytester: pytest.Pytester):
         """On failure, agent details appear in the report output."""
         pytester.makeconftest(
@@ -188,3 +454,130 @@ class TestPluginExecution:
         result.stdout.fnmatch_lines(["*test_docs*FAILED*"])
         result.stdout.fnmatch_lines(["*good-start agent details*"])
         result.stdout.fnmatch_lines(["*pip install broke on step 3*"])
+
+    @pytest.mark.parametrize(
+        ("args", "runs"),
+        [
+            ((), 4),
+            (("--good-start-share=module",), 2),
+            (("--good-start-share=session",), 1),
+        ],
+    )
+    def test_share_scope(self, pytester: pytest.Pytester, args, runs):
+        """Identical runs are shared across the configured scope."""
+        pytester.makeconftest(
+            """
+            from unittest.mock import AsyncMock, MagicMock, patch
+            from good_start.result import AgentFindings, Result
+
+            _patcher = None
+            runtime = MagicMock()
+            runtime.run = AsyncMock(
+                return_value=Result([], AgentFindings(passed=True, details="ok"))
+            )
+
+            def pytest_configure(config):
+                global _patcher
+                _patcher = patch("good_start.plugin.resolve_runtime")
+                _patcher.start().return_value = runtime
+
+            def pytest_unconfigure(config):
+                _patcher.stop()
+                with open("runs.txt", "w") as f:
+                    f.write(str(runtime.run.call_count))
+            """
+        )
+        test_body = """
+            def test_one(good_start):
+                assert good_start("README.md").passed
+
+            def test_two(good_start):
+                assert good_start("README.md").passed
+            """
+        pytester.makepyfile(test_a=test_body, test_b=test_body)
+        result = pytester.runpytest(*args)
+        result.assert_outcomes(passed=4)
+        assert (pytester.path / "runs.txt").read_text() == str(runs)
+
+    def test_marker_overrides_share_scope(self, pytester: pytest.Pytester):
+        pytester.makeconftest(
+            """
+            from unittest.mock import AsyncMock, MagicMock, patch
+            from good_start.result import AgentFindings, Result
+
+            _patcher = None
+            runtime = MagicMock()
+            runtime.run = AsyncMock(
+                return_value=Result([], AgentFindings(passed=True, details="ok"))
+            )
+
+            def pytest_configure(config):
+                global _patcher
+                _patcher = patch("good_start.plugin.resolve_runtime")
+                _patcher.start().return_value = runtime
+
+            def pytest_unconfigure(config):
+                _patcher.stop()
+                with open("runs.txt", "w") as f:
+                    f.write(str(runtime.run.call_count))
+            """
+        )
+        pytester.makepyfile(
+            """
+            import pytest
+
+            pytestmark = pytest.mark.good_start(share="module")
+
+            def test_one(good_start):
+                assert good_start().passed
+
+            @pytest.mark.parametrize("n", [1, 2])
+            def test_param(good_start, n):
+                assert good_start().passed
+            """
+        )
+        result = pytester.runpytest()
+        result.assert_outcomes(passed=3)
+        assert (pytester.path / "runs.txt").read_text() == "1"
+
+    def test_async_failure_lists_each_target(self, pytester: pytest.Pytester):
+        """Details of every run in an async test appear in its failure report."""
+        pytester.makeconftest(
+            """
+            from unittest.mock import MagicMock, patch
+            from good_start.result import AgentFindings, Result
+
+            _patcher = None
+
+            async def _run(prompt, target, on_tool_use=None):
+                return Result([], AgentFindings(passed=False, details=f"{target} broke"))
+
+            def pytest_configure(config):
+                global _patcher
+                _patcher = patch("good_start.plugin.resolve_runtime")
+                runtime = MagicMock()
+                runtime.run = _run
+                _patcher.start().return_value = runtime
+
+            def pytest_unconfigure(config):
+                _patcher.stop()
+            """
+        )
+        pytester.makepyfile(
+            """
+            import asyncio
+            import pytest
+
+            @pytest.mark.anyio
+            async def test_docs(async_good_start):
+                results = await asyncio.gather(
+                    async_good_start("README.md"), async_good_start(".")
+                )
+                assert all(r.passed for r in results)
+            """
+        )
+        result = pytester.runpytest()
+        result.assert_outcomes(failed=1)
+        result.stdout.fnmatch_lines(["*good-start agent details (README.md)*"])
+        result.stdout.fnmatch_lines(["*README.md broke*"])
+        result.stdout.fnmatch_lines(["*good-start agent details (.)*"])
@@ -0,0 +1,50 @@
+import asyncio
+import pstats
+
+from good_start.profiling import profile_dir, profiling
+
+
+def _host_work():
+    return sum(range(1000))
+
+
+def _thread_work():
+    return sum(range(1000))
+
+
+def _functions(path) -> set[str]:
+    return {name for _, _, name in pstats.Stats(str(path)).stats}
+
+
+class TestProfiling:
+    def test_writes_host_stats(self, tmp_path):
+        with profiling(tmp_path / "prof") as out:
+            assert profile_dir() == out
+            _host_work()
+
+        assert profile_dir() is None
+        assert "_host_work" in _functions(tmp_path / "prof" / "host.pstats")
+
+    def test_includes_worker_threads(self, tmp_path):
+        async def _main():
+            assert await asyncio.to_thread(profile_dir) == tmp_path
+            await asyncio.to_thread(_thread_work)
+
+        with profiling(tmp_path):
+            asyncio.run(_main())
+
+        assert "_thread_work" in _functions(tmp_path / "host.pstats")
+
+    def test_overlapping_blocks_share_profiler(self, tmp_path):
+        async def _check():
+            with profiling(tmp_path):
+                await asyncio.sleep(0.01)
+                _host_work()
+
+        async def _main():
+            await asyncio.gather(_check(), _check())
+
+        asyncio.run(_main())
+
+        assert profile_dir() is None
+        assert "_host_work" in _functions(tmp_path / "host.pstats")
@@ -0,0 +1,141 @@
+import io
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from good_start.report import JSONWriter, ReportWriter, open_report, result_record
+from good_start.result import AgentFindings, AgentStep, Result
+
+
+def _make_result(passed: bool, details: str) -> Result:
+    findings = AgentFindings(
+        passed=passed,
+        details=details,
+        steps=[AgentStep(tool="Bash", input="pip install x", output="ok")],
+        verification_command="python -c 'import x'",
+    )
+    result = Result(agent_messages=[], agent_result=findings)
+    result.duration = 12.5
+    result.cost_usd = 0.25
+    result.usage = {"input_tokens": 100}
+    return result
+
+
+class TestResultRecord:
+    def test_includes_findings_and_timing(self):
+        record = result_record("README.md", _make_result(True, "ok"))
+        assert record["name"] == "README.md"
+        assert record["passed"] is True
+        assert record["steps"][0]["input"] == "pip install x"
+        assert record["verification_command"] == "python -c 'import x'"
+        assert record["duration"] == 12.5
+        assert record["cost_usd"] == 0.25
+        assert record["usage"] == {"input_tokens": 100}
+        assert record["resources"] is None
+
+
+class TestWriters:
+    def test_ndjson_streams_events_and_results(self, tmp_path):
+        path = tmp_path / "report.ndjson"
+        with open_report("ndjson", path) as report:
+            report.sink("README.md")("Bash", {"command": "make"})
+            report.result("README.md", _make_result(True, "ok"))
+            # Records are on disk before the report is closed.
+            lines = path.read_text().splitlines()
+            assert len(lines) == 2
+
+        event, result = (json.loads(line) for line in lines)
+        assert event["type"] == "event"
+        assert event["run"] == "README.md"
+        assert event["input"] == {"command": "make"}
+        assert result["type"] == "result"
+        assert result["passed"] is True
+
+    def test_json_document(self, tmp_path):
+        path = tmp_path / "report.json"
+        with open_report("json", path) as report:
+            report.sink()("Bash", {"command": "make"})
+            report.result("a.md", _make_result(True, "ok"))
+            report.result("b.md", _make_result(False, "broken"))
+            assert '"a.md"' in path.read_text()
+
+        data = json.loads(path.read_text())
+        assert [r["name"] for r in data["results"]] == ["a.md", "b.md"]
+        assert data["summary"] == {"total": 2, "passed": 1, "failed": 1}
+
+    def test_concurrent_json_results_stay_valid(self):
+        class _SlowJSONWriter(JSONWriter):
+            def format_result(self, name, result):
+                text = super().format_result(name, result)
+                # Widen the window between formatting and writing.
+                time.sleep(0.001)
+                return text
+
+        buffer = io.StringIO()
+        writer = _SlowJSONWriter(buffer)
+
+        def _write(i: int) -> None:
+            for j in range(10):
+                writer.result(f"doc-{i}-{j}", _make_result(True, "ok"))
+
+        threads = [threading.Thread(target=_write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        document = json.loads(buffer.getvalue())
+        assert len(document["results"]) == 80
+        assert document["summary"]["total"] == 80
+
+    def test_empty_json_document_is_valid(self):
+        out = io.StringIO()
+        JSONWriter(out).close()
+        assert json.loads(out.getvalue())["summary"]["total"] == 0
+
+    def test_junit_xml(self, tmp_path):
+        path = tmp_path / "report.xml"
+        with open_report("junit", path) as report:
+            report.result("a.md", _make_result(True, "ok"))
+            report.result("b <docs>.md", _make_result(False, "Step 2 failed\nmore"))
+
+        suite = ET.parse(path).getroot()
+        cases = suite.findall("testcase")
+        assert [c.get("name") for c in cases] == ["a.md", "b <docs>.md"]
+        assert cases[0].get("time") == "12.500"
+        assert cases[0].find("failure") is None
+        failure = cases[1].find("failure")
+        assert failure.get("message") == "Step 2 failed"
+        assert failure.text == "Step 2 failed\nmore"
+        props = {p.get("name"): p.get("value") for p in cases[0].iter("property")}
+        assert props["cost_usd"] == "0.25"
+        assert props["usage.input_tokens"] == "100"
+        assert "pip install x" in cases[0].find("system-out").text
+
+    def test_junit_strips_control_characters(self, tmp_path):
+        path = tmp_path / "report.xml"
+        result = _make_result(False, "\x1b[31mFAILED\x1b[0m: exit\x00 code 1\x07\n")
+        result.steps[0].input = "ls\x1b[1m -la\x08"
+        with open_report("junit", path) as report:
+            report.result("a\x01.md", result)
+
+        case = ET.parse(path).getroot().find("testcase")
+        assert case.get("name") == "a.md"
+        assert case.find("failure").get("message") == "FAILED: exit code 1"
+        assert case.find("failure").text == "FAILED: exit code 1\n"
+        assert case.find("system-out").text == "Bash: ls -la"
+
+    def test_writer_must_format_results(self):
+        class _Incomplete(ReportWriter):
+            pass
+
+        with pytest.raises(TypeError, match="format_result"):
+            _Incomplete(io.StringIO())
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown report format"):
+            open_report("yaml")
@@ -1,13 +1,33 @@
 import asyncio
+import io
+import os
 import subprocess
+import tarfile
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from good_start.profiling import profiling
 from good_start.result import AgentFindings, Result
 from good_start.runtime import resolve_runtime
+from good_start.runtime._capacity import HostCapacity, format_memory, parse_memory
 from good_start.runtime._container import ContainerRuntime, _detect_engine
 from good_start.runtime._local import LocalRuntime
+from good_start.runtime._logs import LogCapture, finish_run_log_dir, run_log_dir
+from good_start.runtime._resources import (
+    MAX_SAMPLES,
+    ResourceSample,
+    ResourceSampler,
+    ResourceUsage,
+    parse_size,
+    parse_stats_line,
+)
+from good_start.runtime._staging import (
+    extract_workspace_tar,
+    list_workspace_files,
+    write_workspace_tar,
+)
 
 
 def _make_result(passed: bool, details: str) -> Result:
@@ -80,7 +100,7 @@ def _mock_popen(stdout: str, stderr: str = "", returncode: int = 0):
         return ""
 
     proc = MagicMock()
-    proc.stdout.read.return_value = stdout
+    proc.stdout.__iter__.return_value = iter(stdout.splitlines(keepends=True))
     proc.stderr.readline = _readline
     proc.poll.return_value = returncode
     proc.returncode = returncode
@@ -167,3 +187,465 @@ class TestContainerRuntime:
         result = asyncio.run(rt.run("prompt", "."))
 
         assert result.passed is True
+
+
+class TestWorkspaceStaging:
+    def _make_tree(self, root):
+        (root / "docs").mkdir()
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "README.md").write_text("readme")
+        (root / "docs" / "install.md").write_text("install")
+        (root / "node_modules" / "pkg" / "index.js").write_text("js")
+        (root / "data.bin").write_text("blob")
+
+    def test_filter_mode_applies_default_excludes(self, tmp_path):
+        self._make_tree(tmp_path)
+        files = list_workspace_files(tmp_path, "filter")
+        assert files == ["README.md", "data.bin", "docs/install.md"]
+
+    def test_filter_mode_include_and_exclude(self, tmp_path):
+        self._make_tree(tmp_path)
+        files = list_workspace_files(
+            tmp_path, "filter", include=["*.md", "*.bin"], exclude=["docs/"]
+        )
+        assert files == ["README.md", "data.bin"]
+
+    def test_user_excludes_add_to_defaults(self, tmp_path):
+        self._make_tree(tmp_path)
+        files = list_workspace_files(tmp_path, "filter", exclude=["data.bin"])
+        assert files == ["README.md", "docs/install.md"]
+
+    def test_default_excludes_can_be_turned_off(self, tmp_path):
+        self._make_tree(tmp_path)
+        files = list_workspace_files(
+            tmp_path, "filter", exclude=["docs/"], default_excludes=False
+        )
+        assert files == ["README.md", "data.bin", "node_modules/pkg/index.js"]
+
+    def test_git_mode_lists_tracked_files(self, tmp_path):
+        self._make_tree(tmp_path)
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        subprocess.run(
+            ["git", "-C", str(tmp_path), "add", "README.md", "docs"], check=True
+        )
+        files = list_workspace_files(tmp_path, "git")
+        assert files == ["README.md", "docs/install.md"]
+
+    def test_git_mode_outside_repo_raises(self, tmp_path):
+        with pytest.raises(RuntimeError, match="not a git repository"):
+            list_workspace_files(tmp_path, "git")
+
+    def test_unknown_mode_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown stage mode"):
+            list_workspace_files(tmp_path, "everything")
+
+    def test_tar_round_trip(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        self._make_tree(src)
+        buf = io.BytesIO()
+        write_workspace_tar(src, ["README.md", "docs/install.md"], buf)
+        buf.seek(0)
+
+        dest = tmp_path / "dest"
+        dest.mkdir()
+        extract_workspace_tar(buf, dest)
+        assert (dest / "docs" / "install.md").read_text() == "install"
+        assert not (dest / "node_modules").exists()
+
+    @patch("good_start.runtime._container._resolve_api_key", return_value="sk-test")
+    @patch("good_start.runtime._container.subprocess.Popen")
+    @patch("good_start.runtime._container.subprocess.run")
+    @patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+    def test_container_streams_staged_workspace(
+        self, _mock_which, mock_run, mock_popen, _mock_key, tmp_path
+    ):
+        self._make_tree(tmp_path)
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        proc = _mock_popen(stdout='{"passed": true, "details": "OK"}')
+        proc.stdin.buffer = io.BytesIO()
+        proc.stdin.close = MagicMock()
+        mock_popen.return_value = proc
+
+        rt = ContainerRuntime(stage="filter")
+        result = asyncio.run(rt.run("prompt", str(tmp_path)))
+
+        assert result.passed is True
+        cmd = mock_popen.call_args[0][0]
+        assert "--workspace-tar" in cmd
+        assert "--tmpfs" in cmd
+        assert not any(arg.endswith(":/workspace:ro") for arg in cmd)
+        with tarfile.open(fileobj=io.BytesIO(proc.stdin.buffer.getvalue())) as tar:
+            names = tar.getnames()
+        assert "README.md" in names
+        assert not any(n.startswith("node_modules") for n in names)
+
+
+class TestMemorySizes:
+    def test_parse_units(self):
+        assert parse_memory("512m") == 512 * 1024**2
+        assert parse_memory("2g") == 2 * 1024**3
+        assert parse_memory("1.5GiB") == int(1.5 * 1024**3)
+        assert parse_memory("1024") == 1024
+
+    def test_parse_invalid(self):
+        with pytest.raises(ValueError, match="Invalid memory size"):
+            parse_memory("lots")
+
+    def test_format_round_trip(self):
+        assert format_memory(4 * 1024**3) == "4g"
+        assert format_memory(1536 * 1024**2) == "1536m"
+        assert format_memory(1000) == "1000b"
+
+
+class TestHostCapacity:
+    def test_queues_runs_that_do_not_fit(self):
+        capacity = HostCapacity(cpus=2, memory=4 * 1024**3)
+        peak = {"cpus": 0.0, "waiting": 0}
+
+        async def _run():
+            async with capacity.reserve(1.0, 2 * 1024**3):
+                peak["cpus"] = max(peak["cpus"], capacity.used_cpus)
+                peak["waiting"] = max(peak["waiting"], capacity.waiting)
+                await asyncio.sleep(0.01)
+
+        async def _main():
+            await asyncio.gather(*(_run() for _ in range(5)))
+
+        asyncio.run(_main())
+        assert peak["cpus"] == 2.0
+        assert peak["waiting"] >= 1
+        assert capacity.used_cpus == 0
+        assert capacity.used_memory == 0
+
+    def test_oversized_request_is_clamped(self):
+        capacity = HostCapacity(cpus=2, memory=1024)
+
+        async def _main():
+            async with capacity.reserve(8.0, 4096):
+                return capacity.used_cpus, capacity.used_memory
+
+        assert asyncio.run(_main()) == (2, 1024)
+
+
+@patch("good_start.runtime._container._resolve_api_key", return_value="sk-test-key")
+@patch("good_start.runtime._container.subprocess.run")
+@patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+class TestContainerResourceLimits:
+    @patch("good_start.runtime._container.subprocess.Popen")
+    def test_limits_added_to_command(self, mock_popen, _which, mock_run, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.return_value = _mock_popen(
+            stdout='{"passed": true, "details": "OK"}'
+        )
+
+        rt = ContainerRuntime(cpus=2, memory="1g")
+        asyncio.run(rt.run("prompt", "."))
+
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("--cpus") + 1] == "2"
+        assert cmd[cmd.index("--memory") + 1] == "1g"
+
+    @patch("good_start.runtime._container.subprocess.Popen")
+    def test_oom_retried_with_larger_limit(self, mock_popen, _which, mock_run, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.side_effect = [
+            _mock_popen(stdout="", returncode=137),
+            _mock_popen(stdout='{"passed": true, "details": "OK"}'),
+        ]
+
+        rt = ContainerRuntime(memory="1g")
+        result = asyncio.run(rt.run("prompt", "."))
+
+        assert result.passed is True
+        retry_cmd = mock_popen.call_args_list[1][0][0]
+        assert retry_cmd[retry_cmd.index("--memory") + 1] == "2g"
+
+    @patch("good_start.runtime._container.subprocess.Popen")
+    def test_oom_retried_only_once(self, mock_popen, _which, mock_run, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.side_effect = [
+            _mock_popen(stdout="", returncode=-9),
+            _mock_popen(stdout="", returncode=-9),
+        ]
+
+        rt = ContainerRuntime(memory="512m")
+        result = asyncio.run(rt.run("prompt", "."))
+
+        assert result.passed is False
+        assert "OOM" in result.details
+        assert "--memory 1g" in result.details
+        assert mock_popen.call_count == 2
+
+    @patch("good_start.runtime._container.subprocess.Popen")
+    def test_no_retry_without_memory_limit(self, mock_popen, _which, mock_run, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.return_value = _mock_popen(stdout="", returncode=-9)
+
+        rt = ContainerRuntime()
+        result = asyncio.run(rt.run("prompt", "."))
+
+        assert "OOM" in result.details
+        assert mock_popen.call_count == 1
+
+
+@patch("good_start.runtime._container._resolve_api_key", return_value="sk-test-key")
+@patch("good_start.runtime._container.subprocess.run")
+@patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+class TestContainerCancellation:
+    def test_cancel_removes_container(self, _which, mock_run, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        rt = ContainerRuntime()
+
+        def _slow_container(cmd, *args):
+            time.sleep(0.2)
+            return 0, [], {}
+
+        async def _main():
+            with patch.object(rt, "_run_container", side_effect=_slow_container):
+                task = asyncio.create_task(rt.run("prompt", "."))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(_main())
+        rm_call = mock_run.call_args_list[-1][0][0]
+        assert rm_call[:3] == ["podman", "rm", "-f"]
+        assert rm_call[3].startswith("good-start-")
+
+
+class TestLogCapture:
+    def test_keeps_only_tail_in_memory(self, tmp_path):
+        log = LogCapture(tmp_path / "out.log", tail_lines=3)
+        for i in range(10):
+            log.write(f"line {i}\n")
+        log.close()
+        assert list(log.tail) == ["line 7", "line 8", "line 9"]
+        assert log.last_line() == "line 9"
+        assert (tmp_path / "out.log").read_text().splitlines()[0] == "line 0"
+
+    def test_rotates_at_size_limit(self, tmp_path):
+        log = LogCapture(tmp_path / "out.log", max_bytes=20, backups=2)
+        for i in range(6):
+            log.write(f"line-{i:04d}")  # 10 bytes with newline
+        log.close()
+        assert (tmp_path / "out.log").read_text() == "line-0004\nline-0005\n"
+        assert (tmp_path / "out.log.1").read_text() == "line-0002\nline-0003\n"
+        assert (tmp_path / "out.log.2").read_text() == "line-0000\nline-0001\n"
+        assert not (tmp_path / "out.log.3").exists()
+        assert log.total_bytes == 60
+
+    def test_run_log_dir_prunes_oldest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("good_start.runtime._logs.KEEP_RUNS", 2)
+        for age, name in enumerate(("a", "b")):
+            path = run_log_dir(name, root=tmp_path)
+            finish_run_log_dir(path)
+            os.utime(path, (age, age))
+        run_log_dir("c", root=tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["b", "c"]
+
+    def test_run_log_dir_keeps_running_runs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("good_start.runtime._logs.KEEP_RUNS", 2)
+        # Unfinished directories survive however many runs start after them.
+        run_log_dir("running", root=tmp_path)
+        for age, name in enumerate(("a", "b")):
+            path = run_log_dir(name, root=tmp_path)
+            finish_run_log_dir(path)
+            os.utime(path, (time.time() + age, time.time() + age))
+        run_log_dir("c", root=tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["b", "c", "running"]
+
+    def test_run_log_dir_prunes_stale_unfinished(self, tmp_path):
+        os.utime(run_log_dir("crashed", root=tmp_path), (0, 0))
+        run_log_dir("c", root=tmp_path)
+        assert [p.name for p in tmp_path.iterdir()] == ["c"]
+
+
+@patch("good_start.runtime._container._resolve_api_key", return_value="sk-test-key")
+@patch("good_start.runtime._container.subprocess.Popen")
+@patch("good_start.runtime._container.subprocess.run")
+@patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+class TestContainerLogs:
+    def test_output_is_written_to_logs(self, _which, mock_run, mock_popen, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        noise = "".join(f"build output {i}\n" for i in range(500))
+        mock_popen.return_value = _mock_popen(
+            stdout=noise + '{"passed": true, "details": "OK"}\n',
+            stderr="warning: something\n",
+        )
+
+        result = asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        assert result.passed is True
+        stdout_log = result.log_paths["stdout"].read_text().splitlines()
+        assert len(stdout_log) == 501
+        assert stdout_log[0] == "build output 0"
+        assert "warning: something" in result.log_paths["stderr"].read_text()
+
+    def test_failure_details_point_at_logs(self, _which, mock_run, mock_popen, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.return_value = _mock_popen(stdout="Traceback...\n", returncode=1)
+
+        result = asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        assert result.passed is False
+        assert str(result.log_paths["stdout"].parent) in result.details
+
+    def test_verbose_echo_is_bounded(
+        self, _which, mock_run, mock_popen, _key, capsys, monkeypatch
+    ):
+        monkeypatch.setattr("good_start.runtime._container._ECHO_LINES", 5)
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        stderr = "".join(f"noise {i}\n" for i in range(50))
+        mock_popen.return_value = _mock_popen(
+            stdout='{"passed": true, "details": "OK"}\n', stderr=stderr
+        )
+
+        result = asyncio.run(ContainerRuntime(verbose=True).run("prompt", "."))
+
+        err = capsys.readouterr().err
+        assert "noise 4" in err
+        assert "noise 5" not in err
+        assert "further output in" in err
+        assert len(result.log_paths["stderr"].read_text().splitlines()) == 50
+
+
+@patch("good_start.runtime._container._resolve_api_key", return_value="sk-test-key")
+@patch("good_start.runtime._container.subprocess.Popen")
+@patch("good_start.runtime._container.subprocess.run")
+@patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+class TestContainerProfiling:
+    def test_entrypoint_runs_under_cprofile(
+        self, _which, mock_run, mock_popen, _key, tmp_path
+    ):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.return_value = _mock_popen(
+            stdout='{"passed": true, "details": "OK"}'
+        )
+
+        with profiling(tmp_path / "prof") as out:
+            asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        cmd = mock_popen.call_args[0][0]
+        (container_out,) = out.glob("container-*")
+        assert f"{container_out}:/profile:rw" in cmd
+        # Only the subdirectory good-start created is opened up.
+        assert container_out.stat().st_mode & 0o777 == 0o777
+        assert out.stat().st_mode & 0o777 != 0o777
+        assert cmd[cmd.index("--entrypoint") + 1] == "/opt/venv/bin/python"
+        image = cmd.index("good-start-agent:latest")
+        assert cmd[image + 1 : image + 4] == ["-m", "cProfile", "-o"]
+        assert cmd[image + 4].startswith("/profile/good-start-")
+        assert cmd[image + 5 : image + 7] == ["-m", "good_start._entrypoint"]
+        assert (out / "host.pstats").exists()
+
+    def test_no_profile_args_by_default(self, _which, mock_run, mock_popen, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        mock_popen.return_value = _mock_popen(
+            stdout='{"passed": true, "details": "OK"}'
+        )
+
+        asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        cmd = mock_popen.call_args[0][0]
+        assert "--entrypoint" not in cmd
+        assert "cProfile" not in cmd
+
+
+class TestResourceStats:
+    def test_parse_size(self):
+        assert parse_size("0B") == 0
+        assert parse_size("1.5kB") == 1500
+        assert parse_size("12.5MiB") == int(12.5 * 1024**2)
+        assert parse_size(" 2GB ") == 2 * 1000**3
+        assert parse_size("--") is None
+
+    def test_parse_stats_line(self):
+        sample = parse_stats_line(
+            "150.00%|512MiB / 2GiB|1.2kB / 3kB|4MB / 8MB", elapsed=2.0
+        )
+        assert sample == ResourceSample(
+            elapsed=2.0,
+            cpu_percent=150.0,
+            memory=512 * 1024**2,
+            net_rx=1200,
+            net_tx=3000,
+            block_read=4_000_000,
+            block_write=8_000_000,
+        )
+        assert parse_stats_line("garbage", 1.0) is None
+
+    def test_usage_summary(self):
+        usage = ResourceUsage()
+        usage.add(ResourceSample(1.0, 100.0, 100, 10, 5, 0, 0, cpu_seconds=1.0))
+        usage.add(ResourceSample(3.0, 50.0, 300, 20, 8, 1, 2, cpu_seconds=2.0))
+        usage.add(ResourceSample(4.0, 200.0, 200, 25, 9, 1, 2, cpu_seconds=4.0))
+        assert usage.peak_memory == 300
+        # Cumulative CPU time, as of the last reading.
+        assert usage.cpu_seconds == pytest.approx(4.0)
+        assert (usage.net_rx, usage.net_tx) == (25, 9)
+        assert ResourceUsage.from_dict(usage.to_dict()) == usage
+        assert "peak memory 300B, CPU 4.0s" in usage.summary()
+
+    def test_cpu_time_unknown_without_cumulative_readings(self):
+        # `stats --no-stream` percentages can't be integrated into CPU time.
+        usage = ResourceUsage()
+        usage.add(ResourceSample(1.0, 100.0, 100, 0, 0, 0, 0))
+        usage.add(ResourceSample(2.0, 100.0, 100, 0, 0, 0, 0))
+        assert usage.cpu_seconds is None
+        assert "CPU" not in usage.summary()
+
+    def test_long_series_is_thinned(self):
+        usage = ResourceUsage()
+        for i in range(MAX_SAMPLES + 1):
+            usage.add(ResourceSample(float(i + 1), 100.0, i, 0, 0, 0, 0, float(i + 1)))
+        assert len(usage.samples) <= MAX_SAMPLES // 2 + 1
+        assert usage.samples[-1].elapsed == MAX_SAMPLES + 1
+        assert usage.cpu_seconds == pytest.approx(MAX_SAMPLES + 1)
+        assert usage.peak_memory == MAX_SAMPLES
+
+    @patch("good_start.runtime._resources.subprocess.run")
+    def test_sampler_polls_engine(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(
+            [], 0, stdout="10%|1MiB / 1GiB|0B / 0B|0B / 0B\n"
+        )
+        sampler = ResourceSampler("podman", "good-start-abc", interval=0.01)
+        sampler.start()
+        time.sleep(0.05)
+        usage = sampler.stop()
+
+        assert usage.samples
+        assert usage.peak_memory == 1024**2
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:3] == ["podman", "stats", "--no-stream"]
+        assert cmd[-1] == "good-start-abc"
+
+    @patch("good_start.runtime._resources.subprocess.run", side_effect=OSError)
+    def test_sampler_survives_errors(self, _mock_run):
+        sampler = ResourceSampler("podman", "x", interval=0.01)
+        sampler.start()
+        time.sleep(0.03)
+        assert sampler.stop().samples == []
+
+    @patch("good_start.runtime._container._resolve_api_key", return_value="sk-test-key")
+    @patch("good_start.runtime._container.subprocess.Popen")
+    @patch("good_start.runtime._container.subprocess.run")
+    @patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+    def test_result_carries_resources(self, _which, mock_run, mock_popen, _key):
+        def _run(cmd, **kwargs):
+            if cmd[1] == "stats":
+                return subprocess.CompletedProcess(
+                    cmd, 0, stdout="0%|64MiB / 1GiB|1kB / 2kB|0B / 0B\n"
+                )
+            return subprocess.CompletedProcess(cmd, 0)
+
+        mock_run.side_effect = _run
+        mock_popen.return_value = _mock_popen(
+            stdout='{"passed": true, "details": "OK"}'
+        )
+
+        result = asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        assert result.resources is not None
+        assert result.resources.peak_memory == 64 * 1024**2
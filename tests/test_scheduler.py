@@ -0,0 +1,189 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ResultError, ResultMessage
+
+from good_start.agent import Agent
+from good_start.loader import Prompt
+from good_start.scheduler import (
+    Scheduler,
+    TransientAPIError,
+    get_scheduler,
+    is_transient_error,
+)
+
+
+def _result_message(structured_output=None) -> ResultMessage:
+    return ResultMessage(
+        subtype="success",
+        duration_ms=1,
+        duration_api_ms=1,
+        is_error=False,
+        num_turns=1,
+        session_id="s",
+        structured_output=structured_output,
+    )
+
+
+def _fake_query(failures: int, calls: dict):
+    """Return a fake SDK ``query`` that raises a 429 for the first N calls."""
+
+    async def _query(prompt, options):
+        calls["n"] = calls.get("n", 0) + 1
+        if calls["n"] <= failures:
+            raise ResultError(
+                "API Error: 429 rate_limit_error",
+                {"api_error_status": 429},
+                exit_code=1,
+            )
+        yield _result_message({"passed": True, "details": "OK"})
+
+    return _query
+
+
+def _fast_scheduler(**kwargs) -> Scheduler:
+    kwargs.setdefault("base_delay", 0)
+    return Scheduler(**kwargs)
+
+
+class TestIsTransientError:
+    def test_result_error_status(self):
+        error = ResultError("API Error", {"api_error_status": 529}, exit_code=1)
+        assert is_transient_error(error)
+
+    def test_message_text_is_not_classified(self):
+        # Paths, ids and byte counts can contain "429"; only statuses count.
+        assert not is_transient_error(OSError("/tmp/run-429/out.log: no space"))
+        assert not is_transient_error(
+            ResultError("API Error: 429 rate_limit_error", {}, exit_code=1)
+        )
+
+    def test_status_attribute(self):
+        exc = Exception("boom")
+        exc.status_code = 529
+        assert is_transient_error(exc)
+
+    def test_transient_api_error(self):
+        assert is_transient_error(TransientAPIError("x"))
+
+    def test_other_errors_are_not_transient(self):
+        assert not is_transient_error(ValueError("invalid prompt"))
+
+
+class TestScheduler:
+    def test_retries_then_succeeds(self):
+        scheduler = _fast_scheduler(initial_limit=4)
+        attempts = {"n": 0}
+
+        async def _fn():
+            attempts["n"] += 1
+            if attempts["n"] < 3:
+                raise TransientAPIError("429", status=429)
+            return "done"
+
+        assert asyncio.run(scheduler.run(_fn)) == "done"
+        assert scheduler.retries == 2
+        stats = scheduler.stats()
+        assert stats.rate_limited == 2
+        assert stats.completed == 1
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = _fast_scheduler(max_retries=2)
+
+        async def _fn():
+            raise TransientAPIError("429", status=429)
+
+        with pytest.raises(TransientAPIError):
+            asyncio.run(scheduler.run(_fn))
+        assert scheduler.retries == 2
+
+    def test_non_transient_error_not_retried(self):
+        scheduler = _fast_scheduler()
+
+        async def _fn():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            asyncio.run(scheduler.run(_fn))
+        assert scheduler.retries == 0
+
+    def test_aimd_limit(self):
+        scheduler = _fast_scheduler(initial_limit=8, max_limit=9)
+        attempts = {"n": 0}
+
+        async def _fn():
+            attempts["n"] += 1
+            if attempts["n"] == 1:
+                raise TransientAPIError("429", status=429)
+            return "ok"
+
+        asyncio.run(scheduler.run(_fn))
+        # halved on the 429, then +1 for the successful retry
+        assert scheduler.limit == 5
+
+    def test_bounds_in_flight_and_reports_queue_depth(self):
+        scheduler = _fast_scheduler(initial_limit=2, max_limit=2)
+        peak = {"in_flight": 0, "queued": 0}
+
+        async def _fn():
+            peak["in_flight"] = max(peak["in_flight"], scheduler.in_flight)
+            peak["queued"] = max(peak["queued"], scheduler.queue_depth)
+            await asyncio.sleep(0.01)
+
+        async def _main():
+            await asyncio.gather(*(scheduler.run(_fn) for _ in range(6)))
+
+        asyncio.run(_main())
+        assert peak["in_flight"] == 2
+        assert peak["queued"] >= 1
+        assert scheduler.in_flight == 0
+        assert scheduler.queue_depth == 0
+
+    def test_cancelled_run_releases_its_slot(self):
+        scheduler = _fast_scheduler(initial_limit=2, max_limit=2)
+
+        async def _main():
+            stuck = [
+                asyncio.create_task(scheduler.run(asyncio.Event().wait))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            assert scheduler.in_flight == 2
+            for task in stuck:
+                task.cancel()
+            await asyncio.gather(*stuck, return_exceptions=True)
+            assert scheduler.in_flight == 0
+            # A later run is admitted rather than waiting forever.
+            return await asyncio.wait_for(
+                scheduler.run(lambda: asyncio.sleep(0, "ok")), 1
+            )
+
+        assert asyncio.run(_main()) == "ok"
+
+    def test_shared_instance(self):
+        assert get_scheduler() is get_scheduler()
+
+
+class TestAgentRetries:
+    def test_agent_retries_injected_429s(self):
+        calls: dict = {}
+        scheduler = _fast_scheduler()
+        with patch("good_start.agent.query", _fake_query(2, calls)):
+            agent = Agent(prompt=Prompt(text="p"), scheduler=scheduler)
+            result = asyncio.run(agent.run())
+
+        assert result.passed is True
+        assert calls["n"] == 3
+        assert scheduler.retries == 2
+
+    def test_agent_reports_error_when_retries_exhausted(self):
+        calls: dict = {}
+        scheduler = _fast_scheduler(max_retries=1)
+        with patch("good_start.agent.query", _fake_query(5, calls)):
+            agent = Agent(prompt=Prompt(text="p"), scheduler=scheduler)
+            result = asyncio.run(agent.run())
+
+        assert result.passed is False
+        assert "Agent error" in result.details
+        assert calls["n"] == 2
@@ -0,0 +1,248 @@
+import asyncio
+import re
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ResultMessage
+
+from good_start import search
+from good_start.agent import Agent
+from good_start.loader import Prompt
+from good_start.search import (
+    FIND_FILES_TOOL,
+    SEARCH_CODE_TOOL,
+    RepoIndex,
+    index_once,
+    literal_fragments,
+    search_server,
+)
+from good_start.tiers import FULL_TIER, SMOKE_TIER, tier_policy, with_indexed_search
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "README.md").write_text("# Demo\n\nRun `pip install demo`.\n")
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\n')
+    (tmp_path / "src" / "demo").mkdir(parents=True)
+    (tmp_path / "src" / "demo" / "core.py").write_text(
+        "def install():\n    return 'installed'\n"
+    )
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "install.md").write_text("Use pip install demo.\n")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\0\0install")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "x.js").write_text("pip install")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_servers():
+    search._servers.clear()
+    yield
+    search._servers.clear()
+
+
+class TestLiteralFragments:
+    @pytest.mark.parametrize(
+        ("pattern", "expected"),
+        [
+            ("pip install", ["pip install"]),
+            (r"pip\s+install", ["pip", "install"]),
+            (r"setup\.py", ["setup.py"]),
+            ("colou?r", ["colo"]),
+            ("[Ii]nstall(ation)?", ["nstall"]),
+            (r"v\d{1,3}\.x", []),
+            ("pip|conda", []),
+            ("(?i)install", []),
+            # Character codes and backreferences aren't literal digits.
+            (r"\x41pple_1234", ["pple_1234"]),
+            (r"caf\u00e9 menu", ["caf", " menu"]),
+            (r"\N{BULLET} install", [" install"]),
+            (r"(a)\1234", []),
+        ],
+    )
+    def test_required_literals(self, pattern, expected):
+        assert literal_fragments(pattern) == expected
+
+
+class TestRepoIndex:
+    def test_skips_vendored_dirs_and_binary_contents(self, repo):
+        index = RepoIndex.build(repo)
+        assert "node_modules/x.js" not in index.paths
+        # Binary files are found by path but never searched.
+        assert "logo.png" in index.paths
+        assert "logo.png" not in index.search("install")
+
+    def test_find_files_ranks_shallow_docs_first(self, repo):
+        index = RepoIndex.build(repo)
+        assert index.find_files("*.md").splitlines() == [
+            "README.md",
+            "docs/install.md",
+        ]
+        assert index.find_files("core").splitlines() == ["src/demo/core.py"]
+        assert "No files match" in index.find_files("*.rs")
+
+    def test_search_reads_only_candidate_files(self, repo):
+        index = RepoIndex.build(repo)
+        with patch.object(
+            search.Path, "read_text", autospec=True, side_effect=search.Path.read_text
+        ) as read_text:
+            output = index.search(r"pip\s+install")
+        assert output.splitlines() == [
+            "README.md:3: Run `pip install demo`.",
+            "docs/install.md:1: Use pip install demo.",
+        ]
+        read = {path.name for (path, *_), _ in read_text.call_args_list}
+        assert read == {"README.md", "install.md"}
+
+    def test_search_glob_and_case(self, repo):
+        index = RepoIndex.build(repo)
+        assert index.search("DEF INSTALL", glob="*.py", ignore_case=True) == (
+            "src/demo/core.py:1: def install():"
+        )
+        assert "No matches" in index.search("DEF INSTALL", glob="*.py")
+
+    def test_results_are_capped(self, tmp_path):
+        (tmp_path / "big.txt").write_text("needle\n" * 30)
+        (tmp_path / "other.txt").write_text("needle\n" * 30)
+        output = RepoIndex.build(tmp_path).search("needle", limit=15)
+        lines = output.splitlines()
+        assert len(lines) == 16
+        assert sum(line.startswith("big.txt:") for line in lines) == 10
+        assert lines[-1].startswith("... 15 matches shown, and there may be more")
+
+    def test_search_stops_at_limit(self, tmp_path):
+        for i in range(5):
+            (tmp_path / f"f{i}.txt").write_text("anything\n")
+        index = RepoIndex.build(tmp_path)
+        with patch.object(
+            search.Path, "read_text", autospec=True, side_effect=search.Path.read_text
+        ) as read_text:
+            output = index.search(".", limit=2)
+        assert len(output.splitlines()) == 3
+        assert read_text.call_count == 2
+
+    def test_literal_free_pattern_reads_limited_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(search, "MAX_SCAN_FILES", 2)
+        for i in range(5):
+            (tmp_path / f"f{i}.txt").write_text("no digits here\n")
+        index = RepoIndex.build(tmp_path)
+        with patch.object(
+            search.Path, "read_text", autospec=True, side_effect=search.Path.read_text
+        ) as read_text:
+            output = index.search(r"\d{5}")
+        assert read_text.call_count == 2
+        assert output.splitlines()[0] == "No matches for '\\\\d{5}'."
+        assert "searched only the first 2 files" in output
+        assert "3 files skipped" in output
+
+    def test_large_files_are_noted(self, repo, monkeypatch):
+        monkeypatch.setattr(search, "MAX_FILE_BYTES", 100)
+        (repo / "install.log").write_text("pip install demo\n" * 10)
+        index = RepoIndex.build(repo)
+        output = index.search("install")
+        assert "install.log:" not in output
+        assert output.splitlines()[-1] == (
+            "... 1 files too large to index were not searched (install.log); "
+            "use Bash grep if they matter."
+        )
+        assert "too large" not in index.search("install", glob="*.md")
+
+    def test_invalid_pattern(self, repo):
+        with pytest.raises(re.error):
+            RepoIndex.build(repo).search("(")
+
+
+class TestSearchServer:
+    def test_one_build_serves_tool_calls(self, repo):
+        server = search_server(repo)
+        assert search_server(repo) is server
+
+        async def _main():
+            server.refresh()
+            first = await server.index()
+            server.refresh()
+            return first, await server.index()
+
+        first, second = asyncio.run(_main())
+        # A finished build is replaced by a fresh one on the next run.
+        assert first is not second
+        assert first.paths == second.paths
+
+    def test_index_once_reuses_finished_build(self, repo):
+        server = search_server(repo)
+
+        async def _main():
+            with index_once():
+                server.refresh()
+                first = await server.index()
+                server.refresh()
+                second = await server.index()
+            server.refresh()
+            return first, second, await server.index()
+
+        first, second, later = asyncio.run(_main())
+        assert second is first
+        assert later is not first
+
+    def test_tool_handlers(self, repo):
+        server = search_server(repo)
+        find_files = server._find_files_tool().handler
+        search_code = server._search_code_tool().handler
+
+        async def _main():
+            return (
+                await find_files({"pattern": "*.toml"}),
+                await search_code({"pattern": "("}),
+            )
+
+        found, invalid = asyncio.run(_main())
+        assert found["content"][0]["text"] == "pyproject.toml"
+        assert invalid["is_error"] is True
+        assert "Invalid pattern" in invalid["content"][0]["text"]
+
+
+class TestIndexedTiers:
+    def test_swaps_glob_and_grep(self):
+        tier = with_indexed_search(FULL_TIER)
+        assert tier.allowed_tools == ("Bash", FIND_FILES_TOOL, SEARCH_CODE_TOOL, "Read")
+        assert with_indexed_search(SMOKE_TIER) == SMOKE_TIER
+
+    def test_policy(self):
+        (full,) = tier_policy(False, indexed_search=True)
+        assert SEARCH_CODE_TOOL in full.allowed_tools
+        _, full = tier_policy(True, indexed_search=True)
+        assert full.name == "full"
+        assert SEARCH_CODE_TOOL in full.allowed_tools
+
+
+class TestAgentSearchTools:
+    def _run(self, tier, monkeypatch, repo):
+        monkeypatch.chdir(repo)
+        seen = {}
+
+        async def _query(prompt, options):
+            seen["options"] = options
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1,
+                duration_api_ms=1,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                structured_output={"passed": True, "details": "ok"},
+            )
+
+        with patch("good_start.agent.query", _query):
+            asyncio.run(Agent(prompt=Prompt(text="p")).run(tier=tier))
+        return seen["options"]
+
+    def test_indexed_tier_gets_server(self, monkeypatch, repo):
+        options = self._run(with_indexed_search(FULL_TIER), monkeypatch, repo)
+        assert options.mcp_servers["repo"] is search_server(repo).config
+        assert SEARCH_CODE_TOOL in options.allowed_tools
+
+    def test_default_tier_has_no_server(self, monkeypatch, repo):
+        options = self._run(FULL_TIER, monkeypatch, repo)
+        assert options.mcp_servers == {}
+        assert search._servers == {}
@@ -0,0 +1,128 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from good_start.loader import load_prompt
+from good_start.result import AgentFindings, Result
+from good_start.sections import (
+    Section,
+    combine_section_results,
+    run_sections,
+    split_install_sections,
+)
+
+DOC = """\
+# mytool
+
+Prerequisites: Python 3.12.
+
+## Installation
+
+### With pip
+
+```sh
+pip install mytool
+# Not a heading
+```
+
+### With conda
+
+conda install mytool
+
+### From source
+
+git clone ...
+
+## Usage
+
+mytool --help
+"""
+
+
+def _make_result(passed: bool, details: str) -> Result:
+    findings = AgentFindings(passed=passed, details=details)
+    return Result(agent_messages=[], agent_result=findings)
+
+
+class TestSplitInstallSections:
+    def test_splits_sibling_install_headings(self):
+        sections = split_install_sections(DOC)
+        assert [s.title for s in sections] == [
+            "With pip",
+            "With conda",
+            "From source",
+        ]
+        assert all(s.level == 3 for s in sections)
+
+    def test_section_ends_at_next_heading(self):
+        pip, _, source = split_install_sections(DOC)
+        assert "pip install mytool" in pip.text
+        assert "# Not a heading" in pip.text
+        assert "conda" not in pip.text
+        # The last section stops at the shallower Usage heading.
+        assert "mytool --help" not in source.text
+
+    def test_single_install_path_returns_nothing(self):
+        assert split_install_sections("# Tool\n\n## Install\n\npip install x\n") == []
+
+
+class TestCombineSectionResults:
+    def test_all_passed(self):
+        sections = [Section("pip", 2, ""), Section("conda", 2, "")]
+        result = combine_section_results(
+            sections, [_make_result(True, "ok"), _make_result(True, "fine")]
+        )
+        assert result.passed is True
+        assert result.details.startswith("2 of 2 install sections passed.")
+
+    def test_failure_and_error_reported_per_section(self):
+        sections = [
+            Section("pip", 2, ""),
+            Section("conda", 2, ""),
+            Section("brew", 2, ""),
+        ]
+        result = combine_section_results(
+            sections,
+            [
+                _make_result(True, "ok"),
+                _make_result(False, "conda channel missing"),
+                RuntimeError("boom"),
+            ],
+        )
+        assert result.passed is False
+        assert "1 of 3 install sections passed." in result.details
+        assert "- pip: PASSED" in result.details
+        assert "- conda: FAILED\n  conda channel missing" in result.details
+        assert "- brew: FAILED\n  Error: boom" in result.details
+
+    def test_aggregates_usage(self):
+        sections = [Section("pip", 2, ""), Section("conda", 2, "")]
+        first, second = _make_result(True, "ok"), _make_result(True, "ok")
+        first.duration, first.cost_usd = 30.0, 0.10
+        second.duration, second.cost_usd = 50.0, 0.20
+        first.usage = {"input_tokens": 10}
+        second.usage = {"input_tokens": 5, "output_tokens": 2}
+
+        result = combine_section_results(sections, [first, second])
+
+        assert result.duration == 50.0
+        assert result.cost_usd == pytest.approx(0.30)
+        assert result.usage == {"input_tokens": 15, "output_tokens": 2}
+
+
+class TestRunSections:
+    def test_runs_each_section_with_its_own_prompt(self):
+        runtime = MagicMock()
+        runtime.run = AsyncMock(return_value=_make_result(True, "ok"))
+        sections = split_install_sections(DOC)
+
+        result = asyncio.run(
+            run_sections(runtime, load_prompt(), "INSTALL.md", sections)
+        )
+
+        assert result.passed is True
+        prompts = [c.args[0] for c in runtime.run.call_args_list]
+        assert len(prompts) == 3
+        assert 'section headed "With conda"' in prompts[1]
+        assert all("INSTALL.md" in p for p in prompts)
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from good_start.result import AgentFindings, Result
+from good_start.server import Server, server_status, submit_check
+
+
+class _FakeRuntime:
+    """Runtime stand-in that emits one tool event and records run order."""
+
+    def __init__(self, order: list[str], delay: float = 0.0):
+        self.order = order
+        self.delay = delay
+
+    async def run(self, prompt, target, on_tool_use=None, tier=None):
+        self.order.append(prompt)
+        if on_tool_use:
+            on_tool_use("Bash", {"command": f"echo {prompt}"})
+        await asyncio.sleep(self.delay)
+        findings = AgentFindings(passed=True, details=f"checked {prompt}")
+        return Result(agent_messages=[], agent_result=findings)
+
+
+@pytest.fixture()
+def socket_path():
+    # Unix socket paths are length-limited, so keep this short.
+    with tempfile.TemporaryDirectory(prefix="gs") as tmp:
+        yield Path(tmp) / "s.sock"
+
+
+async def _start(server: Server) -> asyncio.Task:
+    task = asyncio.create_task(server.serve_forever())
+    while not server.socket_path.exists():
+        await asyncio.sleep(0.01)
+    return task
+
+
+class TestServer:
+    def test_streams_events_and_result(self, socket_path):
+        order: list[str] = []
+        factories: list[dict] = []
+
+        def _factory(**kwargs):
+            factories.append(kwargs)
+            return _FakeRuntime(order)
+
+        events: list[tuple[str, dict]] = []
+
+        async def _main():
+            server = Server(socket_path, workers=1, runtime_factory=_factory)
+            task = await _start(server)
+            result = await submit_check(
+                "p1",
+                ".",
+                options={"stage": "git", "bogus": 1},
+                socket_path=socket_path,
+                on_tool_use=lambda n, i: events.append((n, i)),
+            )
+            # A second job with the same options reuses the cached runtime.
+            await submit_check("p2", ".", {"stage": "git"}, socket_path=socket_path)
+            task.cancel()
+            return result
+
+        result = asyncio.run(_main())
+        assert result.passed is True
+        assert result.details == "checked p1"
+        assert events == [("Bash", {"command": "echo p1"})]
+        assert factories == [{"verbose": False, "stage": "git"}]
+
+    def test_priority_ordering(self, socket_path):
+        order: list[str] = []
+
+        async def _main():
+            server = Server(
+                socket_path,
+                workers=1,
+                runtime_factory=lambda **kw: _FakeRuntime(order, delay=0.05),
+            )
+            task = await _start(server)
+            first = asyncio.create_task(
+                submit_check("busy", ".", socket_path=socket_path)
+            )
+            await asyncio.sleep(0.01)
+            low = asyncio.create_task(
+                submit_check("low", ".", priority=5, socket_path=socket_path)
+            )
+            await asyncio.sleep(0.01)
+            high = asyncio.create_task(
+                submit_check("high", ".", priority=0, socket_path=socket_path)
+            )
+            await asyncio.sleep(0.01)
+            status = await server_status(socket_path)
+            await asyncio.gather(first, low, high)
+            task.cancel()
+            return status
+
+        status = asyncio.run(_main())
+        assert order == ["busy", "high", "low"]
+        assert status["queued"] == 2
+        assert status["running"] == 1
+
+    def test_runtime_error_reported_to_client(self, socket_path):
+        class _Broken:
+            async def run(self, prompt, target, on_tool_use=None, tier=None):
+                raise RuntimeError("ANTHROPIC_API_KEY is not set.")
+
+        async def _main():
+            server = Server(socket_path, runtime_factory=lambda **kw: _Broken())
+            task = await _start(server)
+            try:
+                await submit_check("p", ".", socket_path=socket_path)
+            finally:
+                task.cancel()
+
+        with pytest.raises(RuntimeError, match="ANTHROPIC_API_KEY"):
+            asyncio.run(_main())
+
+    @pytest.mark.parametrize(
+        ("line", "message"),
+        [
+            (b"[1, 2]", "must be a JSON object"),
+            (b'{"type": "check", "target": "."}', "'prompt'"),
+            (b'{"type": "check", "prompt": "p", "priority": "high"}', "priority"),
+            (
+                b'{"type": "check", "prompt": "p", "tier": {"name": "x"}}',
+                "Invalid tier",
+            ),
+        ],
+    )
+    def test_malformed_request_gets_error_reply(self, socket_path, line, message):
+        async def _main():
+            server = Server(socket_path, runtime_factory=lambda **kw: _FakeRuntime([]))
+            task = await _start(server)
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(socket_path))
+                writer.write(line + b"\n")
+                await writer.drain()
+                reply = json.loads(await reader.readline())
+                writer.close()
+                return reply
+            finally:
+                task.cancel()
+
+        reply = asyncio.run(_main())
+        assert reply["type"] == "error"
+        assert message in reply["message"]
+
+    def test_no_server_listening(self, socket_path):
+        with pytest.raises(RuntimeError, match="No good-start server"):
+            asyncio.run(submit_check("p", ".", socket_path=socket_path))
+
+    def test_local_check_runs_in_client_directory(
+        self, socket_path, tmp_path, monkeypatch
+    ):
+        from claude_agent_sdk import ResultMessage
+
+        from good_start.runtime import resolve_runtime
+
+        seen: list = []
+
+        async def _query(prompt, options):
+            seen.append(options.cwd)
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1,
+                duration_api_ms=1,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                structured_output={"passed": True, "details": "ok"},
+            )
+
+        daemon_dir = tmp_path / "daemon"
+        project = tmp_path / "project"
+        daemon_dir.mkdir()
+        project.mkdir()
+        (project / "README.md").write_text("# Project\n")
+        monkeypatch.chdir(daemon_dir)
+        monkeypatch.setattr("good_start.agent.query", _query)
+
+        def _factory(**kwargs):
+            kwargs.pop("reuse_sessions")
+            return resolve_runtime(**kwargs)
+
+        async def _main():
+            server = Server(socket_path, workers=1, runtime_factory=_factory)
+            task = await _start(server)
+            # The client runs from the project, the daemon was started elsewhere.
+            monkeypatch.chdir(project)
+            try:
+                return await submit_check(
+                    "p",
+                    "README.md",
+                    options={"no_container": True},
+                    socket_path=socket_path,
+                )
+            finally:
+                task.cancel()
+
+        result = asyncio.run(_main())
+        assert result.passed is True
+        assert seen == [str(project)]
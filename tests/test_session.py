@@ -0,0 +1,202 @@
+import asyncio
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions, CLIConnectionError, ResultMessage
+
+from good_start.agent import Agent
+from good_start.loader import Prompt
+from good_start.runtime import resolve_runtime
+from good_start.scheduler import Scheduler
+from good_start.session import SessionPool, get_session_pool
+
+
+def _result_message(details: str) -> ResultMessage:
+    return ResultMessage(
+        subtype="success",
+        duration_ms=1,
+        duration_api_ms=1,
+        is_error=False,
+        num_turns=1,
+        session_id="s",
+        structured_output={"passed": True, "details": details},
+    )
+
+
+class _FakeClient:
+    """Stand-in for ClaudeSDKClient that answers with the conversation so far.
+
+    Like the real client, it keeps every prompt it has been sent, so a reused
+    client would leak earlier checks into later ones.
+    """
+
+    connects = 0
+
+    def __init__(self, options):
+        self.options = options
+        self.history: list[str] = []
+
+    async def __aenter__(self):
+        type(self).connects += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def query(self, prompt, session_id="default"):
+        if prompt == "explode":
+            raise CLIConnectionError("CLI process died")
+        self.history.append(prompt)
+
+    async def receive_response(self):
+        await asyncio.sleep(0.01)
+        yield _result_message("|".join(self.history))
+
+
+@pytest.fixture(autouse=True)
+def _reset_connects():
+    _FakeClient.connects = 0
+
+
+def _options() -> ClaudeAgentOptions:
+    return ClaudeAgentOptions(allowed_tools=["Bash"])
+
+
+async def _collect(pool: SessionPool, prompt: str, options=None) -> list:
+    return [m async for m in pool.stream(prompt, options or _options())]
+
+
+def _recording_factory(clients: list):
+    def _factory(options):
+        client = _FakeClient(options)
+        clients.append(client)
+        return client
+
+    return _factory
+
+
+class TestSessionPool:
+    def test_second_check_cannot_see_first(self):
+        pool = SessionPool(size=1, client_factory=_FakeClient)
+
+        async def _main():
+            first = await _collect(pool, "secret")
+            second = await _collect(pool, "b")
+            await pool.close()
+            return first, second
+
+        first, second = asyncio.run(_main())
+        assert first[-1].structured_output["details"] == "secret"
+        assert second[-1].structured_output["details"] == "b"
+
+    def test_each_check_gets_its_own_client(self):
+        clients: list[_FakeClient] = []
+        pool = SessionPool(size=1, client_factory=_recording_factory(clients))
+
+        async def _main():
+            for prompt in ("a", "b", "c"):
+                await _collect(pool, prompt)
+            await pool.close()
+
+        asyncio.run(_main())
+        answered = [c.history for c in clients if c.history]
+        assert answered == [["a"], ["b"], ["c"]]
+        # One spare is left over, connected for a check that never came.
+        assert len(clients) == 4
+
+    def test_spare_client_is_connected_ahead(self):
+        pool = SessionPool(size=1, client_factory=_FakeClient)
+
+        async def _main():
+            await _collect(pool, "a")
+            # The next check's client is already up before it is submitted.
+            connected = _FakeClient.connects
+            await _collect(pool, "b")
+            await pool.close()
+            return connected
+
+        assert asyncio.run(_main()) == 2
+
+    def test_concurrent_checks_each_get_a_client(self):
+        clients: list[_FakeClient] = []
+        pool = SessionPool(size=2, client_factory=_recording_factory(clients))
+
+        async def _main():
+            results = await asyncio.gather(*(_collect(pool, str(i)) for i in range(5)))
+            await pool.close()
+            return results
+
+        results = asyncio.run(_main())
+        assert [r[-1].structured_output["details"] for r in results] == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+        assert all(len(c.history) <= 1 for c in clients)
+
+    def test_failed_client_is_replaced(self):
+        pool = SessionPool(size=1, client_factory=_FakeClient)
+
+        async def _main():
+            with pytest.raises(CLIConnectionError):
+                await _collect(pool, "explode")
+            messages = await _collect(pool, "after")
+            await pool.close()
+            return messages
+
+        messages = asyncio.run(_main())
+        assert messages[-1].structured_output["details"] == "after"
+
+    def test_different_options_use_different_clients(self):
+        clients: list[_FakeClient] = []
+        pool = SessionPool(size=1, client_factory=_recording_factory(clients))
+
+        async def _main():
+            await _collect(pool, "a", ClaudeAgentOptions(allowed_tools=["Bash"]))
+            await _collect(pool, "b", ClaudeAgentOptions(allowed_tools=["Read"]))
+            await pool.close()
+
+        asyncio.run(_main())
+        used = {c.history[0]: c.options.allowed_tools for c in clients if c.history}
+        assert used == {"a": ["Bash"], "b": ["Read"]}
+
+    def test_close_disconnects_spares(self):
+        pool = SessionPool(size=2, client_factory=_FakeClient)
+
+        async def _main():
+            await _collect(pool, "a")
+            await pool.close()
+            return pool.connections
+
+        assert asyncio.run(_main()) == 0
+
+
+class TestAgentWithPool:
+    def test_agent_runs_through_pool(self):
+        pool = SessionPool(size=1, client_factory=_FakeClient)
+
+        async def _main():
+            results = []
+            for text in ("first", "second"):
+                agent = Agent(
+                    prompt=Prompt(text=text),
+                    scheduler=Scheduler(base_delay=0),
+                    pool=pool,
+                )
+                results.append(await agent.run())
+            await pool.close()
+            return results
+
+        results = asyncio.run(_main())
+        assert [r.details for r in results] == ["first", "second"]
+
+
+class TestResolveRuntimeSessions:
+    def test_reuse_sessions_uses_shared_pool(self):
+        rt = resolve_runtime(no_container=True, reuse_sessions=True)
+        assert rt._pool is get_session_pool()
+
+    def test_default_has_no_pool(self):
+        rt = resolve_runtime(no_container=True)
+        assert rt._pool is None
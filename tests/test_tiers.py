@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ResultMessage
+
+from good_start.agent import Agent
+from good_start.loader import Prompt
+from good_start.result import AgentFindings, AgentStep, Result
+from good_start.runtime._container import _tier_args
+from good_start.tiers import (
+    FULL_TIER,
+    SMOKE_TIER,
+    Tier,
+    escalation_context,
+    run_tiered,
+    tier_policy,
+)
+
+
+class _TierRuntime:
+    """Runtime stand-in whose outcome depends on the tier it runs with."""
+
+    def __init__(self, passes: set[str]):
+        self.passes = passes
+        self.calls: list[tuple[str, Tier]] = []
+
+    async def run(self, prompt, target, on_tool_use=None, tier=None):
+        self.calls.append((prompt, tier))
+        findings = AgentFindings(
+            passed=tier.name in self.passes,
+            details=f"{tier.name} says hi",
+            steps=[AgentStep(tool="Bash", input="pip install x", output="boom")],
+        )
+        result = Result(agent_messages=[], agent_result=findings)
+        result.duration = 10.0
+        result.cost_usd = 0.01 if tier.name == "smoke" else 0.20
+        result.usage = {"input_tokens": 100}
+        return result
+
+
+class TestTierPolicy:
+    def test_untiered_runs_full_only(self):
+        assert tier_policy(False) == [FULL_TIER]
+
+    def test_tiered_overrides(self):
+        smoke, full = tier_policy(True, smoke_model="sonnet", smoke_max_turns=5)
+        assert smoke.name == "smoke"
+        assert smoke.model == "sonnet"
+        assert smoke.max_turns == 5
+        assert smoke.allowed_tools == SMOKE_TIER.allowed_tools
+        assert full == FULL_TIER
+
+    def test_round_trips_through_dict(self):
+        assert Tier.from_dict(SMOKE_TIER.to_dict()) == SMOKE_TIER
+
+
+class TestRunTiered:
+    def test_smoke_pass_decides(self):
+        runtime = _TierRuntime(passes={"smoke", "full"})
+        result = asyncio.run(run_tiered(runtime, "p", ".", tier_policy(True)))
+
+        assert result.passed is True
+        assert result.tier == "smoke"
+        assert [tier.name for _, tier in runtime.calls] == ["smoke"]
+
+    def test_escalates_with_smoke_context(self):
+        runtime = _TierRuntime(passes={"full"})
+        result = asyncio.run(run_tiered(runtime, "p", ".", tier_policy(True)))
+
+        assert result.passed is True
+        assert result.tier == "full"
+        (_, _), (full_prompt, full_tier) = runtime.calls
+        assert full_tier == FULL_TIER
+        assert full_prompt.startswith("p\n\n## Earlier attempt (smoke pass)")
+        assert "smoke says hi" in full_prompt
+        assert "pip install x" in full_prompt
+        # Spend is summed over both tiers.
+        assert result.duration == 20.0
+        assert result.cost_usd == pytest.approx(0.21)
+        assert result.usage == {"input_tokens": 200}
+
+    def test_full_failure_is_final(self):
+        runtime = _TierRuntime(passes=set())
+        result = asyncio.run(run_tiered(runtime, "p", ".", tier_policy(True)))
+        assert result.passed is False
+        assert result.tier == "full"
+        assert len(runtime.calls) == 2
+
+    def test_context_truncates_long_output(self):
+        findings = AgentFindings(
+            passed=False,
+            details="d",
+            steps=[AgentStep(tool="Bash", input="make", output="x" * 5000 + "END")],
+        )
+        text = escalation_context(SMOKE_TIER, Result([], findings))
+        assert "END" in text
+        assert "x" * 1000 not in text
+
+
+class TestTierOptions:
+    def test_agent_applies_tier(self):
+        seen = {}
+
+        async def _query(prompt, options):
+            seen["options"] = options
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1,
+                duration_api_ms=1,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                structured_output={"passed": True, "details": "ok"},
+            )
+
+        with patch("good_start.agent.query", _query):
+            asyncio.run(Agent(prompt=Prompt(text="p")).run(tier=SMOKE_TIER))
+
+        options = seen["options"]
+        assert options.model == "haiku"
+        assert options.max_turns == 15
+        assert options.allowed_tools == ["Bash", "Read"]
+
+    def test_container_args(self):
+        assert _tier_args(SMOKE_TIER) == [
+            "--tools",
+            "Bash,Read",
+            "--model",
+            "haiku",
+            "--max-turns",
+            "15",
+        ]
+        assert _tier_args(FULL_TIER) == ["--tools", "Bash,Glob,Grep,Read"]
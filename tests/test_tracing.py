@@ -0,0 +1,200 @@
+import asyncio
+import contextvars
+import io
+import json
+import subprocess
+from unittest.mock import MagicMock, patch
+
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from good_start import tracing
+from good_start.agent import Agent
+from good_start.loader import Prompt
+from good_start.runtime._container import ContainerRuntime
+
+
+def _spans(path) -> list[list[dict]]:
+    """Return the spans of each exported trace, one list per line."""
+    traces = []
+    for line in path.read_text().splitlines():
+        request = json.loads(line)
+        (resource,) = request["resourceSpans"]
+        (scope,) = resource["scopeSpans"]
+        traces.append(scope["spans"])
+    return traces
+
+
+def _attrs(span: dict) -> dict:
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+class TestSpans:
+    def test_nested_spans_export_one_trace(self, tmp_path):
+        path = tmp_path / "trace.json"
+        with (
+            tracing.tracing(path),
+            tracing.span("check", target="README.md"),
+            tracing.span("child", count=3, ratio=0.5, ok=True),
+        ):
+            pass
+
+        (spans,) = _spans(path)
+        child, root = spans
+        assert root["name"] == "check"
+        assert root["parentSpanId"] == ""
+        assert child["parentSpanId"] == root["spanId"]
+        assert child["traceId"] == root["traceId"]
+        assert child["attributes"] == [
+            {"key": "count", "value": {"intValue": "3"}},
+            {"key": "ratio", "value": {"doubleValue": 0.5}},
+            {"key": "ok", "value": {"boolValue": True}},
+        ]
+        assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+
+    def test_each_root_is_its_own_trace(self, tmp_path):
+        path = tmp_path / "trace.json"
+        with tracing.tracing(path):
+            with tracing.span("one"):
+                pass
+            with tracing.span("two"):
+                pass
+        assert [[s["name"] for s in t] for t in _spans(path)] == [["one"], ["two"]]
+
+    def test_exception_marks_error(self, tmp_path):
+        path = tmp_path / "trace.json"
+        with tracing.tracing(path):
+            try:
+                with tracing.span("check"):
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+        (spans,) = _spans(path)
+        assert spans[0]["status"] == {"code": 2, "message": "boom"}
+
+    def test_nothing_exported_without_tracing(self, tmp_path):
+        with tracing.span("check"):
+            assert not tracing.active()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_container_continues_trace_on_stderr(self, monkeypatch):
+        parent = tracing.Span("host")
+        stderr = io.StringIO()
+        monkeypatch.setattr("sys.stderr", stderr)
+
+        def _in_container():
+            assert tracing.continue_trace(parent.traceparent())
+            with tracing.span("entrypoint"):
+                pass
+
+        contextvars.copy_context().run(_in_container)
+        span = json.loads(stderr.getvalue())["span"]
+        assert span["traceId"] == parent.trace_id
+        assert span["parentSpanId"] == parent.span_id
+
+    def test_invalid_traceparent_leaves_tracing_off(self):
+        ctx = contextvars.copy_context()
+        assert not ctx.run(tracing.continue_trace, "garbage")
+        assert not ctx.run(tracing.active)
+
+
+class TestAgentSpans:
+    def test_tool_calls_become_spans(self, tmp_path):
+        async def _query(prompt, options):
+            yield AssistantMessage(
+                content=[ToolUseBlock(id="t1", name="Bash", input={"command": "ls"})],
+                model="m",
+            )
+            yield UserMessage(
+                content=[ToolResultBlock(tool_use_id="t1", content="a.txt")]
+            )
+            yield ResultMessage(
+                subtype="success",
+                duration_ms=1,
+                duration_api_ms=1,
+                is_error=False,
+                num_turns=1,
+                session_id="s",
+                total_cost_usd=0.1,
+                structured_output={"passed": True, "details": "ok"},
+            )
+
+        path = tmp_path / "trace.json"
+        with patch("good_start.agent.query", _query), tracing.tracing(path):
+            asyncio.run(Agent(prompt=Prompt(text="p")).run())
+
+        (spans,) = _spans(path)
+        tool, run = spans
+        assert tool["name"] == "tool Bash"
+        assert _attrs(tool)["command"] == "ls"
+        assert tool["parentSpanId"] == run["spanId"]
+        assert run["name"] == "agent.run"
+        assert _attrs(run)["passed"] is True
+        assert _attrs(run)["cost_usd"] == 0.1
+
+
+@patch("good_start.runtime._container._resolve_api_key", return_value="sk-test")
+@patch("good_start.runtime._container.subprocess.Popen")
+@patch("good_start.runtime._container.subprocess.run")
+@patch("good_start.runtime._container.shutil.which", return_value="/usr/bin/podman")
+class TestContainerSpans:
+    def test_container_run_is_traced(
+        self, _which, mock_run, mock_popen, _key, tmp_path
+    ):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        remote = {"traceId": "", "spanId": "c" * 16, "name": "entrypoint"}
+
+        def _popen(cmd, **kwargs):
+            # Answer with a span from "inside" the container, on this trace.
+            traceparent = next(a for a in cmd if a.startswith("TRACEPARENT="))
+            remote["traceId"] = traceparent.split("-")[1]
+            stderr = f'{{"ready": true}}\n{json.dumps({"span": remote})}\n'
+            proc = MagicMock()
+            proc.stdout.__iter__.return_value = iter(
+                ['{"passed": true, "details": "ok"}\n']
+            )
+            lines = iter(stderr.splitlines(keepends=True))
+            proc.stderr.readline = lambda: next(lines, "")
+            proc.poll.return_value = 0
+            proc.returncode = 0
+            return proc
+
+        mock_popen.side_effect = _popen
+        path = tmp_path / "trace.json"
+        with tracing.tracing(path):
+            result = asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        assert result.passed
+        (spans,) = _spans(path)
+        by_name = {s["name"]: s for s in spans}
+        assert set(by_name) >= {
+            "container.run",
+            "image.ensure",
+            "container.attempt",
+            "container.start",
+            "result.parse",
+            "entrypoint",
+        }
+        attempt = by_name["container.attempt"]
+        assert by_name["container.start"]["parentSpanId"] == attempt["spanId"]
+        assert by_name["entrypoint"]["traceId"] == attempt["traceId"]
+        assert _attrs(by_name["container.run"])["passed"] is True
+
+    def test_no_traceparent_without_tracing(self, _which, mock_run, mock_popen, _key):
+        mock_run.return_value = subprocess.CompletedProcess([], 0)
+        proc = MagicMock()
+        proc.stdout.__iter__.return_value = iter(['{"passed": true, "details": "ok"}'])
+        proc.stderr.readline.return_value = ""
+        proc.poll.return_value = 0
+        proc.returncode = 0
+        mock_popen.return_value = proc
+
+        asyncio.run(ContainerRuntime().run("prompt", "."))
+
+        cmd = mock_popen.call_args[0][0]
+        assert not any(arg.startswith("TRACEPARENT=") for arg in cmd)
@@ -0,0 +1,122 @@
+import asyncio
+import os
+from pathlib import Path
+
+from good_start.result import AgentFindings, Result
+from good_start.watch import referenced_files, watch, watched_files
+
+
+def _make_result(details: str) -> Result:
+    findings = AgentFindings(passed=True, details=details)
+    return Result(agent_messages=[], agent_result=findings)
+
+
+def _bump(path: Path, text: str) -> None:
+    path.write_text(text)
+    # Force a distinct mtime even on coarse-grained filesystems.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestReferencedFiles:
+    def test_links_and_code_spans(self, tmp_path: Path):
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "requirements.txt").write_text("")
+        (tmp_path / "docs" / "setup.md").write_text("")
+        doc = tmp_path / "README.md"
+        doc.write_text(
+            "See [setup](docs/setup.md#step-1) and [site](https://example.com).\n"
+            "Run `pip install -r requirements.txt` or read `missing.md`.\n"
+        )
+        assert referenced_files(doc) == {
+            (tmp_path / "docs" / "setup.md").resolve(),
+        }
+        doc.write_text("Install deps from `requirements.txt`.\n")
+        assert referenced_files(doc) == {(tmp_path / "requirements.txt").resolve()}
+
+    def test_watched_files_for_directory(self, tmp_path: Path):
+        (tmp_path / "README.md").write_text("See [install](INSTALL.md).")
+        (tmp_path / "INSTALL.md").write_text("")
+        (tmp_path / "pyproject.toml").write_text("")
+        assert watched_files(tmp_path) == {
+            (tmp_path / "README.md").resolve(),
+            (tmp_path / "INSTALL.md").resolve(),
+            (tmp_path / "pyproject.toml").resolve(),
+        }
+
+
+class TestWatch:
+    def test_rechecks_after_debounced_edits(self, tmp_path: Path):
+        doc = tmp_path / "README.md"
+        doc.write_text("v0")
+        results: list[str] = []
+        changes: list[list[Path]] = []
+        runs = {"n": 0}
+
+        async def _run_check():
+            runs["n"] += 1
+            return _make_result(doc.read_text())
+
+        async def _main():
+            stop = asyncio.Event()
+            task = asyncio.create_task(
+                watch(
+                    doc,
+                    _run_check,
+                    lambda r: results.append(r.details),
+                    on_change=changes.append,
+                    debounce=0.1,
+                    poll_interval=0.02,
+                    stop=stop,
+                )
+            )
+            await asyncio.sleep(0.05)
+            # A burst of edits produces a single re-check.
+            for i in range(1, 4):
+                _bump(doc, f"v{i}")
+                await asyncio.sleep(0.03)
+            await asyncio.sleep(0.3)
+            stop.set()
+            await task
+
+        asyncio.run(_main())
+        assert results == ["v0", "v3"]
+        assert runs["n"] == 2
+        assert changes == [[doc.resolve()]]
+
+    def test_edit_cancels_in_flight_check(self, tmp_path: Path):
+        doc = tmp_path / "README.md"
+        doc.write_text("v0")
+        results: list[str] = []
+        cancelled = {"n": 0}
+
+        async def _run_check():
+            text = doc.read_text()
+            try:
+                await asyncio.sleep(0.2 if text == "v0" else 0)
+            except asyncio.CancelledError:
+                cancelled["n"] += 1
+                raise
+            return _make_result(text)
+
+        async def _main():
+            stop = asyncio.Event()
+            task = asyncio.create_task(
+                watch(
+                    doc,
+                    _run_check,
+                    lambda r: results.append(r.details),
+                    debounce=0.05,
+                    poll_interval=0.02,
+                    stop=stop,
+                )
+            )
+            await asyncio.sleep(0.05)
+            _bump(doc, "v1")
+            await asyncio.sleep(0.3)
+            stop.set()
+            await task
+
+        asyncio.run(_main())
+        assert cancelled["n"] == 1
+        assert results == ["v1"]